@@ -10,6 +10,9 @@ of another class (parent/superclass).
 
 In this file, we will explore **real-world, practical examples** of inheritance
 to understand how it improves code organization, reusability, and extensibility.
+
+Month-end interest for millions of the banking example's accounts is in
+`interest_portfolio.py` (needs NumPy; this file runs on plain Python).
 """
 
 # ------------------------------------------------
@@ -0,0 +1,83 @@
+# ================================================
+# File: benchmark_interest.py
+# Topic: Per-account interest loop vs one vectorized InterestPortfolio pass
+# ================================================
+
+"""
+Month-end interest for a large mixed portfolio of SavingsAccount and
+CurrentAccount objects from `08_Practical_Examples_of_Inheritance.py`, one
+object at a time vs `InterestPortfolio` from `interest_portfolio.py`.
+
+Run:
+    python benchmark_interest.py
+"""
+
+import contextlib
+import os
+import time
+
+import numpy as np
+
+from interest_portfolio import InterestPortfolio, charge_overdraft, load_examples
+
+
+def make_accounts(examples, n, seed=1):
+    """Two thirds savings accounts, one third current accounts (some overdrawn)."""
+    rng = np.random.default_rng(seed)
+    balances = np.round(rng.uniform(-1_000, 50_000, n), 2).tolist()
+    savings_rates = rng.choice([0.01, 0.03, 0.05], n).tolist()
+    accounts = []
+    for i in range(n):
+        if i % 3:
+            accounts.append(examples.SavingsAccount(f"S{i}", abs(balances[i]), savings_rates[i]))
+        else:
+            accounts.append(examples.CurrentAccount(f"C{i}", balances[i]))
+    return accounts
+
+
+def bench_interest(n_accounts=1_000_000):
+    examples = load_examples()
+    print(f"--- Month-end interest for {n_accounts:,} accounts ---")
+
+    looped = make_accounts(examples, n_accounts)
+    start = time.perf_counter()
+    # apply_interest() prints a line per account; send it nowhere
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for account in looped:
+            if isinstance(account, examples.SavingsAccount):
+                account.apply_interest()
+            else:
+                charge_overdraft(account)
+    loop_seconds = time.perf_counter() - start
+    print(f"loop, one account at a time  : {loop_seconds:8.3f} s")
+
+    batched = make_accounts(examples, n_accounts)
+    start = time.perf_counter()
+    portfolio = InterestPortfolio.from_accounts(batched)
+    load_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    portfolio.apply_interest()
+    apply_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    portfolio.write_back()
+    write_seconds = time.perf_counter() - start
+    total = load_seconds + apply_seconds + write_seconds
+    print(f"portfolio: load from objects : {load_seconds:8.3f} s")
+    print(f"portfolio: apply_interest()  : {apply_seconds:8.3f} s")
+    print(f"portfolio: write back        : {write_seconds:8.3f} s")
+    print(f"portfolio: total             : {total:8.3f} s ({loop_seconds / total:.1f}x faster)")
+
+    # balances kept in arrays between month ends skip loading and writing back
+    start = time.perf_counter()
+    for _ in range(12):
+        portfolio.apply_interest()
+    print(f"12 months, arrays only       : {time.perf_counter() - start:8.3f} s")
+
+    assert all(a.balance == b.balance for a, b in zip(looped, batched)), "results differ"
+    print("balances identical to the loop: yes")
+
+
+if __name__ == "__main__":
+    bench_interest()
@@ -0,0 +1,116 @@
+# ================================================
+# File: interest_portfolio.py
+# Topic: Month-end interest for a whole portfolio of inherited accounts
+# ================================================
+
+"""
+Calling apply_interest() on millions of account objects runs the same few
+lines of Python millions of times. An InterestPortfolio copies the balances
+and rates of all accounts into NumPy arrays, applies every account's rule in
+one vectorized pass, and writes the new balances back to the objects.
+
+The accounts are the SavingsAccount / CurrentAccount classes from
+`08_Practical_Examples_of_Inheritance.py`. The rule depends on the class:
+  - SavingsAccount: balance * interest_rate, always (its apply_interest())
+  - CurrentAccount: balance * OVERDRAFT_RATE, only while overdrawn
+                    (`charge_overdraft`; the tutorial class has no interest)
+  - Account:        no interest
+
+Run:
+    python interest_portfolio.py
+"""
+
+import contextlib
+import functools
+import importlib.util
+import io
+import os
+
+import numpy as np
+
+OVERDRAFT_RATE = 0.02
+
+# ------------------------------------------------
+# 1️⃣ Vectorized interest
+# ------------------------------------------------
+
+class InterestPortfolio:
+    def __init__(self, balances, rates, overdraft_only, accounts=None):
+        self.balances = np.asarray(balances, dtype=np.float64)
+        self.rates = np.asarray(rates, dtype=np.float64)
+        self.overdraft_only = np.asarray(overdraft_only, dtype=bool)
+        self.accounts = accounts
+
+    @classmethod
+    def from_accounts(cls, accounts, overdraft_rate=OVERDRAFT_RATE):
+        examples = load_examples()
+        accounts = list(accounts)
+        rates, overdraft_only = [], []
+        for account in accounts:
+            if isinstance(account, examples.SavingsAccount):
+                rates.append(account.interest_rate)
+                overdraft_only.append(False)
+            elif isinstance(account, examples.CurrentAccount):
+                rates.append(overdraft_rate)
+                overdraft_only.append(True)
+            else:
+                rates.append(0.0)
+                overdraft_only.append(False)
+        balances = [account.balance for account in accounts]
+        return cls(balances, rates, overdraft_only, accounts)
+
+    def apply_interest(self):
+        # same arithmetic as the per-account methods, so the results are identical
+        charged = ~self.overdraft_only | (self.balances < 0)
+        interest = np.where(charged, self.balances * self.rates, 0.0)
+        self.balances += interest
+        return interest
+
+    def write_back(self):
+        for account, balance in zip(self.accounts, self.balances.tolist()):
+            account.balance = balance
+
+
+def charge_overdraft(account, overdraft_rate=OVERDRAFT_RATE):
+    """The CurrentAccount rule for one account: interest on an overdrawn balance only."""
+    if account.balance < 0:
+        interest = account.balance * overdraft_rate
+        account.balance += interest
+        return interest
+    return 0.0
+
+
+# ------------------------------------------------
+# 2️⃣ The example account classes
+# ------------------------------------------------
+
+@functools.lru_cache(maxsize=None)
+def load_examples():
+    """
+    Import the example file (its name starts with a digit) without its demo
+    output. Cached, so every caller gets the same account classes.
+    """
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        "08_Practical_Examples_of_Inheritance.py")
+    spec = importlib.util.spec_from_file_location("practical_inheritance", path)
+    module = importlib.util.module_from_spec(spec)
+    with contextlib.redirect_stdout(io.StringIO()):
+        spec.loader.exec_module(module)
+    return module
+
+
+# ------------------------------------------------
+# 3️⃣ Usage Example
+# ------------------------------------------------
+
+if __name__ == "__main__":
+    examples = load_examples()
+    portfolio = InterestPortfolio.from_accounts([
+        examples.SavingsAccount("Zara", 10000, 0.05),
+        examples.CurrentAccount("Omar", -400),
+        examples.CurrentAccount("Hina", 3000),
+    ])
+    interest = portfolio.apply_interest()
+    portfolio.write_back()
+    for account, amount in zip(portfolio.accounts, interest):
+        print(f"{account.account_holder}: interest {amount:+.2f}, new balance {account.balance:.2f}")
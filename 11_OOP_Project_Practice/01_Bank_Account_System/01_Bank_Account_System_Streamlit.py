@@ -1,5 +1,8 @@
 import streamlit as st
 
+from bank_ledger import DEPOSIT, WITHDRAW, TransactionLedger
+from money import Money, to_minor
+
 # ---------------------------
 #  Page Configuration
 # ---------------------------
@@ -38,19 +41,32 @@ st.markdown(
 class BankAccount:
     def __init__(self, name, balance=0):
         self.name = name
-        self.balance = balance
+        # every deposit / withdrawal is kept, the balance is read from the ledger
+        # amounts are exact whole paisa (Money), not floats
+        self.ledger = TransactionLedger()
+        balance = to_minor(balance)
+        if balance < 0:
+            raise ValueError("Opening balance cannot be negative.")
+        if balance > 0:
+            self.ledger.record(DEPOSIT, balance)
+
+    @property
+    def balance(self):
+        return self.ledger.balance
 
     def deposit(self, amount):
+        amount = to_minor(amount)
         if amount > 0:
-            self.balance += amount
-            return f"✅ Deposited Rs.{amount}. New Balance: Rs.{self.balance}"
+            self.ledger.record(DEPOSIT, amount)
+            return f"✅ Deposited Rs.{Money(amount)}. New Balance: Rs.{self.balance}"
         else:
             return "❌ Invalid amount!"
 
     def withdraw(self, amount):
+        amount = to_minor(amount)
         if 0 < amount <= self.balance:
-            self.balance -= amount
-            return f"✅ Withdrawn Rs.{amount}. Remaining Balance: Rs.{self.balance}"
+            self.ledger.record(WITHDRAW, amount)
+            return f"✅ Withdrawn Rs.{Money(amount)}. Remaining Balance: Rs.{self.balance}"
         else:
             return "❌ Insufficient funds or invalid amount!"
 
@@ -62,7 +78,7 @@ class BankAccount:
 #  Sidebar Navigation
 # ---------------------------
 st.sidebar.title("🏦 Bank Menu")
-menu = st.sidebar.radio("Choose an Option:", ["Create Account", "Deposit", "Withdraw", "View Details", "About Developer"])
+menu = st.sidebar.radio("Choose an Option:", ["Create Account", "Deposit", "Withdraw", "View Details", "Transaction History", "About Developer"])
 
 # Initialize session state
 if 'account' not in st.session_state:
@@ -77,7 +93,7 @@ if menu == "Create Account":
     balance = st.number_input("Enter Initial Deposit:", min_value=0, value=0)
     if st.button("Create Account"):
         st.session_state.account = BankAccount(name, balance)
-        st.success(f"🎉 Account Created for {name} with Rs.{balance} initial deposit.")
+        st.success(f"🎉 Account Created for {name} with Rs.{Money.of(balance)} initial deposit.")
 
 elif menu == "Deposit":
     st.header("💰 Deposit Money")
@@ -104,6 +120,25 @@ elif menu == "View Details":
     else:
         st.warning("⚠️ No account found. Please create one first.")
 
+elif menu == "Transaction History":
+    st.header("🧾 Transaction History")
+    account = st.session_state.account
+    if account and len(account.ledger):
+        page_size = st.selectbox("Rows per page", [10, 25, 50], index=0)
+        pages = max(1, -(-len(account.ledger) // page_size))
+        page = st.number_input(f"Page (of {pages:,}, newest first)", min_value=1, max_value=pages, value=1)
+        # only this page is read from the ledger
+        transactions = account.ledger.history((page - 1) * page_size, page_size)
+        st.dataframe(
+            [{"#": t.number, "Time": t.time.strftime("%Y-%m-%d %H:%M:%S"), "Type": t.kind,
+              "Amount (Rs.)": str(t.amount), "Balance (Rs.)": str(t.balance)} for t in transactions],
+            use_container_width=True, hide_index=True
+        )
+    elif account:
+        st.info("No transactions yet.")
+    else:
+        st.warning("⚠️ No account found. Please create one first.")
+
 elif menu == "About Developer":
     st.header("👩‍💻 About Developer")
     st.markdown("""
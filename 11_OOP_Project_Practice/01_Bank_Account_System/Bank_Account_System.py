@@ -13,27 +13,40 @@ Concepts Used:
 - Encapsulation (Private Members)
 - Input Validation and Error Handling
 - Basic Banking Operations (Deposit, Withdraw, Balance Inquiry)
+- Composition: every account keeps its transactions in a `TransactionLedger`
+  (see `bank_ledger.py`), so the history can be browsed page by page
+- Exact money: amounts are whole paisa (`Money`, see `money.py`), never floats
 """
 
+from bank_ledger import DEPOSIT, WITHDRAW, TransactionLedger
+from money import Money, to_minor
+
 # ------------------------------------------------
 # 1️⃣ Class Definition
 # ------------------------------------------------
 
 class BankAccount:
-    def __init__(self, account_holder, balance=0):
+    def __init__(self, account_holder, balance=0, ledger=None):
         # Public attribute
         self.account_holder = account_holder
-        
-        # Private attribute (Encapsulation)
-        self.__balance = balance
+
+        # Private attribute (Encapsulation): the balance is derived from the
+        # ledger of transactions instead of being overwritten in place
+        self.__ledger = ledger if ledger is not None else TransactionLedger()
+        balance = to_minor(balance)
+        if balance < 0:
+            raise ValueError("Opening balance cannot be negative.")
+        if balance > 0 and len(self.__ledger) == 0:
+            self.__ledger.record(DEPOSIT, balance)
 
     # ------------------------------------------------
     # 2️⃣ Method to deposit money
     # ------------------------------------------------
     def deposit(self, amount):
+        amount = to_minor(amount)
         if amount > 0:
-            self.__balance += amount
-            print(f"✅ {amount} deposited successfully.")
+            self.__ledger.record(DEPOSIT, amount)
+            print(f"✅ {Money(amount)} deposited successfully.")
         else:
             print("❌ Deposit amount must be greater than 0.")
 
@@ -41,35 +54,50 @@ class BankAccount:
     # 3️⃣ Method to withdraw money
     # ------------------------------------------------
     def withdraw(self, amount):
+        amount = to_minor(amount)
         if amount <= 0:
             print("❌ Withdrawal amount must be greater than 0.")
-        elif amount > self.__balance:
+        elif amount > self.__ledger.balance:
             print("❌ Insufficient balance!")
         else:
-            self.__balance -= amount
-            print(f"✅ {amount} withdrawn successfully.")
+            self.__ledger.record(WITHDRAW, amount)
+            print(f"✅ {Money(amount)} withdrawn successfully.")
 
     # ------------------------------------------------
     # 4️⃣ Method to check current balance
     # ------------------------------------------------
     def check_balance(self):
-        print(f"💰 Current Balance: {self.__balance}")
+        print(f"💰 Current Balance: {self.__ledger.balance}")
 
     # ------------------------------------------------
     # 5️⃣ Getter Method (Access private balance)
     # ------------------------------------------------
     def get_balance(self):
-        return self.__balance
+        return self.__ledger.balance
+
+    # ------------------------------------------------
+    # 6️⃣ Transaction history (newest first, one page at a time)
+    # ------------------------------------------------
+    def get_history(self, page=1, page_size=10):
+        return self.__ledger.history((page - 1) * page_size, page_size)
+
+    def show_history(self, page=1, page_size=10):
+        transactions = self.get_history(page, page_size)
+        if not transactions:
+            print("📭 No transactions on this page.")
+        for t in transactions:
+            print(f"#{t.number:<6} {t.time:%Y-%m-%d %H:%M}  {t.kind:<8} {t.amount:>12,.2f}  "
+                  f"balance {t.balance:>12,.2f}")
 
     # ------------------------------------------------
-    # 6️⃣ String Representation of the Account
+    # 7️⃣ String Representation of the Account
     # ------------------------------------------------
     def __str__(self):
-        return f"Account Holder: {self.account_holder}, Balance: {self.__balance}"
+        return f"Account Holder: {self.account_holder}, Balance: {self.__ledger.balance}"
 
 
 # ------------------------------------------------
-# 7️⃣ Usage Example
+# 8️⃣ Usage Example
 # ------------------------------------------------
 
 def main():
@@ -84,17 +112,22 @@ def main():
         print("2. Withdraw Money")
         print("3. Check Balance")
         print("4. Account Info")
-        print("5. Exit")
-
-        choice = input("Enter your choice (1-5): ")
-
-        if choice == "1":
-            amount = float(input("Enter amount to deposit: "))
-            account.deposit(amount)
-
-        elif choice == "2":
-            amount = float(input("Enter amount to withdraw: "))
-            account.withdraw(amount)
+        print("5. Transaction History")
+        print("6. Exit")
+
+        choice = input("Enter your choice (1-6): ")
+
+        if choice in ("1", "2"):
+            action = "deposit" if choice == "1" else "withdraw"
+            try:
+                amount = Money.of(input(f"Enter amount to {action}: "))
+            except ValueError as e:
+                print(f"❌ {e}")
+                continue
+            if choice == "1":
+                account.deposit(amount)
+            else:
+                account.withdraw(amount)
 
         elif choice == "3":
             account.check_balance()
@@ -103,6 +136,10 @@ def main():
             print(account)
 
         elif choice == "5":
+            page = input("Page (1 = newest): ").strip()
+            account.show_history(int(page) if page.isdigit() and int(page) > 0 else 1)
+
+        elif choice == "6":
             print("Thank you for using the Bank Account System. Goodbye!")
             break
 
@@ -111,7 +148,7 @@ def main():
 
 
 # ------------------------------------------------
-# 8️⃣ Run the Program
+# 9️⃣ Run the Program
 # ------------------------------------------------
 if __name__ == "__main__":
     main()
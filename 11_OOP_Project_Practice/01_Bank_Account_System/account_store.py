@@ -0,0 +1,341 @@
+# ================================================
+# File: account_store.py
+# Topic: Many accounts in one store, with thread-safe transfers
+# ================================================
+
+"""
+`BankAccount` models a single customer. `AccountStore` holds millions of
+accounts and moves money between them safely from many threads at once.
+
+- Balances live in one int64 NumPy array indexed by account number (8 bytes
+  per account instead of a Python object per account). Like the ledger they
+  are whole minor units (see `money.py`): amounts passed in must be ints or
+  `Money`, and a float is rejected rather than silently truncated.
+- Accounts are guarded by striped locks: account `i` belongs to stripe
+  `i % stripes`. Any operation only locks the stripe(s) of the accounts it
+  touches, so unrelated transfers do not wait for each other.
+- `transfer` always takes its two stripe locks lowest stripe first. Two
+  threads moving money in opposite directions between the same pair of
+  accounts therefore cannot deadlock.
+- Growing the balance array (when new accounts no longer fit) holds every
+  stripe lock, so no operation ever writes into an array that is being
+  replaced.
+- `apply_batch` runs a whole chunk of operations (e.g. from a statement
+  file) taking each stripe lock once for the chunk, and reads / writes each
+  account's balance once, instead of once per operation.
+- `save_snapshot` writes the account table as a binary file of fixed-width
+  fields; `load_snapshot` memory-maps it, so a restart serves balances right
+  away instead of re-parsing or replaying anything. Saving a mapped store
+  first copies its columns into memory and closes the mapping, because
+  Windows cannot replace a file that is still mapped.
+
+Snapshot layout (little-endian):
+
+    header   magic b"BANKSNP1", account count (int64), holder width (int64)
+    balances count x int64 minor units            <- mapped as the balance array
+    holders  count x `holder width` bytes of UTF-8 (only if any account has a name)
+"""
+
+import operator
+import os
+import struct
+import threading
+from contextlib import ExitStack, contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from bank_ledger import DEPOSIT, WITHDRAW
+from money import Money
+
+# operation kinds for `apply_batch` (deposit / withdraw share the ledger's codes)
+TRANSFER = 3
+
+SNAPSHOT_MAGIC = b"BANKSNP1"
+SNAPSHOT_HEADER = struct.Struct("<8sqq")    # magic, accounts, holder width
+
+# ------------------------------------------------
+# 1️⃣ Account store
+# ------------------------------------------------
+
+class AccountStore:
+    def __init__(self, stripes: int = 1024, capacity: int = 1024):
+        if stripes < 1:
+            raise ValueError("stripes must be at least 1")
+        self._locks = [threading.Lock() for _ in range(stripes)]
+        self._balances = np.zeros(max(capacity, 1), dtype=np.int64)
+        self._count = 0
+        # names given in this process; anonymous accounts cost nothing here
+        self._holders: Dict[int, str] = {}
+        # fixed-width names from a loaded snapshot (memory-mapped, read on demand)
+        self._holder_column: Optional[np.ndarray] = None
+        # serialises opening accounts; balances are guarded by the stripes
+        self._open_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def stripes(self) -> int:
+        return len(self._locks)
+
+    # ---------------- locking ----------------
+
+    def _lock(self, account_id: int) -> threading.Lock:
+        return self._locks[account_id % len(self._locks)]
+
+    @contextmanager
+    def _all_locks(self) -> Iterator[None]:
+        # same fixed order as `transfer`, so this cannot deadlock with it
+        with ExitStack() as stack:
+            for lock in self._locks:
+                stack.enter_context(lock)
+            yield
+
+    def _check(self, account_id: int) -> None:
+        if not 0 <= account_id < self._count:
+            raise KeyError(f"no account {account_id}")
+
+    # ---------------- opening accounts ----------------
+
+    def _reserve(self, n: int) -> int:
+        """Make room for `n` more accounts and return the first new account number."""
+        first = self._count
+        if first + n > len(self._balances):
+            capacity = max(first + n, 2 * len(self._balances))
+            with self._all_locks():
+                grown = np.zeros(capacity, dtype=np.int64)
+                grown[:first] = self._balances[:first]
+                self._balances = grown
+        return first
+
+    def open_account(self, holder: Optional[str] = None, balance: int = 0) -> int:
+        """Open one account and return its account number."""
+        balance = operator.index(balance)
+        if balance < 0:
+            raise ValueError("opening balance cannot be negative")
+        with self._open_lock:
+            account_id = self._reserve(1)
+            self._balances[account_id] = balance
+            if holder is not None:
+                self._holders[account_id] = holder
+            self._count += 1
+        return account_id
+
+    def open_accounts(self, n: int, balance: int = 0) -> range:
+        """Open `n` anonymous accounts in one step; returns their account numbers."""
+        balance = operator.index(balance)
+        if balance < 0:
+            raise ValueError("opening balance cannot be negative")
+        with self._open_lock:
+            first = self._reserve(n)
+            self._balances[first:first + n] = balance
+            self._count += n
+        return range(first, first + n)
+
+    def holder(self, account_id: int) -> Optional[str]:
+        self._check(account_id)
+        holder = self._holders.get(account_id)
+        column = self._holder_column
+        if holder is None and column is not None and account_id < len(column):
+            holder = column[account_id].decode("utf-8") or None
+        return holder
+
+    # ---------------- single-account operations ----------------
+
+    def balance(self, account_id: int) -> Money:
+        self._check(account_id)
+        with self._lock(account_id):
+            return Money(self._balances[account_id])
+
+    def deposit(self, account_id: int, amount: int) -> bool:
+        self._check(account_id)
+        amount = operator.index(amount)
+        if amount <= 0:
+            return False
+        with self._lock(account_id):
+            self._balances[account_id] += amount
+        return True
+
+    def withdraw(self, account_id: int, amount: int) -> bool:
+        self._check(account_id)
+        amount = operator.index(amount)
+        if amount <= 0:
+            return False
+        with self._lock(account_id):
+            balances = self._balances
+            if balances[account_id] < amount:
+                return False
+            balances[account_id] -= amount
+        return True
+
+    # ---------------- transfers ----------------
+
+    def transfer(self, src: int, dst: int, amount: int) -> bool:
+        """Atomically move `amount` from `src` to `dst`; False if it is not allowed."""
+        self._check(src)
+        self._check(dst)
+        amount = operator.index(amount)
+        if amount <= 0 or src == dst:
+            return False
+
+        stripes = len(self._locks)
+        first, second = sorted((src % stripes, dst % stripes))
+        with self._locks[first]:
+            if second == first:
+                return self._move(src, dst, amount)
+            with self._locks[second]:
+                return self._move(src, dst, amount)
+
+    def _move(self, src: int, dst: int, amount: int) -> bool:
+        # caller holds the stripe locks of both accounts
+        balances = self._balances
+        if balances[src] < amount:
+            return False
+        balances[src] -= amount
+        balances[dst] += amount
+        return True
+
+    # ---------------- batches ----------------
+
+    def apply_batch(self, kinds: Sequence[int], accounts: Sequence[int],
+                    targets: Sequence[int], amounts: Sequence[int]) -> List[Tuple[int, str]]:
+        """Apply operations in order; returns (position, reason) for each rejected one.
+
+        `targets` is only read for transfers. The result is exactly the same as
+        applying the operations one by one in that order. Like `deposit`,
+        amounts must be whole minor units: TypeError for any other dtype.
+        """
+        amounts = np.asarray(amounts)
+        if amounts.size and not np.issubdtype(amounts.dtype, np.integer):
+            raise TypeError(f"amounts must be integer minor units, not {amounts.dtype}")
+        amounts = amounts.tolist()
+        n, stripes = self._count, len(self._locks)
+        ids = np.concatenate((np.asarray(accounts, dtype=np.int64),
+                              np.asarray(targets, dtype=np.int64)))
+        ids = np.unique(ids[(ids >= 0) & (ids < n)])
+        touched = np.unique(ids % stripes).tolist()
+
+        rejected = []
+        reject = rejected.append
+        with ExitStack() as stack:
+            for stripe in touched:       # ascending, like `transfer`
+                stack.enter_context(self._locks[stripe])
+            # every touched balance is read once and written back once
+            current = dict(zip(ids.tolist(), self._balances[ids].tolist()))
+            for i, (kind, account, target, amount) in enumerate(zip(kinds, accounts, targets, amounts)):
+                balance = current.get(account)
+                if balance is None:
+                    reject((i, "unknown account"))
+                elif amount <= 0:
+                    reject((i, "amount must be positive"))
+                elif kind == DEPOSIT:
+                    current[account] = balance + amount
+                elif kind == WITHDRAW:
+                    if balance < amount:
+                        reject((i, "insufficient funds"))
+                    else:
+                        current[account] = balance - amount
+                elif kind == TRANSFER:
+                    received = current.get(target)
+                    if received is None:
+                        reject((i, "unknown target account"))
+                    elif target == account:
+                        reject((i, "transfer to the same account"))
+                    elif balance < amount:
+                        reject((i, "insufficient funds"))
+                    else:
+                        current[account] = balance - amount
+                        current[target] = received + amount
+                else:
+                    reject((i, "unknown operation"))
+            if current:
+                self._balances[ids] = np.fromiter(current.values(), dtype=np.int64, count=len(ids))
+        return rejected
+
+    # ---------------- totals ----------------
+
+    def total(self) -> Money:
+        """Sum of all balances, taken while no transfer is half done."""
+        with self._all_locks():
+            return Money(self._balances[:self._count].sum())
+
+    def balances(self) -> np.ndarray:
+        """A consistent copy of every balance, indexed by account number."""
+        with self._all_locks():
+            return self._balances[:self._count].copy()
+
+    # ---------------- snapshots ----------------
+
+    def save_snapshot(self, path: str) -> None:
+        """Write every account to `path` atomically (temporary file, then rename)."""
+        with self._open_lock:
+            balances = self.balances()
+            holders = self._holder_array()
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            width = holders.itemsize if holders is not None else 0
+            f.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, len(balances), width))
+            f.write(memoryview(balances.astype("<i8", copy=False)))
+            if holders is not None:
+                f.write(memoryview(holders))
+            f.flush()
+            os.fsync(f.fileno())
+        self._unmap()
+        os.replace(tmp, path)
+
+    def _unmap(self) -> None:
+        """Move memory-mapped columns into ordinary arrays and close the mappings.
+
+        `save_snapshot` may be writing over the very file this store was
+        loaded from. Other stores loaded from that file in this process still
+        hold their own mapping.
+        """
+        with self._open_lock, self._all_locks():
+            if isinstance(self._balances, np.memmap):
+                self._balances = np.array(self._balances)
+            if isinstance(self._holder_column, np.memmap):
+                self._holder_column = np.array(self._holder_column)
+
+    def _holder_array(self) -> Optional[np.ndarray]:
+        """All names as one fixed-width byte column, or None if every account is anonymous."""
+        column = self._holder_column
+        if not self._holders and column is None:
+            return None
+        encoded = {i: name.encode("utf-8") for i, name in self._holders.items()}
+        width = max([len(b) for b in encoded.values()] + [column.itemsize if column is not None else 0])
+        holders = np.zeros(self._count, dtype=f"S{max(width, 1)}")
+        if column is not None:
+            holders[:len(column)] = column
+        if encoded:
+            holders[np.fromiter(encoded, dtype=np.int64, count=len(encoded))] = list(encoded.values())
+        return holders
+
+    @classmethod
+    def load_snapshot(cls, path: str, stripes: int = 1024) -> "AccountStore":
+        """A store backed by a memory-mapped snapshot; nothing is read up front.
+
+        The mapping is copy-on-write: balances change in memory and the file
+        only changes with the next `save_snapshot`, after which the store
+        keeps its accounts in memory instead.
+        """
+        with open(path, "rb") as f:
+            header = f.read(SNAPSHOT_HEADER.size)
+            size = os.fstat(f.fileno()).st_size
+        if len(header) < SNAPSHOT_HEADER.size:
+            raise ValueError(f"{path} is not an account snapshot")
+        magic, count, width = SNAPSHOT_HEADER.unpack(header)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError(f"{path} is not an account snapshot")
+        if size != SNAPSHOT_HEADER.size + count * (8 + width):
+            raise ValueError(f"{path} is truncated or corrupt")
+
+        store = cls(stripes, capacity=1)
+        if count:
+            store._balances = np.memmap(path, dtype="<i8", mode="c",
+                                        offset=SNAPSHOT_HEADER.size, shape=(count,))
+            if width:
+                store._holder_column = np.memmap(path, dtype=f"S{width}", mode="r",
+                                                 offset=SNAPSHOT_HEADER.size + 8 * count, shape=(count,))
+        store._count = count
+        return store
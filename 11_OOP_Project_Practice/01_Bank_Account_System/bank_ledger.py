@@ -0,0 +1,196 @@
+# ================================================
+# File: bank_ledger.py
+# Topic: Append-only transaction ledger with balance snapshots
+# ================================================
+
+"""
+Every deposit and withdrawal is kept as an event in an append-only ledger,
+instead of only overwriting a balance.
+
+- Events are fixed-width binary records (kind, amount, time), so event `i`
+  starts at byte `i * EVENT_SIZE` and any page of the history can be read
+  with a single seek.
+- Amounts and balances are whole minor units (see `money.py`), so replaying
+  a million events gives exactly the balance that was recorded.
+- The current balance is kept alongside, so reading it is O(1).
+- Every `snapshot_every` events the balance is written to a small snapshot
+  file. Reopening a ledger starts from the last snapshot and replays only the
+  events after it, and a history page only needs the events since the
+  snapshot before it to compute the running balance.
+
+Without a `path` the ledger lives in memory (as in the Streamlit app).
+"""
+
+import io
+import os
+import struct
+import time
+from datetime import datetime
+from typing import BinaryIO, List, NamedTuple, Optional
+
+import numpy as np
+
+from money import Money
+
+# ------------------------------------------------
+# 1️⃣ Record formats
+# ------------------------------------------------
+
+DEPOSIT, WITHDRAW = 1, 2
+KIND_NAMES = {DEPOSIT: "Deposit", WITHDRAW: "Withdraw"}
+
+# packed little-endian records: 17 bytes per event, 16 per snapshot
+EVENT_DTYPE = np.dtype([("kind", "i1"), ("amount", "<i8"), ("time", "<f8")])
+SNAPSHOT_DTYPE = np.dtype([("events", "<i8"), ("balance", "<i8")])
+EVENT_SIZE = EVENT_DTYPE.itemsize
+SNAPSHOT_SIZE = SNAPSHOT_DTYPE.itemsize
+# the same event layout for writing one record at a time
+EVENT_STRUCT = struct.Struct("<bqd")
+
+
+class Transaction(NamedTuple):
+    number: int          # 1-based position in the ledger
+    kind: str
+    amount: Money
+    balance: Money       # balance right after this transaction
+    time: datetime
+
+
+def _signed(events: np.ndarray) -> np.ndarray:
+    return np.where(events["kind"] == WITHDRAW, -events["amount"], events["amount"])
+
+
+def _running_balance(start: int, events: np.ndarray) -> np.ndarray:
+    """Balance after each event, in minor units."""
+    return start + np.cumsum(_signed(events), dtype=np.int64)
+
+
+# ------------------------------------------------
+# 2️⃣ Ledger
+# ------------------------------------------------
+
+class TransactionLedger:
+    def __init__(self, path: Optional[str] = None, snapshot_every: int = 10_000):
+        self.path = path
+        self.snapshot_every = snapshot_every
+        if path is None:
+            self._events: BinaryIO = io.BytesIO()
+            self._snapshot_file: Optional[BinaryIO] = None
+        else:
+            self._events = open(path, "a+b")
+            self._snapshot_file = open(path + ".snap", "a+b")
+        self._count = 0
+        self._balance = 0
+        # (events covered, balance) every `snapshot_every` events, oldest first
+        self._snapshots = np.zeros(0, dtype=SNAPSHOT_DTYPE)
+        self.replayed = 0
+        if path is not None:
+            self._recover()
+
+    # ---------------- startup ----------------
+
+    def _recover(self) -> None:
+        size = self._events.seek(0, os.SEEK_END)
+        self._count = size // EVENT_SIZE
+        if size % EVENT_SIZE:
+            # a crash in the middle of an append left a partial record behind
+            self._events.truncate(self._count * EVENT_SIZE)
+
+        snap_size = self._snapshot_file.seek(0, os.SEEK_END)
+        self._snapshot_file.seek(0)
+        snapshots = np.frombuffer(
+            self._snapshot_file.read(snap_size - snap_size % SNAPSHOT_SIZE), dtype=SNAPSHOT_DTYPE
+        )
+        # a snapshot is only trusted if the events it covers made it to disk
+        self._snapshots = snapshots[snapshots["events"] <= self._count].copy()
+        if len(self._snapshots) < len(snapshots) or snap_size % SNAPSHOT_SIZE:
+            self._rewrite_snapshots()
+
+        covered, balance = self._last_snapshot()
+        tail = self._read_events(covered, self._count)
+        self.replayed = len(tail)
+        self._balance = int(_running_balance(balance, tail)[-1]) if len(tail) else balance
+
+    def _rewrite_snapshots(self) -> None:
+        self._snapshot_file.truncate(0)
+        self._snapshot_file.write(self._snapshots.tobytes())
+        self._snapshot_file.flush()
+
+    def _last_snapshot(self, before: Optional[int] = None):
+        """(events covered, balance) of the last snapshot covering at most `before` events."""
+        snapshots = self._snapshots
+        if before is not None:
+            snapshots = snapshots[:np.searchsorted(snapshots["events"], before, side="right")]
+        if not len(snapshots):
+            return 0, 0
+        return int(snapshots["events"][-1]), int(snapshots["balance"][-1])
+
+    # ---------------- writing ----------------
+
+    @property
+    def balance(self) -> Money:
+        return Money(self._balance)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def record(self, kind: int, amount: int, timestamp: Optional[float] = None) -> Money:
+        """Append one event (already validated by the account) and return the new balance.
+
+        `amount` is in minor units, e.g. a `Money`.
+        """
+        amount = int(amount)   # plain int arithmetic, not Money's Python-level operators
+        self._events.seek(0, os.SEEK_END)
+        self._events.write(EVENT_STRUCT.pack(kind, amount, time.time() if timestamp is None else timestamp))
+        self._events.flush()
+        self._balance += amount if kind == DEPOSIT else -amount
+        self._count += 1
+        if self._count % self.snapshot_every == 0:
+            self._snapshot()
+        return Money(self._balance)
+
+    def _snapshot(self) -> None:
+        snapshot = np.array([(self._count, self._balance)], dtype=SNAPSHOT_DTYPE)
+        self._snapshots = np.concatenate((self._snapshots, snapshot))
+        if self._snapshot_file is not None:
+            self._snapshot_file.seek(0, os.SEEK_END)
+            self._snapshot_file.write(snapshot.tobytes())
+            self._snapshot_file.flush()
+
+    # ---------------- reading ----------------
+
+    def _read_events(self, start: int, stop: int) -> np.ndarray:
+        if stop <= start:
+            return np.zeros(0, dtype=EVENT_DTYPE)
+        self._events.seek(start * EVENT_SIZE)
+        data = self._events.read((stop - start) * EVENT_SIZE)
+        return np.frombuffer(data, dtype=EVENT_DTYPE)
+
+    def history(self, offset: int = 0, limit: int = 20, newest_first: bool = True) -> List[Transaction]:
+        """One page of transactions; costs O(limit + snapshot_every), not O(ledger)."""
+        if newest_first:
+            stop = max(self._count - offset, 0)
+            start = max(stop - limit, 0)
+        else:
+            start = min(offset, self._count)
+            stop = min(start + limit, self._count)
+        if start >= stop:
+            return []
+
+        # running balances start at the closest snapshot before the page
+        covered, balance = self._last_snapshot(before=start)
+        events = self._read_events(covered, stop)
+        balances = _running_balance(balance, events)[start - covered:]
+        events = events[start - covered:]
+
+        page = [
+            Transaction(start + i + 1, KIND_NAMES[int(e["kind"])], Money(int(e["amount"])),
+                        Money(int(b)), datetime.fromtimestamp(float(e["time"])))
+            for i, (e, b) in enumerate(zip(events, balances))
+        ]
+        return page[::-1] if newest_first else page
+
+    def close(self) -> None:
+        if self.path is not None:
+            self._events.close()
+            self._snapshot_file.close()
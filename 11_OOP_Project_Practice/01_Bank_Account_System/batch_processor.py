@@ -0,0 +1,259 @@
+# ================================================
+# File: batch_processor.py
+# Topic: Headless processing of large transaction files
+# ================================================
+
+"""
+Runs a statement file of deposits, withdrawals and transfers through an
+`AccountStore` without any `input()` prompts:
+
+    python batch_processor.py transactions.csv --accounts 1000000 --opening-balance 500
+    python batch_processor.py transactions.jsonl --rejected rejected.csv
+    python batch_processor.py transactions.csv --snapshot accounts.snap
+
+With `--snapshot` the accounts are memory-mapped from that file (created with
+`--accounts` on the first run) and the updated table is saved back to it.
+
+Input columns / keys (CSV header or JSONL object):
+
+    type     deposit | withdraw | transfer
+    account  account number
+    amount   e.g. 125.50 (at most two decimals)
+    to       target account number, transfers only
+
+- The file is read `--chunk-rows` rows at a time, so memory stays bounded
+  however large the file is.
+- Each chunk is parsed and validated with pandas / NumPy, then applied with
+  `AccountStore.apply_batch`, which takes every stripe lock once per chunk.
+- Rows that cannot be applied (malformed, unknown account, insufficient
+  funds, ...) are streamed to a rejected-transactions CSV with the reason.
+"""
+
+import argparse
+import csv
+import json
+import os
+import time
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from account_store import TRANSFER, AccountStore
+from bank_ledger import DEPOSIT, WITHDRAW
+from money import DECIMALS, MINOR_PER_MAJOR, Money
+
+# ------------------------------------------------
+# 1️⃣ Input format
+# ------------------------------------------------
+
+KIND_CODES = {"deposit": DEPOSIT, "withdraw": WITHDRAW, "withdrawal": WITHDRAW, "transfer": TRANSFER}
+FIELDS = ["type", "account", "amount", "to"]
+REJECTED_FIELDS = ["row"] + FIELDS + ["reason"]
+# extra column on JSONL chunks: why a line could not be read at all ("" if it could)
+UNREADABLE = "unreadable"
+
+# largest accepted amount, in minor units (10,000,000,000.00)
+MAX_AMOUNT = 10 ** 12
+# a parsed amount with at most DECIMALS decimals is within a few float ulps of
+# a whole number of minor units; anything further off has more decimals
+ULP_TOLERANCE = 2.0 ** -50
+
+
+class BatchResult(NamedTuple):
+    rows: int
+    applied: int
+    rejected: int
+    seconds: float
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def _detect_format(path: str, fmt: Optional[str]) -> str:
+    fmt = (fmt or os.path.splitext(path)[1].lstrip(".")).lower()
+    if fmt == "csv":
+        return "csv"
+    if fmt in ("jsonl", "ndjson", "json"):
+        return "jsonl"
+    raise ValueError(f"unsupported file format: {fmt!r} (use csv or jsonl)")
+
+
+def read_chunks(path: str, fmt: Optional[str] = None, chunk_rows: int = 100_000) -> Iterator[pd.DataFrame]:
+    """The file as DataFrames of at most `chunk_rows` rows with the `FIELDS` columns.
+
+    Numbers are parsed by the reader itself (pandas' C parser for CSV); a
+    column with malformed values simply stays text and is handled row by row
+    in `parse_chunk`. A JSONL line that is not a JSON object becomes an empty
+    row whose `UNREADABLE` column says why, so it is reported, not fatal.
+    """
+    if _detect_format(path, fmt) == "csv":
+        reader = pd.read_csv(path, chunksize=chunk_rows, skipinitialspace=True)
+        for frame in reader:
+            frame.columns = [str(c).strip().lower() for c in frame.columns]
+            yield frame.reindex(columns=FIELDS)
+        return
+
+    with open(path, encoding="utf-8") as f:
+        records: List[dict] = []
+        unreadable: List[str] = []
+        for line_no, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                reason = "" if isinstance(record, dict) else f"not a JSON object (line {line_no})"
+            except json.JSONDecodeError:
+                reason = f"invalid JSON (line {line_no})"
+            records.append({} if reason else record)
+            unreadable.append(reason)
+            if len(records) == chunk_rows:
+                yield _records_frame(records, unreadable)
+                records, unreadable = [], []
+        if records:
+            yield _records_frame(records, unreadable)
+
+
+def _records_frame(records: List[dict], unreadable: List[str]) -> pd.DataFrame:
+    frame = pd.DataFrame.from_records(records)
+    frame.columns = [str(c).strip().lower() for c in frame.columns]
+    frame = frame.reindex(columns=FIELDS, index=range(len(records)))
+    frame[UNREADABLE] = unreadable
+    return frame
+
+
+# ------------------------------------------------
+# 2️⃣ Vectorized parsing
+# ------------------------------------------------
+
+def _kinds(column: pd.Series) -> np.ndarray:
+    """Operation codes (0 = unknown); each distinct spelling is looked up once."""
+    codes, spellings = pd.factorize(column)
+    table = np.array([KIND_CODES.get(str(s).strip().lower(), 0) for s in spellings] + [0], dtype=np.int8)
+    return table[codes]                  # code -1 (missing) picks the trailing 0
+
+
+def _account_numbers(column: pd.Series) -> np.ndarray:
+    """Account numbers as int64; -1 where the text is not a whole, non-negative number."""
+    numbers = pd.to_numeric(column, errors="coerce")
+    whole = (numbers % 1 == 0) & (numbers >= 0) & (numbers < 2 ** 62)
+    return np.where(whole, numbers.fillna(-1), -1).astype(np.int64)
+
+
+def _reject(reasons: np.ndarray, mask: np.ndarray, reason: str) -> None:
+    # keep the first reason found for a row
+    reasons[mask & (reasons == "")] = reason
+
+
+def parse_chunk(frame: pd.DataFrame) -> Tuple[np.ndarray, ...]:
+    """(kinds, accounts, targets, amounts, reasons) for one chunk.
+
+    `reasons` holds "" for rows that parsed cleanly. Amounts are exact minor
+    units: anything finer than one minor unit is rejected, so rounding the
+    parsed float never changes the value.
+    """
+    reasons = np.full(len(frame), "", dtype=object)
+    if UNREADABLE in frame:
+        reasons[:] = frame[UNREADABLE].to_numpy(object)
+
+    kinds = _kinds(frame["type"])
+    _reject(reasons, kinds == 0, "unknown type")
+
+    accounts = _account_numbers(frame["account"])
+    targets = _account_numbers(frame["to"])
+    _reject(reasons, accounts < 0, "bad account number")
+
+    major = pd.to_numeric(frame["amount"], errors="coerce").to_numpy(np.float64)
+    scaled = np.nan_to_num(major) * MINOR_PER_MAJOR
+    _reject(reasons, ~np.isfinite(major) | (np.abs(scaled) >= MAX_AMOUNT), "bad amount")
+    whole = np.round(scaled)
+    _reject(reasons, np.abs(scaled - whole) > np.abs(scaled) * ULP_TOLERANCE,
+            f"more than {DECIMALS} decimal places")
+    amounts = np.where(reasons == "", whole, 0).astype(np.int64)
+    return kinds, accounts, targets, amounts, reasons
+
+
+# ------------------------------------------------
+# 3️⃣ Processing
+# ------------------------------------------------
+
+def _as_written(value):
+    # numeric columns come back as floats: report 7.0 as 7, as it was in the file
+    return int(value) if isinstance(value, float) and value.is_integer() else value
+
+
+def process_file(store: AccountStore, path: str, rejected_path: Optional[str] = None,
+                 fmt: Optional[str] = None, chunk_rows: int = 100_000) -> BatchResult:
+    """Stream `path` through `store`, writing rejected rows to `rejected_path` (if given)."""
+    rows = applied = rejected = 0
+    start = time.perf_counter()
+    report = open(rejected_path, "w", newline="", encoding="utf-8") if rejected_path else None
+    try:
+        writer = csv.writer(report) if report else None
+        if writer:
+            writer.writerow(REJECTED_FIELDS)
+        for frame in read_chunks(path, fmt, chunk_rows):
+            kinds, accounts, targets, amounts, reasons = parse_chunk(frame)
+            valid = np.flatnonzero(reasons == "")
+            for position, reason in store.apply_batch(
+                kinds[valid].tolist(), accounts[valid].tolist(),
+                targets[valid].tolist(), amounts[valid].tolist()
+            ):
+                reasons[valid[position]] = reason
+
+            failed = np.flatnonzero(reasons != "")
+            if writer and len(failed):
+                values = frame[FIELDS].iloc[failed].astype(object).fillna("").to_numpy()
+                writer.writerows(
+                    [rows + i + 1, *map(_as_written, row), reason]
+                    for i, row, reason in zip(failed.tolist(), values.tolist(), reasons[failed])
+                )
+            rows += len(frame)
+            rejected += len(failed)
+            applied += len(frame) - len(failed)
+    finally:
+        if report:
+            report.close()
+    return BatchResult(rows, applied, rejected, time.perf_counter() - start)
+
+
+# ------------------------------------------------
+# 4️⃣ Command line
+# ------------------------------------------------
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Apply a transaction file to the account store.")
+    parser.add_argument("path", help="CSV or JSONL file of deposit / withdraw / transfer rows")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="override file extension")
+    parser.add_argument("--accounts", type=int, default=1_000_000,
+                        help="accounts to open (0 .. N-1) when there is no snapshot yet")
+    parser.add_argument("--opening-balance", default="0", help="opening balance of every account")
+    parser.add_argument("--rejected", default="rejected_transactions.csv",
+                        help="where to write rejected rows")
+    parser.add_argument("--chunk-rows", type=int, default=100_000)
+    parser.add_argument("--snapshot", help="account snapshot to start from and save to")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.snapshot and os.path.exists(args.snapshot):
+        store = AccountStore.load_snapshot(args.snapshot)
+        print(f"Mapped {len(store):,} accounts from {args.snapshot} "
+              f"in {(time.perf_counter() - start) * 1000:.1f} ms")
+    else:
+        store = AccountStore()
+        store.open_accounts(args.accounts, Money.of(args.opening_balance))
+    before = store.total()
+
+    result = process_file(store, args.path, args.rejected, args.format, args.chunk_rows)
+    print(f"Processed {result.rows:,} rows in {result.seconds:.2f}s "
+          f"-> {result.rows_per_sec:,.0f} rows/sec")
+    print(f"Applied {result.applied:,}, rejected {result.rejected:,} (see {args.rejected})")
+    print(f"Total balance: {before:,.2f} -> {store.total():,.2f}")
+    if args.snapshot:
+        store.save_snapshot(args.snapshot)
+        print(f"Saved {len(store):,} accounts to {args.snapshot}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,407 @@
+# ================================================
+# File: benchmark_bank.py
+# Topic: Performance checks for the Bank Account System
+# ================================================
+
+"""
+Small, self-contained benchmarks for the bank modules.
+
+Every benchmark works in a temporary directory, so running this file never
+touches real account data.
+
+Run:
+    python benchmark_bank.py
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+
+try:
+    import resource                 # Unix only; used for the peak-memory line
+except ImportError:
+    resource = None
+
+from account_store import AccountStore
+from batch_processor import process_file
+from money import Money, to_minor
+from bank_ledger import (DEPOSIT, EVENT_DTYPE, EVENT_STRUCT, SNAPSHOT_DTYPE, WITHDRAW,
+                         TransactionLedger, _running_balance)
+
+
+# ------------------------------------------------
+# 1️⃣ Ledger: appends, replay from snapshot, paged history
+# ------------------------------------------------
+
+def write_ledger(path, n_events, snapshot_every, seed=1):
+    """A ledger file of random deposits / withdrawals, written in bulk with NumPy."""
+    rng = np.random.default_rng(seed)
+    events = np.zeros(n_events, dtype=EVENT_DTYPE)
+    events["kind"] = np.where(rng.random(n_events) < 0.55, DEPOSIT, WITHDRAW)
+    events["amount"] = rng.integers(100, 500_000, n_events)      # 1.00 .. 4,999.99
+    events["time"] = 1_700_000_000 + np.arange(n_events, dtype=np.float64)
+    events.tofile(path)
+
+    balances = _running_balance(0, events)
+    covered = np.arange(snapshot_every, n_events + 1, snapshot_every)
+    snapshots = np.zeros(len(covered), dtype=SNAPSHOT_DTYPE)
+    snapshots["events"] = covered
+    snapshots["balance"] = balances[covered - 1]
+    snapshots.tofile(path + ".snap")
+    return int(balances[-1])
+
+
+def python_replay(path):
+    """What replaying looks like without snapshots or NumPy: one event at a time."""
+    balance = 0
+    with open(path, "rb") as f:
+        for kind, amount, _ in EVENT_STRUCT.iter_unpack(f.read()):
+            balance += amount if kind == DEPOSIT else -amount
+    return balance
+
+
+def bench_ledger(n_events=10_000_000, snapshot_every=10_000, tail=7_777, n_appends=100_000):
+    print(f"\n--- Ledger with {n_events:,} events (snapshot every {snapshot_every:,}) ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "ledger.bin")
+        start = time.perf_counter()
+        expected = write_ledger(path, n_events, snapshot_every)
+        print(f"write test ledger            : {time.perf_counter() - start:8.2f} s")
+
+        # events appended after the last snapshot, as a live account would
+        ledger = TransactionLedger(path, snapshot_every)
+        for i in range(tail):
+            expected = ledger.record(DEPOSIT if i % 3 else WITHDRAW, 1_025, 1_800_000_000 + i)
+        ledger.close()
+        n_events += tail
+        assert os.path.getsize(path) == n_events * EVENT_DTYPE.itemsize
+
+        start = time.perf_counter()
+        ledger = TransactionLedger(path, snapshot_every)
+        print(f"reopen (snapshot + tail)     : {(time.perf_counter() - start) * 1000:8.2f} ms "
+              f"({ledger.replayed:,} events replayed)")
+        assert ledger.balance == expected
+
+        no_snapshots = os.path.join(tmp, "full.bin")
+        shutil.copy(path, no_snapshots)
+        start = time.perf_counter()
+        full = TransactionLedger(no_snapshots, snapshot_every)
+        print(f"full replay, NumPy           : {(time.perf_counter() - start) * 1000:8.2f} ms "
+              f"({full.replayed:,} events replayed)")
+        assert full.balance == expected
+        full.close()
+
+        start = time.perf_counter()
+        assert python_replay(path) == expected
+        print(f"full replay, Python loop     : {(time.perf_counter() - start) * 1000:8.2f} ms")
+
+        for label, offset in [("newest page", 0), ("page in the middle", n_events // 2)]:
+            start = time.perf_counter()
+            page = ledger.history(offset, 20)
+            print(f"history, {label:20}: {(time.perf_counter() - start) * 1000:8.3f} ms")
+        assert page[0].number == n_events - n_events // 2
+
+        start = time.perf_counter()
+        for i in range(n_appends):
+            ledger.record(DEPOSIT, 150)
+        print(f"append                       : {(time.perf_counter() - start) * 1e6 / n_appends:8.2f} us/event")
+        ledger.close()
+
+
+# ------------------------------------------------
+# 2️⃣ Account store: concurrent transfers
+# ------------------------------------------------
+
+def run_transfers(store, n_threads, transfers_per_thread, seed=2):
+    """Every thread hammers random pairs of accounts; returns (seconds, accepted)."""
+    rng = np.random.default_rng(seed)
+    n = len(store)
+    work = [
+        (rng.integers(0, n, transfers_per_thread).tolist(),
+         rng.integers(0, n, transfers_per_thread).tolist(),
+         rng.integers(100, 50_000, transfers_per_thread).tolist())
+        for _ in range(n_threads)
+    ]
+    accepted = [0] * n_threads
+
+    def worker(t):
+        transfer = store.transfer
+        ok = 0
+        for src, dst, amount in zip(*work[t]):
+            ok += transfer(src, dst, amount)
+        accepted[t] = ok
+
+    threads = [threading.Thread(target=worker, args=(t,)) for t in range(n_threads)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, sum(accepted)
+
+
+def bench_transfers(n_accounts=1_000_000, opening=100_000, transfers_per_thread=200_000):
+    # amounts are minor units: every account opens with 1,000.00
+    print(f"\n--- Account store with {n_accounts:,} accounts ---")
+    start = time.perf_counter()
+    store = AccountStore()
+    store.open_accounts(n_accounts, opening)
+    print(f"open accounts                : {(time.perf_counter() - start) * 1000:8.2f} ms")
+    expected = n_accounts * opening
+
+    for n_threads in (1, 4, 8):
+        seconds, accepted = run_transfers(store, n_threads, transfers_per_thread, seed=n_threads)
+        total = n_threads * transfers_per_thread
+        print(f"{n_threads} thread(s), {total:>9,} transfers: {total / seconds:10,.0f} transfers/sec "
+              f"({total - accepted:,} rejected)")
+        balances = store.balances()
+        assert store.total() == expected, "money was created or destroyed"
+        assert balances.min() >= 0, "an account was overdrawn"
+
+    # a few hot accounts: maximum lock contention, opposite directions at once
+    hot = AccountStore(stripes=4)
+    hot.open_accounts(8, opening)
+    seconds, _ = run_transfers(hot, 8, transfers_per_thread // 4)
+    assert hot.total() == 8 * opening
+    print(f"8 threads on 8 hot accounts  : {8 * (transfers_per_thread // 4) / seconds:10,.0f} transfers/sec")
+    print("total money conserved        : yes")
+
+
+# ------------------------------------------------
+# 3️⃣ Money: integer minor units vs Decimal vs float
+# ------------------------------------------------
+
+def accumulate(amounts, start):
+    """The hot path of every ledger and account: `balance += amount`."""
+    balance = start
+    for amount in amounts:
+        balance += amount
+    return balance
+
+
+def bench_money(n_timed=1_000_000, n_checked=10_000_000, seed=3):
+    print(f"\n--- Money arithmetic ({n_timed:,} additions) ---")
+    rng = np.random.default_rng(seed)
+    cents = rng.integers(1, 1_000_000, n_timed)                    # 0.01 .. 9,999.99
+    minor = np.where(rng.random(n_timed) < 0.5, cents, -cents).tolist()
+    variants = [
+        ("float", 0.0, [c / 100 for c in minor]),
+        ("Decimal", Decimal(0), [Decimal(c).scaleb(-2) for c in minor]),
+        ("int minor units (ledger)", 0, minor),
+    ]
+    results, ns = {}, {}
+    for label, start_value, amounts in variants:
+        start = time.perf_counter()
+        results[label] = accumulate(amounts, start_value)
+        ns[label] = (time.perf_counter() - start) * 1e9 / n_timed
+        print(f"{label:28}: {ns[label]:6.1f} ns/op")
+    exact = sum(minor)
+    assert results["Decimal"] == Decimal(exact).scaleb(-2)
+    assert results["int minor units (ledger)"] == exact
+    assert ns["int minor units (ledger)"] < ns["Decimal"], "int minor units slower than Decimal"
+
+    texts = [str(Money(c)) for c in minor[:200_000]]
+    def via_decimal(text):
+        # the same conversion done with Decimal: exact to the cent, then minor units
+        value = Decimal(text)
+        if value != value.quantize(Decimal("0.01")):
+            raise ValueError(text)
+        return int(value.scaleb(2))
+
+    floats = [c / 100 for c in minor[:200_000]]
+    parsers = [
+        ("Decimal(text), no check", Decimal, texts),
+        ("Decimal text -> minor", via_decimal, texts),
+        ("to_minor(text)", to_minor, texts),
+        ("Decimal float -> minor", lambda x: int(Decimal(repr(x)).quantize(Decimal("0.01")).scaleb(2)), floats),
+        ("to_minor(float)", to_minor, floats),
+    ]
+    for label, parse, inputs in parsers:
+        start = time.perf_counter()
+        for value in inputs:
+            parse(value)
+        ns[label] = (time.perf_counter() - start) * 1e9 / len(inputs)
+        print(f"parse, {label:24}: {ns[label]:6.1f} ns/op")
+    assert all(to_minor(text) == c for text, c in zip(texts, minor))
+    assert all(to_minor(x) == c for x, c in zip(floats, minor))
+    assert ns["to_minor(text)"] < ns["Decimal text -> minor"], "text parsing slower than Decimal"
+    assert ns["to_minor(float)"] < ns["Decimal float -> minor"], "float conversion slower than Decimal"
+
+    # property check: random deposits / withdrawals never drift
+    print(f"\n--- No-drift check over {n_checked:,} random operations ---")
+    start = time.perf_counter()
+    balance, reference, float_balance, drift_float = 0, Decimal(0), 0.0, Decimal(0)
+    chunk = 1_000_000
+    for offset in range(0, n_checked, chunk):
+        rng = np.random.default_rng([seed, offset])
+        cents = rng.integers(1, 1_000_000, chunk)
+        deltas = np.where(rng.random(chunk) < 0.5, cents, -cents)
+        signed = deltas.tolist()
+
+        # what the ledger computes live (`+=`) and on replay (int64 cumsum)
+        previous = balance
+        balance = accumulate(signed, balance)
+        events = np.zeros(chunk, dtype=EVENT_DTYPE)
+        events["kind"] = np.where(deltas > 0, DEPOSIT, WITHDRAW)
+        events["amount"] = np.abs(deltas)
+        assert int(_running_balance(previous, events)[-1]) == balance, "replay differs"
+
+        reference = accumulate((Decimal(d).scaleb(-2) for d in signed), reference)
+        float_balance = accumulate((d / 100 for d in signed), float_balance)
+        assert Money(balance).to_decimal() == reference, "minor units drifted"
+        drift_float = max(drift_float, abs(Decimal(float_balance) - reference))
+    print(f"int minor units vs Decimal   : identical after every {chunk:,} operations")
+    print(f"float, worst drift seen      : {drift_float:.2E}")
+    print(f"checked in                   : {time.perf_counter() - start:8.2f} s")
+
+
+# ------------------------------------------------
+# 4️⃣ Batch processor: streaming a transaction file
+# ------------------------------------------------
+
+def write_transactions(path, n_rows, n_accounts, chunk_rows=100_000, seed=4):
+    """A CSV of random deposits / withdrawals / transfers (plus a few bad rows)."""
+    rng = np.random.default_rng(seed)
+    names = np.array(["deposit", "withdraw", "transfer", "refund"])
+    for offset in range(0, n_rows, chunk_rows):
+        n = min(chunk_rows, n_rows - offset)
+        kinds = names[rng.choice(4, n, p=[0.4, 0.3, 0.2999, 0.0001])]
+        cents = rng.integers(1, 200_000, n)
+        frame = pd.DataFrame({
+            "type": kinds,
+            "account": rng.integers(0, n_accounts, n),
+            "amount": [f"{c // 100}.{c % 100:02d}" for c in cents.tolist()],
+            "to": np.where(kinds == "transfer", rng.integers(0, n_accounts, n).astype(str), ""),
+        })
+        frame.to_csv(path, mode="a" if offset else "w", header=not offset, index=False)
+
+
+def one_by_one(store, path):
+    """The same file applied with one store call (and lock) per row."""
+    calls = {"deposit": store.deposit, "withdraw": store.withdraw}
+    applied = 0
+    for frame in pd.read_csv(path, dtype=str, keep_default_na=False, chunksize=100_000):
+        for kind, account, amount, to in frame.itertuples(index=False):
+            if kind == "transfer":
+                applied += store.transfer(int(account), int(to), to_minor(amount))
+            elif kind in calls:
+                applied += calls[kind](int(account), to_minor(amount))
+    return applied
+
+
+def bench_batch(n_rows=5_000_000, n_accounts=1_000_000, opening=500_000, compare_rows=500_000):
+    print(f"\n--- Batch processor: {n_rows:,} rows over {n_accounts:,} accounts ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "transactions.csv")
+        start = time.perf_counter()
+        write_transactions(path, n_rows, n_accounts)
+        print(f"write test file              : {time.perf_counter() - start:8.2f} s "
+              f"({os.path.getsize(path) / 2**20:,.0f} MiB)")
+
+        store = AccountStore()
+        store.open_accounts(n_accounts, opening)
+        result = process_file(store, path, os.path.join(tmp, "rejected.csv"))
+        print(f"process_file                 : {result.seconds:8.2f} s -> "
+              f"{result.rows_per_sec:,.0f} rows/sec ({result.rejected:,} rejected)")
+        if resource is not None:
+            # ru_maxrss is in KiB on Linux; it does not grow with the file size
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+            print(f"peak memory of the process   : {peak:8.1f} MiB")
+        print(f"50M rows at this rate        : {50_000_000 / result.rows_per_sec / 60:8.1f} min")
+
+        # both ways on a smaller file must end with identical balances
+        small = os.path.join(tmp, "small.csv")
+        write_transactions(small, compare_rows, n_accounts // 10, seed=5)
+        batched, looped = AccountStore(), AccountStore()
+        batched.open_accounts(n_accounts // 10, opening)
+        looped.open_accounts(n_accounts // 10, opening)
+        batch = process_file(batched, small)
+        start = time.perf_counter()
+        applied = one_by_one(looped, small)
+        seconds = time.perf_counter() - start
+        print(f"{compare_rows:,} rows, batched      : {batch.rows_per_sec:10,.0f} rows/sec")
+        print(f"{compare_rows:,} rows, call per row : {compare_rows / seconds:10,.0f} rows/sec")
+        assert applied == batch.applied
+        assert np.array_equal(batched.balances(), looped.balances()), "batch differs from one-by-one"
+        print("same balances as one-by-one  : yes")
+
+
+# ------------------------------------------------
+# 5️⃣ Snapshot: restarting with millions of accounts
+# ------------------------------------------------
+
+def bench_snapshot(n_accounts=10_000_000, named=1_000):
+    print(f"\n--- Snapshot of {n_accounts:,} accounts ---")
+    rng = np.random.default_rng(6)
+    store = AccountStore()
+    store.open_accounts(n_accounts)
+    for i in range(named):
+        store.open_account(f"Customer {i}", 10_000)
+    for account in range(0, n_accounts, 1_000):
+        store.deposit(account, int(rng.integers(1, 10_000_000)))
+    expected = store.balances()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "accounts.snap")
+        start = time.perf_counter()
+        store.save_snapshot(path)
+        print(f"save snapshot                : {time.perf_counter() - start:8.2f} s "
+              f"({os.path.getsize(path) / 2**20:,.0f} MiB)")
+
+        # what restarting costs without it: parsing the table from text
+        csv_path = os.path.join(tmp, "accounts.csv")
+        pd.DataFrame({"balance": expected}).to_csv(csv_path, index_label="account")
+        start = time.perf_counter()
+        parsed = pd.read_csv(csv_path)["balance"].to_numpy()
+        print(f"restart from CSV             : {time.perf_counter() - start:8.2f} s")
+        assert np.array_equal(parsed, expected)
+
+        start = time.perf_counter()
+        restarted = AccountStore.load_snapshot(path)
+        balance = restarted.balance(n_accounts // 2)
+        print(f"restart from snapshot (mmap) : {(time.perf_counter() - start) * 1000:8.2f} ms "
+              f"to the first balance")
+        assert balance == expected[n_accounts // 2]
+        assert restarted.holder(n_accounts + 7) == "Customer 7"
+
+        start = time.perf_counter()
+        for account in rng.integers(0, len(restarted), 100_000).tolist():
+            restarted.balance(account)
+        print(f"random balance reads         : {(time.perf_counter() - start) * 10:8.2f} us each")
+
+        start = time.perf_counter()
+        assert restarted.total() == int(expected.sum())
+        print(f"total of all balances        : {(time.perf_counter() - start) * 1000:8.2f} ms "
+              f"(touches every page)")
+        assert restarted.transfer(0, 1, int(expected[0]))
+        del restarted
+        reloaded = AccountStore.load_snapshot(path)
+        assert np.array_equal(reloaded.balances(), expected), "copy-on-write mapping changed the file"
+        print("file unchanged until saved   : yes")
+
+        # what batch_processor.py does: save over the file the store is mapped from
+        # (os.replace fails on Windows while the old file is still mapped)
+        assert reloaded.transfer(0, 1, int(expected[0]))
+        start = time.perf_counter()
+        reloaded.save_snapshot(path)
+        print(f"save over loaded snapshot    : {time.perf_counter() - start:8.2f} s")
+        assert not isinstance(reloaded._balances, np.memmap), "still mapped after saving"
+        saved = AccountStore.load_snapshot(path)
+        assert np.array_equal(saved.balances(), reloaded.balances())
+        assert saved.holder(n_accounts + 7) == "Customer 7"
+        assert reloaded.deposit(2, 100) and saved.balance(2) == expected[2]
+        print("mapping released before save : yes")
+
+
+if __name__ == "__main__":
+    bench_ledger()
+    bench_transfers()
+    bench_money()
+    bench_batch()
+    bench_snapshot()
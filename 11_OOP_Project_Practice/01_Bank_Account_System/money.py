@@ -0,0 +1,123 @@
+# ================================================
+# File: money.py
+# Topic: Exact money amounts stored as integer minor units
+# ================================================
+
+"""
+Money is counted in whole minor units (cents / paisa), never in floats.
+
+`0.1 + 0.2` is not `0.3` in binary floating point, and those tiny errors add
+up over millions of deposits and withdrawals. An integer number of cents
+adds up exactly, and plain `int` addition is also faster than `decimal.Decimal`.
+
+- Hot paths (the ledger, the account store, `BankAccount`) keep plain `int`
+  minor units.
+- `to_minor(...)` converts what users type (`"12.34"`, `12`, `12.34`,
+  `Decimal`) into minor units. Common text, ints and floats never touch
+  `Decimal`. Text and `Decimal` amounts with more than two decimals are
+  rejected instead of silently rounded; `True` / `False` are not amounts.
+- `Money` is an `int` (the number of minor units) that prints as an amount:
+  `Money(123456)` shows as `1234.56`. It is a display type for values handed
+  out at the edges and adds no operators: `Money + int` is ordinary int
+  arithmetic on minor units and returns a plain `int`.
+"""
+
+import math
+from decimal import Decimal, InvalidOperation
+from typing import Union
+
+# ------------------------------------------------
+# 1️⃣ Minor units
+# ------------------------------------------------
+
+DECIMALS = 2
+MINOR_PER_MAJOR = 10 ** DECIMALS
+_QUANTUM = Decimal(1).scaleb(-DECIMALS)        # Decimal("0.01")
+# minor units per unit of the last digit typed, by the number of decimals typed
+_SCALE = tuple(10 ** (DECIMALS - n) for n in range(DECIMALS + 1))
+# floats above this (in minor units) no longer hold a whole cent exactly
+_MAX_FLOAT_MINOR = 2.0 ** 52
+# format types that apply to the cent count as an integer, e.g. f"{m:d}"
+_INT_FORMAT_TYPES = "bcdoxXn"
+
+
+def to_minor(amount: Union[str, int, float, Decimal]) -> int:
+    """Whole minor units for an amount in major units (rupees, dollars).
+
+    A `Money` value is already in minor units and is returned unchanged.
+    Raises ValueError for anything that is not an exact amount of money.
+    """
+    kind = type(amount)
+    if kind is str:
+        # plain amounts such as "1234", "-12.5" or "0.07": one int() call
+        major, _, minor = amount.partition(".")
+        if len(minor) <= DECIMALS and (minor.isdecimal() or not minor):
+            try:
+                return int(major + minor) * _SCALE[len(minor)]
+            except ValueError:
+                pass                     # e.g. "1e3" or "": let Decimal decide
+    elif kind is int:
+        return amount * MINOR_PER_MAJOR
+    elif kind is float:
+        if not math.isfinite(amount):
+            raise ValueError(f"not an amount of money: {amount!r}")
+        # a float is already inexact, take the nearest minor unit; only values
+        # within a hair of half a cent need Decimal to round their repr
+        scaled = amount * MINOR_PER_MAJOR
+        whole = round(scaled)
+        if abs(scaled - whole) < 0.49 and abs(scaled) < _MAX_FLOAT_MINOR:
+            return whole
+    elif isinstance(amount, Money):
+        return int(amount)
+    elif isinstance(amount, bool):
+        raise ValueError(f"not an amount of money: {amount!r}")
+
+    try:
+        if kind is float:
+            value = Decimal(repr(amount)).quantize(_QUANTUM)
+        else:
+            value = Decimal(amount.strip() if kind is str else amount)
+            if not value.is_finite():
+                raise ValueError(f"not an amount of money: {amount!r}")
+            if value != value.quantize(_QUANTUM):
+                raise ValueError(f"{amount!r} has more than {DECIMALS} decimal places")
+    except (InvalidOperation, TypeError):
+        # unparsable text, or too many digits for Decimal to quantize
+        raise ValueError(f"not an amount of money: {amount!r}") from None
+    return int(value.scaleb(DECIMALS))
+
+
+# ------------------------------------------------
+# 2️⃣ Money type
+# ------------------------------------------------
+
+class Money(int):
+    """An amount of money as a whole number of minor units (display only)."""
+
+    __slots__ = ()
+
+    @classmethod
+    def of(cls, amount: Union[str, int, float, Decimal]) -> "Money":
+        """Convert an amount in major units to `Money` (see `to_minor`)."""
+        return cls(to_minor(amount))
+
+    def to_decimal(self) -> Decimal:
+        return Decimal(int(self)).scaleb(-DECIMALS)
+
+    # ---------------- display ----------------
+
+    def __str__(self) -> str:
+        sign = "-" if self < 0 else ""
+        major, minor = divmod(abs(int(self)), MINOR_PER_MAJOR)
+        return f"{sign}{major}.{minor:0{DECIMALS}d}"
+
+    def __repr__(self) -> str:
+        return f"Money.of('{self}')"
+
+    def __format__(self, spec: str) -> str:
+        if not spec:
+            return str(self)
+        if spec[-1] in _INT_FORMAT_TYPES:
+            return int.__format__(self, spec)
+        # ",.2f", ">12" and the like apply to the amount, not the cent count
+        return format(self.to_decimal(), spec)
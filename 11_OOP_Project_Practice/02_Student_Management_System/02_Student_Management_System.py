@@ -1,7 +1,8 @@
 import streamlit as st
-import pandas as pd
 from datetime import date
-import os
+
+from student_management import DEPARTMENTS, Student, StudentManagementSystem, read_student_records
+from student_view import SORT_COLUMNS, RosterView
 
 # ---------------------------
 #  Page Configuration
@@ -12,85 +13,6 @@ st.set_page_config(
     layout="wide"
 )
 
-DATA_FILE = "students_data.csv"
-
-# ---------------------------
-#  Student Class
-# ---------------------------
-class Student:
-    def __init__(self, roll_no, name, department, dob, email):
-        self.roll_no = roll_no
-        self.name = name
-        self.department = department
-        self.dob = dob
-        self.email = email
-
-    def get_info(self):
-        return {
-            "Roll No": self.roll_no,
-            "Name": self.name,
-            "Department": self.department,
-            "Date of Birth": str(self.dob),
-            "Email": self.email
-        }
-
-# ---------------------------
-#  Student Management System
-# ---------------------------
-class StudentManagementSystem:
-    def __init__(self, data_file=DATA_FILE):
-        self.data_file = data_file
-        self.students = {}
-        self.load_data()
-
-    def load_data(self):
-        if os.path.exists(self.data_file):
-            df = pd.read_csv(self.data_file)
-            for _, row in df.iterrows():
-                student = Student(
-                    row["Roll No"],
-                    row["Name"],
-                    row["Department"],
-                    row["Date of Birth"],
-                    row["Email"]
-                )
-                self.students[student.roll_no] = student
-
-    def save_data(self):
-        data = [s.get_info() for s in self.students.values()]
-        pd.DataFrame(data).to_csv(self.data_file, index=False)
-
-    def add_student(self, student: Student):
-        if student.roll_no in self.students:
-            return False
-        self.students[student.roll_no] = student
-        self.save_data()
-        return True
-
-    def view_students(self):
-        return [s.get_info() for s in self.students.values()]
-
-    def get_student(self, roll_no):
-        return self.students.get(roll_no)
-
-    def delete_student(self, roll_no):
-        if roll_no in self.students:
-            del self.students[roll_no]
-            self.save_data()
-            return True
-        return False
-
-    def update_student(self, roll_no, **kwargs):
-        student = self.students.get(roll_no)
-        if not student:
-            return False
-        for key, value in kwargs.items():
-            if hasattr(student, key):
-                setattr(student, key, value)
-        self.save_data()
-        return True
-
-
 # ---------------------------
 #  Initialize Session
 # ---------------------------
@@ -99,6 +21,12 @@ if "system" not in st.session_state:
 
 system = st.session_state.system
 
+# rebuilt only when the roster changes, not on every rerun
+if "roster_view" not in st.session_state:
+    st.session_state.roster_view = RosterView(system)
+
+roster_view = st.session_state.roster_view
+
 # ---------------------------
 #  Sidebar Developer Info
 # ---------------------------
@@ -138,10 +66,7 @@ if menu == "Add Student":
     with st.form("add_student_form"):
         roll_no = st.text_input("Roll Number")
         name = st.text_input("Full Name")
-        department = st.selectbox(
-            "Department",
-            ["Software Engineering", "Computer Science", "Information Technology", "Artificial Intelligence", "Data Science"]
-        )
+        department = st.selectbox("Department", DEPARTMENTS)
         dob = st.date_input("Date of Birth", date(2000, 1, 1))
         email = st.text_input("Email Address")
 
@@ -152,21 +77,60 @@ if menu == "Add Student":
                 st.warning("⚠️ Please fill in all required fields.")
             else:
                 student = Student(roll_no, name, department, dob, email)
-                if system.add_student(student):
-                    st.success(f"✅ Student **{name}** added successfully!")
-                else:
+                if system.get_student(roll_no):
                     st.error(f"🚫 Roll No **{roll_no}** already exists!")
+                elif system.find_by_email(email):
+                    st.error(f"🚫 Email **{email}** is already registered!")
+                elif system.add_student(student):
+                    st.success(f"✅ Student **{name}** added successfully!")
+
+    with st.expander("📥 Bulk import (CSV / JSONL)"):
+        st.caption("Columns / keys: Roll No, Name, Department, Date of Birth (YYYY-MM-DD), Email")
+        uploaded = st.file_uploader("Student intake file", type=["csv", "jsonl"])
+        existing = st.radio("Existing roll numbers", ["skip", "update"], horizontal=True)
+        if uploaded is not None and st.button("Import Students"):
+            result = system.add_students_bulk(read_student_records(uploaded), on_conflict=existing)
+            st.success(f"✅ Added {result.added:,}, updated {result.updated:,}, "
+                       f"skipped {result.skipped:,} ({result.rows_per_sec:,.0f} rows/sec)")
+            if result.errors:
+                st.error(f"🚫 {len(result.errors):,} row(s) rejected")
+                st.dataframe(
+                    [{"Record": number, "Problem": message} for number, message in result.errors[:1000]],
+                    use_container_width=True, hide_index=True
+                )
 
 # ---------------------------
 #  View Students
 # ---------------------------
 elif menu == "View Students":
     st.header("📖 View All Students")
-    students = system.view_students()
 
-    if students:
-        df = pd.DataFrame(students)
-        st.dataframe(df, use_container_width=True)
+    if len(system.students):
+        col1, col2, col3 = st.columns([2, 2, 1])
+        with col1:
+            counts = system.department_counts()
+            department = st.selectbox(
+                "Department", [None] + sorted(counts),
+                format_func=lambda d: "All" if d is None else f"{d} ({counts[d]:,})"
+            )
+        with col2:
+            sort_by = st.selectbox(
+                "Sort by", [None] + SORT_COLUMNS,
+                format_func=lambda c: "Date added" if c is None else c
+            )
+            descending = st.checkbox("Descending")
+        with col3:
+            page_size = st.selectbox("Rows per page", [25, 50, 100, 500], index=1)
+
+        matching = counts.get(department, 0) if department else len(system.students)
+        pages = max(1, -(-matching // page_size))
+        page = st.number_input(f"Page (of {pages:,})", min_value=1, max_value=pages, step=1, value=1)
+
+        # only this page is copied out of the cached roster table
+        df, matching = roster_view.page(department, sort_by, descending, page, page_size)
+        first = (page - 1) * page_size + 1
+        st.caption(f"Showing {first:,}–{first + len(df) - 1:,} of {matching:,} students")
+        st.dataframe(df, use_container_width=True, hide_index=True)
     else:
         st.info("No student records found. Please add some students first.")
 
@@ -193,14 +157,16 @@ elif menu == "Update Student":
                 update_btn = st.form_submit_button("Update")
 
                 if update_btn:
-                    system.update_student(
+                    if system.update_student(
                         roll_no,
                         name=new_name,
                         department=new_department,
                         dob=new_dob,
                         email=new_email
-                    )
-                    st.success("✅ Student information updated successfully!")
+                    ):
+                        st.success("✅ Student information updated successfully!")
+                    else:
+                        st.error(f"🚫 Email **{new_email}** belongs to another student!")
         else:
             st.error("❌ No student found with this Roll No.")
 
@@ -0,0 +1,384 @@
+# ================================================
+# File: benchmark_students.py
+# Topic: Performance checks for the Student Management System
+# ================================================
+
+"""
+Small, self-contained benchmarks for `student_management.py`.
+
+Every benchmark works in a temporary directory, so running this file never
+touches `students_data.csv`.
+
+Run:
+    python benchmark_students.py
+"""
+
+import os
+import random
+import shutil
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+import pandas as pd
+
+from student_management import DEPARTMENTS, CsvStorage, Student, StudentManagementSystem
+
+
+# ------------------------------------------------
+# Helpers
+# ------------------------------------------------
+
+def make_students(n, seed=42, start=0):
+    rng = random.Random(seed)
+    first = date(1995, 1, 1)
+    return [
+        Student(f"R{i:07d}", f"Student {i}", rng.choice(DEPARTMENTS),
+                first + timedelta(days=rng.randint(0, 3650)), f"student{i}@uni.edu")
+        for i in range(start, start + n)
+    ]
+
+
+# ------------------------------------------------
+# 1️⃣ Sequential adds: full CSV rewrite vs. journal
+# ------------------------------------------------
+
+class RewriteCsvStorage(CsvStorage):
+    """The original behavior: every change rewrites the whole CSV."""
+
+    def _append(self, records):
+        pass
+
+    def needs_snapshot(self):
+        return True
+
+
+def bench_journal(n_students=10_000):
+    print(f"\n--- {n_students:,} sequential add_student calls ---")
+    students = make_students(n_students)
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, storage in [("rewrite CSV", RewriteCsvStorage), ("journal", CsvStorage)]:
+            path = os.path.join(tmp, f"{storage.__name__}.csv")
+            system = StudentManagementSystem(path, storage=storage(path))
+            start = time.perf_counter()
+            for student in students:
+                system.add_student(student)
+            elapsed = time.perf_counter() - start
+            print(f"{label:12}: {elapsed:8.2f} s   {n_students / elapsed:>10,.0f} adds/sec")
+
+        # reopening replays the journal on top of the last snapshot
+        system.update_student(students[0].roll_no, name="Renamed")
+        system.delete_student(students[1].roll_no)
+        start = time.perf_counter()
+        reopened = StudentManagementSystem(path)
+        print(f"reload      : {(time.perf_counter() - start) * 1000:8.1f} ms "
+              f"({reopened.storage.journal_records:,} journal records replayed)")
+        assert reopened.view_students() == system.view_students()
+
+        # a torn last line (crash mid-append) is dropped on replay
+        with open(reopened.storage.journal_file, "a") as f:
+            f.write('{"op": "delete", "roll_no": "R00')
+        assert StudentManagementSystem(path).view_students() == system.view_students()
+        print("check       : reload matches memory, torn journal line ignored")
+
+
+# ------------------------------------------------
+# 2️⃣ Startup: iterrows vs. column loader vs. lazy
+# ------------------------------------------------
+
+class IterrowsLoader(StudentManagementSystem):
+    """The original loader: one pandas row object and one Student per CSV row."""
+
+    def load_data(self):
+        self.students = {}
+        df = pd.read_csv(self.data_file)
+        for _, row in df.iterrows():
+            student = Student(row["Roll No"], row["Name"], row["Department"],
+                              row["Date of Birth"], row["Email"])
+            self.students[student.roll_no] = student
+
+
+def write_roster(path, n):
+    pd.DataFrame([s.get_info() for s in make_students(n)]).to_csv(path, index=False)
+
+
+def bench_load(n_students=1_000_000):
+    print(f"\n--- Loading a {n_students:,}-student CSV ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "students.csv")
+        write_roster(path, n_students)
+
+        for label, cls, options in [("iterrows", IterrowsLoader, {}),
+                                    ("columns", StudentManagementSystem, {}),
+                                    ("lazy", StudentManagementSystem, {"lazy": True})]:
+            start = time.perf_counter()
+            system = cls(path, **options)
+            elapsed = time.perf_counter() - start
+            print(f"{label:9}: {elapsed:7.2f} s   {n_students / elapsed:>10,.0f} rows/sec")
+
+        roll_no = f"R{n_students // 2:07d}"
+        start = time.perf_counter()
+        student = system.get_student(roll_no)
+        lookup_us = (time.perf_counter() - start) * 1e6
+        assert student.get_info() == StudentManagementSystem(path).get_student(roll_no).get_info()
+        print(f"lazy lookup of one student: {lookup_us:.1f} us")
+
+
+# ------------------------------------------------
+# 3️⃣ Lookups: linear scan vs. secondary indexes
+# ------------------------------------------------
+
+def timed_ms(fn, repeat=20):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) * 1000 / repeat, result
+
+
+def bench_indexes(n_students=500_000):
+    print(f"\n--- Lookups on {n_students:,} students ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "students.csv")
+        write_roster(path, n_students)
+        system = StudentManagementSystem(path)
+
+        start = time.perf_counter()
+        system.index
+        print(f"index build (once)   : {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+        email = f"student{n_students // 3}@uni.edu"
+        department = DEPARTMENTS[2]
+        prefix = f"Student {n_students // 7}"
+        queries = [
+            ("find_by_email",
+             lambda: next((s for s in system.students.values() if s.email.lower() == email), None),
+             lambda: system.find_by_email(email)),
+            ("by_department",
+             lambda: [s for s in system.students.values() if s.department == department],
+             lambda: system.by_department(department)),
+            ("by_department [:50]",
+             lambda: [s for s in system.students.values() if s.department == department][:50],
+             lambda: system.by_department(department, limit=50)),
+            ("department count",
+             lambda: sum(s.department == department for s in system.students.values()),
+             lambda: system.department_counts()[department]),
+            ("search_name_prefix",
+             lambda: sorted((s for s in system.students.values()
+                             if s.name.lower().startswith(prefix.lower())),
+                            key=lambda s: s.name.lower())[:50],
+             lambda: system.search_name_prefix(prefix)),
+        ]
+        for label, scan, indexed in queries:
+            scan_ms, expected = timed_ms(scan, repeat=3)
+            index_ms, got = timed_ms(indexed)
+            if isinstance(expected, list):
+                assert {s.roll_no for s in expected} == {s.roll_no for s in got}
+            else:
+                assert expected is got or expected == got
+            print(f"{label:20} : scan {scan_ms:8.2f} ms   index {index_ms:8.4f} ms")
+
+        n_updates = 1_000
+        start = time.perf_counter()
+        for i in range(n_updates):
+            system.update_student(f"R{i:07d}", name=f"Renamed {i}", email=f"renamed{i}@uni.edu")
+        update_us = (time.perf_counter() - start) * 1e6 / n_updates
+        print(f"update_student       : {update_us:8.1f} us each (indexes + journal)")
+        assert system.find_by_email("RENAMED7@uni.edu").name == "Renamed 7"
+
+
+# ------------------------------------------------
+# 4️⃣ Memory: objects with __dict__ vs. __slots__ vs. StudentTable
+# ------------------------------------------------
+
+class DictStudent:
+    """The original Student: every instance carries its own __dict__."""
+
+    def __init__(self, roll_no, name, department, dob, email):
+        self.roll_no = roll_no
+        self.name = name
+        self.department = department
+        self.dob = dob
+        self.email = email
+
+
+class DictStudentSystem(StudentManagementSystem):
+    def load_data(self):
+        columns = self.storage.load()
+        self.students = dict(zip(columns[0], map(DictStudent, *columns)))
+
+
+def traced_mb(build):
+    """Memory still held by the object `build()` returns, in MB."""
+    tracemalloc.start()
+    result = build()
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, held / 2 ** 20, peak / 2 ** 20
+
+
+def bench_memory(n_students=1_000_000):
+    print(f"\n--- Memory held by a {n_students:,}-student roster (tracemalloc) ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "students.csv")
+        write_roster(path, n_students)
+
+        for label, build in [("Student with __dict__", lambda: DictStudentSystem(path)),
+                             ("Student with __slots__", lambda: StudentManagementSystem(path)),
+                             ("StudentTable", lambda: StudentManagementSystem(path, lazy=True))]:
+            system, held, peak = traced_mb(build)
+            print(f"{label:22}: {held:8.1f} MB held   {held * 2 ** 20 / n_students:6.0f} B/student   "
+                  f"(peak while loading {peak:8.1f} MB)")
+            del system
+
+
+# ------------------------------------------------
+# 5️⃣ Storage backends: CSV (rewrite / journal) vs. SQLite
+# ------------------------------------------------
+
+def time_ops(fn, items):
+    start = time.perf_counter()
+    for item in items:
+        fn(item)
+    return (time.perf_counter() - start) * 1e6 / max(len(items), 1)
+
+
+def bench_storage(n_students=100_000, n_ops=2_000, rewrite_ops=20):
+    print(f"\n--- Storage backends with {n_students:,} students (us per operation) ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        seed_csv = os.path.join(tmp, "seed.csv")
+        write_roster(seed_csv, n_students)
+
+        db_path = os.path.join(tmp, "students.db")
+        start = time.perf_counter()
+        importer = StudentManagementSystem(db_path)
+        importer.import_csv(seed_csv)
+        importer.close()
+        print(f"import CSV -> SQLite: {time.perf_counter() - start:.2f} s")
+
+        backends = [("CSV rewrite", "rewrite.csv", RewriteCsvStorage, rewrite_ops),
+                    ("CSV journal", "journal.csv", CsvStorage, n_ops),
+                    ("SQLite", "students.db", None, n_ops)]
+        print(f"{'':12} {'load (ms)':>10} {'add':>9} {'update':>9} {'delete':>9} {'last page':>10}")
+        for label, name, storage, ops in backends:
+            path = os.path.join(tmp, name)
+            if storage is not None:
+                shutil.copy(seed_csv, path)
+
+            def open_system():
+                return StudentManagementSystem(path, storage=storage and storage(path))
+
+            start = time.perf_counter()
+            system = open_system()
+            load_ms = (time.perf_counter() - start) * 1000
+            assert len(system.students) == n_students
+            system.index  # built once on first use; not part of the per-op cost
+
+            new = make_students(ops, seed=7, start=n_students)
+            existing = [f"R{i:07d}" for i in range(0, n_students, n_students // ops)][:ops]
+            add_us = time_ops(system.add_student, new)
+            update_us = time_ops(lambda r: system.update_student(r, name=f"Updated {r}"), existing)
+            delete_us = time_ops(system.delete_student, existing)
+            # the last 50 students, continuing from the page before (keyset)
+            after = system.view_students(offset=len(system.students) - 51, limit=1)[0]["Roll No"]
+            page_us = time_ops(lambda _: system.view_students(limit=50, after=after), range(20))
+            print(f"{label:12} {load_ms:10.1f} {add_us:9.1f} {update_us:9.1f} {delete_us:9.1f} "
+                  f"{page_us:10.1f}")
+
+            expected = system.view_students()
+            system.close()
+            reopened = open_system()
+            assert reopened.view_students() == expected, label
+            reopened.close()
+
+
+# ------------------------------------------------
+# 6️⃣ View Students: DataFrame per rerun vs. cached RosterView
+# ------------------------------------------------
+
+def bench_view(n_students=500_000, page_size=50, reruns=20):
+    from student_view import RosterView
+
+    print(f"\n--- View Students page on {n_students:,} students ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "students.csv")
+        write_roster(path, n_students)
+        system = StudentManagementSystem(path)
+        view = RosterView(system)
+
+        start = time.perf_counter()
+        pd.DataFrame(system.view_students())
+        print(f"old page (all rows, every rerun) : {(time.perf_counter() - start) * 1000:9.1f} ms")
+
+        for label, options in [("first render", {}),
+                               ("next page", {"page": 2}),
+                               ("department filter", {"department": DEPARTMENTS[1]}),
+                               ("sorted by name", {"sort_by": "Name", "descending": True}),
+                               ("same view again", {"sort_by": "Name", "descending": True})]:
+            start = time.perf_counter()
+            page, matching = view.page(page_size=page_size, **options)
+            print(f"{label:33}: {(time.perf_counter() - start) * 1000:9.3f} ms   "
+                  f"({len(page)} of {matching:,} rows)")
+
+        start = time.perf_counter()
+        for _ in range(reruns):
+            view.page(DEPARTMENTS[1], page=100, page_size=page_size)
+        print(f"{'cached rerun (any page)':33}: {(time.perf_counter() - start) * 1000 / reruns:9.3f} ms")
+
+        system.update_student("R0000003", name="Aaron Changed")
+        start = time.perf_counter()
+        page, _ = view.page(sort_by="Name", page_size=page_size)
+        print(f"{'first render after a change':33}: {(time.perf_counter() - start) * 1000:9.1f} ms")
+        assert page["Name"].iloc[0] == "Aaron Changed"
+
+
+# ------------------------------------------------
+# 7️⃣ Bulk intake: add_student loop vs. add_students_bulk
+# ------------------------------------------------
+
+def bench_bulk(n_existing=100_000, n_intake=50_000, bad_ratio=0.01):
+    print(f"\n--- Intake of {n_intake:,} students into a roster of {n_existing:,} ---")
+    intake = [s.get_info() for s in make_students(n_intake, seed=9, start=n_existing)]
+    rng = random.Random(5)
+    for record in rng.sample(intake, int(n_intake * bad_ratio)):
+        record["Email"] = record["Email"].replace("@", " at ")
+    intake.append(dict(intake[0]))  # repeated roll number inside the batch
+
+    with tempfile.TemporaryDirectory() as tmp:
+        seed_csv = os.path.join(tmp, "seed.csv")
+        write_roster(seed_csv, n_existing)
+        for label, suffix in [("CSV journal", ".csv"), ("SQLite", ".db")]:
+            systems = []
+            for run in ("loop", "bulk"):
+                system = StudentManagementSystem(os.path.join(tmp, run + suffix))
+                system.import_csv(seed_csv)
+                system.index
+                systems.append(system)
+            loop_system, bulk_system = systems
+
+            start = time.perf_counter()
+            for record in intake:
+                loop_system.add_student(Student(*record.values()))
+            loop_rate = len(intake) / (time.perf_counter() - start)
+
+            result = bulk_system.add_students_bulk(intake)
+            again = bulk_system.add_students_bulk(intake, on_conflict="update")
+            assert result.added == again.updated == n_intake - len(result.errors) + 1
+            print(f"{label:12}: add_student loop {loop_rate:>9,.0f} rows/sec   "
+                  f"bulk add {result.rows_per_sec:>9,.0f} rows/sec   "
+                  f"bulk upsert {again.rows_per_sec:>9,.0f} rows/sec   "
+                  f"({len(result.errors):,} rejected)")
+            assert len(StudentManagementSystem(bulk_system.data_file).students) == n_existing + result.added
+            for system in systems:
+                system.close()
+    print(f"first errors: {result.errors[:2]}")
+
+
+if __name__ == "__main__":
+    bench_journal()
+    bench_load()
+    bench_indexes()
+    bench_memory()
+    bench_storage()
+    bench_view()
+    bench_bulk()
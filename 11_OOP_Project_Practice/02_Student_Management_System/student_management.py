@@ -0,0 +1,1014 @@
+# ================================================
+# File: student_management.py
+# Topic: Student records and their persistence
+# ================================================
+
+"""
+`Student` and `StudentManagementSystem`, kept out of the Streamlit app so they
+can be imported (and benchmarked) without starting a UI.
+
+Where the roster is stored is pluggable (`StudentStorage`). By file name:
+
+- `students.db` (or `.sqlite` / `.sqlite3`) uses `SqliteStorage`: one row per
+  student, so every change is a single indexed upsert or delete. The roster is
+  not loaded into memory at all: `students` is a `SqliteRoster` that looks
+  students up by primary key, and `view_students` pages with LIMIT in SQL.
+  `import_csv` moves an existing `students_data.csv` into it, also from the
+  command line: `python student_management.py students_data.csv students.db`.
+- any other name uses `CsvStorage`, described below.
+
+CSV persistence is a snapshot plus an append-only journal:
+
+- `students_data.csv` is the snapshot: the whole roster, as before.
+- `students_data.csv.journal` receives one JSON line per add / update / delete.
+  A change costs one small append instead of rewriting the whole CSV.
+- When the journal holds as many records as the last snapshot has students (and
+  at least `compact_every`), it is compacted: a new snapshot is written to a
+  temporary file, atomically renamed over the old one, and the journal is
+  emptied. Appends therefore stay O(1) amortized.
+
+`load_data` reads the snapshot, then replays the journal. Every journal record
+*sets* a value (add = put, update = assign fields, delete = remove), so
+replaying records that are already part of the snapshot is harmless; a crash
+between the rename and the journal truncation loses nothing. A half-written
+last line (crash in the middle of an append) is dropped.
+
+The snapshot is read column by column (no per-row pandas objects). `Student`
+uses `__slots__`, so it carries no per-instance `__dict__`. With `lazy=True` the
+roster is kept in a `StudentTable` instead (one compact array per field), and
+a `Student` is only built when a student is looked up; startup is faster and
+large rosters need far less memory.
+
+Besides the roll number, students can be looked up by department, by email
+(unique, case-insensitive) and by name prefix through a `StudentIndex`. It is
+built on first use and then kept current by every add / update / delete. With
+SQLite that first use (e.g. the email check in `add_student`) is one streamed
+scan of the table; opening the roster and paging through it never is.
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import re
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_left, insort
+from collections.abc import Mapping, MutableMapping
+from itertools import accumulate, dropwhile, islice
+from datetime import date
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import pandas as pd
+
+DATA_FILE = "students_data.csv"
+
+COLUMNS = ["Roll No", "Name", "Department", "Date of Birth", "Email"]
+
+# the departments a student can be added to (the Add Student form's choices)
+DEPARTMENTS = ["Software Engineering", "Computer Science", "Information Technology",
+               "Artificial Intelligence", "Data Science"]
+
+# ON CONFLICT keeps the rowid, so a student keeps their place in the listing
+UPSERT_STUDENT = """
+    INSERT INTO students(roll_no, name, department, dob, email) VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(roll_no) DO UPDATE SET
+        name=excluded.name, department=excluded.department,
+        dob=excluded.dob, email=excluded.email
+"""
+
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+
+
+# ------------------------------------------------
+# 1️⃣ Student Class
+# ------------------------------------------------
+
+class Student:
+    __slots__ = ("roll_no", "name", "department", "dob", "email")
+
+    def __init__(self, roll_no, name, department, dob, email):
+        self.roll_no = roll_no
+        self.name = name
+        self.department = department
+        self.dob = dob
+        self.email = email
+
+    def get_info(self):
+        return {
+            "Roll No": self.roll_no,
+            "Name": self.name,
+            "Department": self.department,
+            "Date of Birth": str(self.dob),
+            "Email": self.email
+        }
+
+
+# ------------------------------------------------
+# 2️⃣ Columnar roster
+# ------------------------------------------------
+
+def _dob_ordinal(dob) -> int:
+    """Date of birth as a day number, or 0 if it is not an ISO date."""
+    if isinstance(dob, date):
+        return dob.toordinal()
+    try:
+        return date.fromisoformat(str(dob)).toordinal()
+    except ValueError:
+        return 0
+
+
+class TextColumn:
+    """
+    Many short strings stored back to back in one UTF-8 buffer, plus the
+    start and length of each one: ~50 bytes less per value than `str` objects.
+
+    Replacing a value appends the new text; the old bytes are reclaimed when
+    more than half of the buffer is unused.
+    """
+
+    def __init__(self, values: Iterable = ()):
+        encoded = [str(v).encode() for v in values]
+        self._data = bytearray(b"".join(encoded))
+        lengths = array("I", map(len, encoded))
+        self._lengths = lengths
+        self._starts = array("Q", accumulate(lengths, initial=0))
+        self._starts.pop()
+        self._unused = 0
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def __getitem__(self, row: int) -> str:
+        start = self._starts[row]
+        return self._data[start:start + self._lengths[row]].decode()
+
+    def __setitem__(self, row: int, value) -> None:
+        encoded = str(value).encode()
+        self._unused += self._lengths[row]
+        self._starts[row] = len(self._data)
+        self._lengths[row] = len(encoded)
+        self._data += encoded
+        if self._unused > len(self._data) // 2:
+            self._compact()
+
+    def append(self, value) -> None:
+        self._starts.append(len(self._data))
+        self._lengths.append(0)
+        self[len(self._starts) - 1] = value
+
+    def clear(self, row: int) -> None:
+        self._unused += self._lengths[row]
+        self._lengths[row] = 0
+
+    def _compact(self) -> None:
+        data = bytearray()
+        for row, (start, length) in enumerate(zip(self._starts, self._lengths)):
+            self._starts[row] = len(data)
+            data += self._data[start:start + length]
+        self._data = data
+        self._unused = 0
+
+
+class StudentTable(MutableMapping):
+    """
+    roll_no -> Student, stored as one array per field instead of one object
+    per student (a "struct of arrays").
+
+    - names and emails live in `TextColumn`s instead of separate `str` objects
+    - departments are stored once and referenced by a 2-byte code
+    - dates of birth are packed 4-byte day numbers (`date.toordinal()`)
+    - rows of deleted students are reused by the next insert
+
+    A `Student` is created on every lookup, so changing one does not change
+    the table; `StudentManagementSystem` writes the student back with
+    `table[roll_no] = student` after updating it.
+    """
+
+    def __init__(self, columns: Optional[List[list]] = None):
+        roll_nos, names, departments, dobs, emails = columns or [[] for _ in COLUMNS]
+        self._names = TextColumn(names)
+        self._emails = TextColumn(emails)
+        self._department_names: List[str] = []
+        self._department_codes: Dict[str, int] = {}
+        self._departments = array("H", map(self._department_code, departments))
+        # most students share a birthday with someone, so parse each date once
+        ordinals: Dict[str, int] = {}
+        self._dobs = array("i", (
+            ordinals[d] if d in ordinals else ordinals.setdefault(d, _dob_ordinal(d))
+            for d in dobs
+        ))
+        # the rare dob that is not an ISO date is kept verbatim, by row
+        self._raw_dobs: Dict[int, str] = {
+            row: str(dob) for row, dob in enumerate(dobs) if self._dobs[row] == 0
+        }
+        self._rows: Dict[str, int] = dict(zip(roll_nos, range(len(self._names))))
+        self._free: List[int] = []
+
+    def _department_code(self, department) -> int:
+        code = self._department_codes.get(department)
+        if code is None:
+            code = self._department_codes[department] = len(self._department_names)
+            self._department_names.append(department)
+        return code
+
+    def _dob(self, row: int):
+        ordinal = self._dobs[row]
+        return date.fromordinal(ordinal) if ordinal else self._raw_dobs[row]
+
+    def __getitem__(self, roll_no) -> Student:
+        row = self._rows[roll_no]
+        return Student(roll_no, self._names[row], self._department_names[self._departments[row]],
+                       self._dob(row), self._emails[row])
+
+    def __setitem__(self, roll_no, student: Student) -> None:
+        row = self._rows.get(roll_no)
+        if row is None:
+            if self._free:
+                row = self._free.pop()
+            else:
+                row = len(self._names)
+                self._names.append("")
+                self._emails.append("")
+                self._departments.append(0)
+                self._dobs.append(0)
+            self._rows[roll_no] = row
+        self._names[row] = student.name
+        self._emails[row] = student.email
+        self._departments[row] = self._department_code(student.department)
+        self._dobs[row] = ordinal = _dob_ordinal(student.dob)
+        if ordinal:
+            self._raw_dobs.pop(row, None)
+        else:
+            self._raw_dobs[row] = str(student.dob)
+
+    def __delitem__(self, roll_no) -> None:
+        row = self._rows.pop(roll_no)
+        # drop the references so the strings can be freed
+        self._names.clear(row)
+        self._emails.clear(row)
+        self._raw_dobs.pop(row, None)
+        self._free.append(row)
+
+    def __contains__(self, roll_no) -> bool:
+        return roll_no in self._rows
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._rows)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def rows(self) -> Iterator[tuple]:
+        """Every student as a `COLUMNS`-ordered tuple, without building `Student`s."""
+        names, emails, departments = self._names, self._emails, self._departments
+        department_names, dobs = self._department_names, self._dobs
+        dob_text: Dict[int, str] = {}
+        for roll_no, row in self._rows.items():
+            ordinal = dobs[row]
+            if not ordinal:
+                dob = self._raw_dobs[row]
+            elif ordinal in dob_text:
+                dob = dob_text[ordinal]
+            else:
+                dob = dob_text[ordinal] = date.fromordinal(ordinal).isoformat()
+            yield roll_no, names[row], department_names[departments[row]], dob, emails[row]
+
+
+def _as_row(student: Student) -> tuple:
+    return (student.roll_no, student.name, student.department, str(student.dob), student.email)
+
+
+# ------------------------------------------------
+# 3️⃣ Secondary indexes
+# ------------------------------------------------
+
+def normalize_email(email) -> str:
+    return str(email).strip().lower()
+
+
+class StudentIndex:
+    """
+    department -> roll numbers, email -> roll number, and (name, roll number)
+    pairs kept sorted for prefix search.
+
+    An older roster may repeat an email. The first student keeps the `emails`
+    entry; the others wait in `_email_waiting` and take it over when it is freed.
+    """
+
+    def __init__(self, rows: Iterable[tuple]):
+        # dicts with None values are insertion-ordered sets with O(1) removal
+        self.departments: Dict[str, Dict[str, None]] = {}
+        self.emails: Dict[str, str] = {}
+        self._email_waiting: Dict[str, Dict[str, None]] = {}
+        names: List[Tuple[str, str]] = []
+        for roll_no, name, department, _, email in rows:
+            self.departments.setdefault(department, {})[roll_no] = None
+            self._link_email(normalize_email(email), roll_no)
+            names.append((str(name).casefold(), roll_no))
+        names.sort()
+        self.names = names
+
+    def _link_email(self, email: str, roll_no) -> None:
+        owner = self.emails.setdefault(email, roll_no)
+        if owner != roll_no:
+            self._email_waiting.setdefault(email, {})[roll_no] = None
+
+    def add(self, roll_no, student: Student) -> None:
+        self.departments.setdefault(student.department, {})[roll_no] = None
+        self._link_email(normalize_email(student.email), roll_no)
+        insort(self.names, (str(student.name).casefold(), roll_no))
+
+    def add_many(self, entries: List[Tuple[str, Student]]) -> None:
+        """`add` for a batch: one sort of the name list instead of an insort per student."""
+        for roll_no, student in entries:
+            self.departments.setdefault(student.department, {})[roll_no] = None
+            self._link_email(normalize_email(student.email), roll_no)
+        self.names.extend((str(student.name).casefold(), roll_no) for roll_no, student in entries)
+        self.names.sort()
+
+    def _unlink(self, roll_no, student: Student) -> Tuple[str, str]:
+        """Drop the department and email entries; returns the name entry."""
+        members = self.departments.get(student.department)
+        if members is not None:
+            members.pop(roll_no, None)
+            if not members:
+                del self.departments[student.department]
+        email = normalize_email(student.email)
+        waiting = self._email_waiting.get(email)
+        if self.emails.get(email) == roll_no:
+            if waiting:
+                # the next student with the same email becomes its owner
+                self.emails[email] = next(iter(waiting))
+                del waiting[self.emails[email]]
+            else:
+                del self.emails[email]
+        elif waiting:
+            waiting.pop(roll_no, None)
+        if waiting is not None and not waiting:
+            del self._email_waiting[email]
+        return (str(student.name).casefold(), roll_no)
+
+    def remove(self, roll_no, student: Student) -> None:
+        entry = self._unlink(roll_no, student)
+        pos = bisect_left(self.names, entry)
+        if pos < len(self.names) and self.names[pos] == entry:
+            del self.names[pos]
+
+    def remove_many(self, entries: List[Tuple[str, Student]]) -> None:
+        """`remove` for a batch: one pass over the name list."""
+        gone = {self._unlink(roll_no, student) for roll_no, student in entries}
+        if gone:
+            self.names = [entry for entry in self.names if entry not in gone]
+
+    def name_prefix(self, prefix: str, limit: int) -> List[str]:
+        prefix = prefix.casefold()
+        names = self.names
+        found = []
+        pos = bisect_left(names, (prefix,))
+        while pos < len(names) and len(found) < limit and names[pos][0].startswith(prefix):
+            found.append(names[pos][1])
+            pos += 1
+        return found
+
+
+# ------------------------------------------------
+# 4️⃣ Storage backends
+# ------------------------------------------------
+
+class StudentStorage(ABC):
+    """Where a `StudentManagementSystem` keeps its roster between runs."""
+
+    @abstractmethod
+    def load(self) -> List[list]:
+        """The stored roster as one list per column, in `COLUMNS` order."""
+
+    def roster(self) -> Optional[Mapping]:
+        """
+        A live, read-only roll_no -> Student view of the stored roster, for
+        backends that can answer lookups themselves. None means `load()` it.
+        """
+        return None
+
+    def replay(self, apply: Callable[[dict], None]) -> int:
+        """Pass changes recorded after the last snapshot to `apply`; returns how many."""
+        return 0
+
+    @abstractmethod
+    def add(self, row: tuple) -> None:
+        """Persist a new student (a `COLUMNS`-ordered row)."""
+
+    @abstractmethod
+    def update(self, roll_no, changes: dict, row: tuple) -> None:
+        """Persist changed attributes; `row` is the student after the change."""
+
+    @abstractmethod
+    def delete(self, roll_no) -> None:
+        """Persist a removal."""
+
+    def add_many(self, rows: List[tuple]) -> None:
+        """Persist many new or replaced students at once."""
+        for row in rows:
+            self.add(row)
+
+    def needs_snapshot(self) -> bool:
+        return False
+
+    @abstractmethod
+    def save(self, rows: Iterable[tuple]) -> None:
+        """Replace the stored roster with `rows`."""
+
+    def close(self) -> None:
+        pass
+
+
+class CsvStorage(StudentStorage):
+    """A CSV snapshot plus an append-only JSON-lines journal (see the module docstring)."""
+
+    def __init__(self, data_file=DATA_FILE, compact_every: int = 1_000, fsync: bool = False):
+        self.data_file = data_file
+        self.journal_file = data_file + ".journal"
+        self.compact_every = compact_every
+        self.fsync = fsync
+        self.journal_records = 0
+        self.snapshot_size = 0
+
+    def load(self) -> List[list]:
+        if not os.path.exists(self.data_file):
+            return [[] for _ in COLUMNS]
+        # read everything as text so roll numbers like "007" keep their form
+        df = pd.read_csv(self.data_file, dtype=str, keep_default_na=False,
+                         usecols=COLUMNS, engine="c")
+        self.snapshot_size = len(df)
+        return [df[column].tolist() for column in COLUMNS]
+
+    def replay(self, apply: Callable[[dict], None]) -> int:
+        self.journal_records = 0
+        if not os.path.exists(self.journal_file):
+            return 0
+        valid_bytes = 0
+        with open(self.journal_file, "rb") as f:
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("torn write")
+                    record = json.loads(line)
+                except ValueError:
+                    break  # everything after a damaged line is untrusted
+                apply(record)
+                self.journal_records += 1
+                valid_bytes += len(line)
+        if valid_bytes < os.path.getsize(self.journal_file):
+            with open(self.journal_file, "r+b") as f:
+                f.truncate(valid_bytes)
+        return self.journal_records
+
+    def _log(self, op: str, roll_no, data: Optional[dict] = None) -> None:
+        self._append([{"op": op, "roll_no": roll_no, "data": data}])
+
+    def _append(self, records: List[dict]) -> None:
+        text = "".join(json.dumps(record, default=str) + "\n" for record in records)
+        with open(self.journal_file, "a", encoding="utf-8") as f:
+            f.write(text)
+            if self.fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        self.journal_records += len(records)
+
+    def add(self, row: tuple) -> None:
+        self._log("add", row[0], dict(zip(COLUMNS[1:], row[1:])))
+
+    def update(self, roll_no, changes: dict, row: tuple) -> None:
+        self._log("update", roll_no, changes)
+
+    def delete(self, roll_no) -> None:
+        self._log("delete", roll_no)
+
+    def add_many(self, rows: List[tuple]) -> None:
+        # one write (and at most one fsync) for the whole batch
+        self._append([{"op": "add", "roll_no": row[0], "data": dict(zip(COLUMNS[1:], row[1:]))}
+                      for row in rows])
+
+    def needs_snapshot(self) -> bool:
+        return self.journal_records >= max(self.compact_every, self.snapshot_size)
+
+    def save(self, rows: Iterable[tuple]) -> None:
+        """Write a full snapshot (atomically) and empty the journal."""
+        df = pd.DataFrame(list(rows), columns=COLUMNS)
+        tmp_file = self.data_file + ".tmp"
+        df.to_csv(tmp_file, index=False)
+        if self.fsync:
+            with open(tmp_file, "rb") as f:
+                os.fsync(f.fileno())
+        os.replace(tmp_file, self.data_file)
+        # only now is it safe to forget the journal
+        open(self.journal_file, "w").close()
+        self.journal_records = 0
+        self.snapshot_size = len(df)
+
+
+class SqliteStorage(StudentStorage):
+    """
+    One row per student in SQLite: every change is a single indexed
+    upsert / update / delete instead of a journal append or a file rewrite.
+    """
+
+    def __init__(self, db_file, fsync: bool = False):
+        self.db_file = db_file
+        # autocommit; Streamlit may rerun a session's script on another thread
+        self.conn = sqlite3.connect(db_file, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(f"PRAGMA synchronous={'FULL' if fsync else 'NORMAL'}")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS students (
+                roll_no TEXT PRIMARY KEY,
+                name TEXT,
+                department TEXT,
+                dob TEXT,
+                email TEXT
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_students_department ON students(department)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_students_email ON students(email)")
+
+    def load(self) -> List[list]:
+        rows = self.conn.execute(
+            "SELECT roll_no, name, department, dob, email FROM students ORDER BY rowid"
+        ).fetchall()
+        return [list(column) for column in zip(*rows)] or [[] for _ in COLUMNS]
+
+    def roster(self) -> "SqliteRoster":
+        return SqliteRoster(self.conn)
+
+    def add(self, row: tuple) -> None:
+        self.conn.execute(UPSERT_STUDENT, row)
+
+    def update(self, roll_no, changes: dict, row: tuple) -> None:
+        self.conn.execute(
+            "UPDATE students SET name=?, department=?, dob=?, email=? WHERE roll_no=?",
+            (*row[1:], roll_no)
+        )
+
+    def delete(self, roll_no) -> None:
+        self.conn.execute("DELETE FROM students WHERE roll_no=?", (roll_no,))
+
+    def add_many(self, rows: List[tuple]) -> None:
+        with self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            self.conn.executemany(UPSERT_STUDENT, rows)
+
+    def save(self, rows: Iterable[tuple]) -> None:
+        with self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            self.conn.execute("DELETE FROM students")
+            self.conn.executemany(UPSERT_STUDENT, rows)
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+class SqliteRoster(Mapping):
+    """
+    roll_no -> Student read straight from the `students` table: nothing is
+    loaded up front, and a lookup is one primary-key query. Changes go through
+    `SqliteStorage`, so this view never needs to be written to.
+    """
+
+    SELECT = "SELECT roll_no, name, department, dob, email FROM students"
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def __getitem__(self, roll_no) -> Student:
+        row = self.conn.execute(f"{self.SELECT} WHERE roll_no=?", (roll_no,)).fetchone()
+        if row is None:
+            raise KeyError(roll_no)
+        return Student(*row)
+
+    def __contains__(self, roll_no) -> bool:
+        return self.conn.execute("SELECT 1 FROM students WHERE roll_no=?",
+                                 (roll_no,)).fetchone() is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return (roll_no for roll_no, in self.conn.execute(
+            "SELECT roll_no FROM students ORDER BY rowid"))
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM students").fetchone()[0]
+
+    def rows(self, offset: int = 0, limit: Optional[int] = None,
+             after=None) -> Iterator[tuple]:
+        """
+        Students as `COLUMNS`-ordered tuples in insertion order, streamed from
+        the cursor. `after` (keyset paging) starts behind that roll number
+        instead of counting `offset` rows from the start.
+        """
+        where, params = "", []
+        if after is not None:
+            where = "WHERE rowid > (SELECT rowid FROM students WHERE roll_no=?)"
+            params.append(after)
+        params += [-1 if limit is None else limit, offset]
+        return self.conn.execute(f"{self.SELECT} {where} ORDER BY rowid LIMIT ? OFFSET ?",
+                                 params)
+
+
+def open_storage(data_file, compact_every: int = 1_000, fsync: bool = False) -> StudentStorage:
+    """SQLite for `.db` / `.sqlite` / `.sqlite3` files, CSV + journal otherwise."""
+    if str(data_file).lower().endswith(SQLITE_SUFFIXES):
+        return SqliteStorage(data_file, fsync=fsync)
+    return CsvStorage(data_file, compact_every=compact_every, fsync=fsync)
+
+
+# ------------------------------------------------
+# 5️⃣ Bulk import helpers
+# ------------------------------------------------
+
+EMAIL_PATTERN = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
+
+# accepted keys for each column in CSV headers / JSON objects
+FIELD_NAMES = {
+    "Roll No": ("Roll No", "roll_no"),
+    "Name": ("Name", "name"),
+    "Department": ("Department", "department"),
+    "Date of Birth": ("Date of Birth", "dob"),
+    "Email": ("Email", "email"),
+}
+
+
+class BulkResult(NamedTuple):
+    added: int
+    updated: int
+    skipped: int
+    errors: List[Tuple[int, str]]  # (record number, starting at 1; message)
+    seconds: float
+
+    @property
+    def rows_per_sec(self) -> float:
+        processed = self.added + self.updated + self.skipped + len(self.errors)
+        return processed / self.seconds if self.seconds else 0.0
+
+
+class UnreadableRecord(NamedTuple):
+    """Stands in for a file record that could not be parsed at all."""
+    reason: str
+
+
+def _record_row(record) -> tuple:
+    """A `Student`, a dict (CSV / JSON style keys) or a 5-tuple as a `COLUMNS` row."""
+    if isinstance(record, Student):
+        return _as_row(record)
+    if isinstance(record, UnreadableRecord):
+        raise ValueError(record.reason)
+    if isinstance(record, Mapping):
+        if record.get(None):
+            # csv.DictReader collects fields beyond the header under None
+            raise ValueError(f"{len(record[None])} extra field(s)")
+        row = []
+        for column in COLUMNS:
+            value = next((record[k] for k in FIELD_NAMES[column] if k in record), "")
+            row.append("" if value is None else str(value).strip())
+        return tuple(row)
+    row = tuple("" if v is None else str(v).strip() for v in record)
+    if len(row) != len(COLUMNS):
+        raise ValueError(f"expected {len(COLUMNS)} fields, got {len(row)}")
+    return row
+
+
+def read_student_records(source, fmt: Optional[str] = None) -> Iterator[dict]:
+    """
+    Records from a CSV (with a header row) or JSON-lines file. `source` is a
+    path or a file object (e.g. a Streamlit upload); `fmt` is "csv" or "jsonl"
+    and is taken from the file name when omitted. A JSONL line that is not a
+    JSON object comes out as an `UnreadableRecord`, so the rest still loads.
+    """
+    is_path = isinstance(source, (str, os.PathLike))
+    name = str(source) if is_path else getattr(source, "name", "")
+    fmt = fmt or ("jsonl" if name.lower().endswith((".jsonl", ".json")) else "csv")
+    f = open(source, "rb") if is_path else source
+    wrapped = not isinstance(f, io.TextIOBase)
+    text = io.TextIOWrapper(f, encoding="utf-8-sig", newline="") if wrapped else f
+    try:
+        if fmt == "jsonl":
+            for line_no, line in enumerate(text, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    yield UnreadableRecord(f"invalid JSON (line {line_no})")
+                    continue
+                if isinstance(record, dict):
+                    yield record
+                else:
+                    yield UnreadableRecord(f"not a JSON object (line {line_no})")
+        else:
+            yield from csv.DictReader(text)
+    finally:
+        if wrapped:
+            text.detach()  # leave a caller's file object open
+        if is_path:
+            f.close()
+
+
+# ------------------------------------------------
+# 6️⃣ Student Management System
+# ------------------------------------------------
+
+class StudentManagementSystem:
+    def __init__(self, data_file=DATA_FILE, compact_every: int = 1_000, fsync: bool = False,
+                 lazy: bool = False, storage: Optional[StudentStorage] = None):
+        """
+        `data_file` picks the backend: a `.db` / `.sqlite` file is stored in
+        SQLite, anything else as CSV + journal. Pass `storage` to plug in any
+        other `StudentStorage`.
+        `compact_every` is the minimum journal length before compaction (CSV).
+        `fsync=True` also survives power loss, at the cost of a disk flush per change.
+        `lazy=True` keeps the roster in a `StudentTable` and builds `Student`
+        objects on access instead of at load time. Backends with a live
+        `roster()` (SQLite) are not loaded into memory either way.
+        """
+        self.data_file = data_file
+        self.storage = storage or open_storage(data_file, compact_every, fsync)
+        self.lazy = lazy
+        self.students: Mapping = {}
+        # True when `students` is the storage's own view (nothing to write back)
+        self._live = False
+        self._index: Optional[StudentIndex] = None
+        # bumped by every change, so views of the roster know when to refresh
+        self.version = 0
+        self.load_data()
+
+    # ---------------- persistence ----------------
+
+    def load_data(self):
+        self._index = None
+        self.version += 1
+        roster = self.storage.roster()
+        self._live = roster is not None
+        if self._live:
+            self.students = roster
+            return
+        columns = self.storage.load()
+        if self.lazy:
+            self.students = StudentTable(columns)
+        else:
+            self.students = dict(zip(columns[0], map(Student, *columns)))
+        self.storage.replay(self._apply)
+
+    def _apply(self, record: dict) -> None:
+        op, roll_no = record["op"], record["roll_no"]
+        if op == "add":
+            self._put(Student(roll_no, *(record["data"][c] for c in COLUMNS[1:])))
+        elif op == "update":
+            student = self.students.get(roll_no)
+            if student:
+                self._assign(roll_no, student, record["data"])
+        elif op == "delete":
+            self._drop(roll_no)
+
+    def _persisted(self) -> None:
+        if self.storage.needs_snapshot():
+            self.save_data()
+
+    def save_data(self):
+        """Write the whole roster to storage (a live roster already is the storage)."""
+        if not self._live:
+            self.storage.save(self.rows())
+
+    def add_students_bulk(self, records: Iterable, on_conflict: str = "skip") -> BulkResult:
+        """
+        Add many students at once: validate the whole batch, apply it in memory,
+        then persist it with a single storage write.
+
+        `records` may hold `Student`s, dicts (e.g. from `read_student_records`)
+        or `COLUMNS`-ordered tuples. An existing roll number is left alone with
+        `on_conflict="skip"` and overwritten with `"update"`. Invalid records
+        are reported in `errors` and do not stop the rest of the batch.
+        """
+        if on_conflict not in ("skip", "update"):
+            raise ValueError("on_conflict must be 'skip' or 'update'")
+        start = time.perf_counter()
+        errors: List[Tuple[int, str]] = []
+        accepted: Dict[str, tuple] = {}    # roll_no -> row
+        first_seen: Dict[str, int] = {}    # roll_no -> record number
+        batch_emails: Dict[str, str] = {}  # email -> roll_no within this batch
+        emails = self.index.emails
+        skipped = 0
+
+        # 1. validate everything before touching the roster
+        for number, record in enumerate(records, start=1):
+            try:
+                row = _record_row(record)
+            except (TypeError, ValueError) as e:
+                reason = str(e) if isinstance(record, UnreadableRecord) else f"unreadable record: {e}"
+                errors.append((number, reason))
+                continue
+            roll_no, name, department, dob, email = row
+            missing = [c for c, v in zip(COLUMNS, row) if not v]
+            if missing:
+                errors.append((number, f"missing {', '.join(missing)}"))
+                continue
+            if department not in DEPARTMENTS:
+                errors.append((number, f"unknown department {department!r}"))
+                continue
+            if not EMAIL_PATTERN.fullmatch(email):
+                errors.append((number, f"invalid email {email!r}"))
+                continue
+            if not _dob_ordinal(dob):
+                errors.append((number, f"invalid date of birth {dob!r} (use YYYY-MM-DD)"))
+                continue
+            if roll_no in first_seen:
+                errors.append((number, f"duplicate roll number {roll_no} (first in record "
+                                       f"{first_seen[roll_no]})"))
+                continue
+            first_seen[roll_no] = number
+            if roll_no in self.students and on_conflict == "skip":
+                skipped += 1
+                continue
+            key = normalize_email(email)
+            owner = batch_emails.get(key, emails.get(key))
+            if owner is not None and owner != roll_no:
+                errors.append((number, f"email {email} already belongs to {owner}"))
+                continue
+            batch_emails[key] = roll_no
+            accepted[roll_no] = row
+
+        # 2. apply in memory, 3. persist once
+        updated = sum(roll_no in self.students for roll_no in accepted)
+        self._put_many([Student(*row) for row in accepted.values()])
+        if accepted:
+            self.storage.add_many(list(accepted.values()))
+            self._persisted()
+        return BulkResult(len(accepted) - updated, updated, skipped, errors,
+                          time.perf_counter() - start)
+
+    def import_csv(self, csv_file) -> int:
+        """
+        Copy a CSV roster (and its journal, if any) into this system, e.g. to
+        move `students_data.csv` into SQLite. Existing roll numbers are overwritten.
+        """
+        source = StudentManagementSystem(csv_file, lazy=True, storage=CsvStorage(csv_file))
+        rows = list(source.rows())
+        self._put_many([Student(*row) for row in rows])
+        self.storage.add_many(rows)
+        self._persisted()
+        return len(rows)
+
+    def close(self) -> None:
+        self.storage.close()
+
+    def rows(self) -> Iterator[tuple]:
+        """Every student as a `COLUMNS`-ordered tuple (read-only, for views and exports)."""
+        if isinstance(self.students, (StudentTable, SqliteRoster)):
+            return self.students.rows()
+        return map(_as_row, self.students.values())
+
+    # ---------------- index maintenance ----------------
+
+    @property
+    def index(self) -> StudentIndex:
+        if self._index is None:
+            self._index = StudentIndex(self.rows())
+        return self._index
+
+    def _put(self, student: Student) -> None:
+        if self._index is not None:
+            replaced = self.students.get(student.roll_no)
+            if replaced is not None:
+                self._index.remove(student.roll_no, replaced)
+            self._index.add(student.roll_no, student)
+        if not self._live:
+            self.students[student.roll_no] = student
+        self.version += 1
+
+    def _put_many(self, students: List[Student]) -> None:
+        """`_put` for a batch, updating the index in bulk."""
+        if self._index is not None:
+            replaced = [(s.roll_no, self.students[s.roll_no]) for s in students
+                        if s.roll_no in self.students]
+            self._index.remove_many(replaced)
+            self._index.add_many([(s.roll_no, s) for s in students])
+        if not self._live:
+            for student in students:
+                self.students[student.roll_no] = student
+        self.version += 1
+
+    def _drop(self, roll_no) -> None:
+        student = self.students.get(roll_no)
+        if student is None:
+            return
+        if not self._live:
+            del self.students[roll_no]
+        self.version += 1
+        if self._index is not None:
+            self._index.remove(roll_no, student)
+
+    def _assign(self, roll_no, student: Student, changes: dict) -> None:
+        if self._index is not None:
+            self._index.remove(roll_no, student)
+        for key, value in changes.items():
+            setattr(student, key, value)
+        # a StudentTable hands out copies, so store the result back
+        if not self._live:
+            self.students[roll_no] = student
+        self.version += 1
+        if self._index is not None:
+            self._index.add(roll_no, student)
+
+    # ---------------- CRUD ----------------
+
+    def add_student(self, student: Student):
+        """False if the roll number or the email is already taken."""
+        if student.roll_no in self.students or self.find_by_email(student.email):
+            return False
+        self._put(student)
+        self.storage.add(_as_row(student))
+        self._persisted()
+        return True
+
+    def view_students(self, offset: int = 0, limit: Optional[int] = None, after=None):
+        """
+        `get_info()`-style dicts, optionally only one page of them. `after` is
+        the last roll number of the previous page (keyset paging); SQLite then
+        seeks to it instead of skipping `offset` rows.
+        """
+        if self._live:
+            rows = self.students.rows(offset, limit, after)
+        else:
+            rows = self.rows()
+            if after is not None:
+                rows = dropwhile(lambda row: row[0] != after, rows)
+                next(rows, None)
+            rows = islice(rows, offset, None if limit is None else offset + limit)
+        return [dict(zip(COLUMNS, row)) for row in rows]
+
+    def get_student(self, roll_no):
+        return self.students.get(roll_no)
+
+    def delete_student(self, roll_no):
+        if roll_no in self.students:
+            self._drop(roll_no)
+            self.storage.delete(roll_no)
+            self._persisted()
+            return True
+        return False
+
+    def update_student(self, roll_no, **kwargs):
+        """False if there is no such student or the new email belongs to someone else."""
+        student = self.students.get(roll_no)
+        if not student:
+            return False
+        if "email" in kwargs:
+            owner = self.index.emails.get(normalize_email(kwargs["email"]))
+            if owner is not None and owner != roll_no:
+                return False
+        changes = {key: value for key, value in kwargs.items() if hasattr(student, key)}
+        self._assign(roll_no, student, changes)
+        self.storage.update(roll_no, changes, _as_row(student))
+        self._persisted()
+        return True
+
+    # ---------------- queries ----------------
+
+    def by_department(self, department, limit: Optional[int] = None) -> List[Student]:
+        """Students of one department, in the order they joined it."""
+        members = self.index.departments.get(department, {})
+        return list(map(self.students.__getitem__, islice(members, limit)))
+
+    def department_counts(self) -> Dict[str, int]:
+        return {department: len(members) for department, members in self.index.departments.items()}
+
+    def find_by_email(self, email) -> Optional[Student]:
+        roll_no = self.index.emails.get(normalize_email(email))
+        return None if roll_no is None else self.students[roll_no]
+
+    def search_name_prefix(self, prefix: str, limit: int = 50) -> List[Student]:
+        """Students whose name starts with `prefix` (case-insensitive), in name order."""
+        return [self.students[r] for r in self.index.name_prefix(prefix, limit)]
+
+
+# ------------------------------------------------
+# 7️⃣ Command line
+# ------------------------------------------------
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Move a CSV student roster into another store.")
+    parser.add_argument("csv_file", help="existing roster, e.g. students_data.csv")
+    parser.add_argument("target", help="destination, e.g. students.db")
+    args = parser.parse_args()
+
+    system = StudentManagementSystem(args.target, lazy=True)
+    try:
+        start = time.perf_counter()
+        count = system.import_csv(args.csv_file)
+        print(f"Imported {count:,} students into {args.target} "
+              f"in {time.perf_counter() - start:.2f}s")
+    finally:
+        system.close()
+
+
+if __name__ == "__main__":
+    main()
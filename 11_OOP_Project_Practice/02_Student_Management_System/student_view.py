@@ -0,0 +1,94 @@
+# ================================================
+# File: student_view.py
+# Topic: Cached, paged table of students for the View Students page
+# ================================================
+
+"""
+The View Students page used to turn every student into a dict and wrap them
+all in a new DataFrame on every Streamlit rerun.
+
+`RosterView` builds that DataFrame once and keeps it until the roster changes
+(`StudentManagementSystem.version`). The row order for each
+(department, sort column, direction) combination is also cached as an array of
+positions, so rendering a page only copies `page_size` rows, however large
+the roster is.
+
+Roll numbers that are numbers sort numerically ("2" before "10"), ahead of
+any that are not. Descending order is stable too: students with equal values
+keep their roster order, as with `sorted(..., reverse=True)`.
+"""
+
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from student_management import COLUMNS, StudentManagementSystem
+
+SORT_COLUMNS = ["Roll No", "Name", "Department", "Date of Birth"]
+
+
+def _ranks(values: np.ndarray) -> np.ndarray:
+    """Each value's position among the distinct values (equal values, equal rank)."""
+    return np.unique(values, return_inverse=True)[1].astype(np.int64)
+
+
+def _sort_key(values: pd.Series) -> np.ndarray:
+    """One int64 per row that orders like the column should sort."""
+    text = values.to_numpy(dtype=str)
+    if values.name != "Roll No":
+        return _ranks(text)
+    # numeric roll numbers first, by value; then the rest as text
+    numbers = pd.to_numeric(values, errors="coerce").to_numpy(dtype=np.float64)
+    unparsed = np.isnan(numbers).astype(np.int64)
+    base = len(text) + 1
+    return (unparsed * base + _ranks(np.nan_to_num(numbers))) * base + _ranks(text)
+
+
+class RosterView:
+    def __init__(self, system: StudentManagementSystem):
+        self.system = system
+        self._version = None
+        self._frame: Optional[pd.DataFrame] = None
+        self._orders: Dict[tuple, np.ndarray] = {}
+
+    def frame(self) -> pd.DataFrame:
+        """The whole roster as a DataFrame, rebuilt only after a change."""
+        if self._version != self.system.version:
+            frame = pd.DataFrame(list(self.system.rows()), columns=COLUMNS)
+            frame["Department"] = frame["Department"].astype("category")
+            self._frame = frame
+            self._orders = {}
+            self._version = self.system.version
+        return self._frame
+
+    def _order(self, department, sort_by: Optional[str], descending: bool) -> np.ndarray:
+        frame = self.frame()
+        key = (department, sort_by, descending)
+        order = self._orders.get(key)
+        if order is None:
+            if department is None:
+                rows = np.arange(len(frame))
+            else:
+                rows = np.flatnonzero((frame["Department"] == department).to_numpy())
+            if sort_by is not None:
+                values = frame[sort_by].iloc[rows]
+                if sort_by == "Name":
+                    values = values.str.casefold()
+                ranks = _sort_key(values)
+                # stable both ways, so students with equal values stay in roster order
+                rows = rows[np.argsort(-ranks if descending else ranks, kind="stable")]
+            elif descending:
+                rows = rows[::-1]
+            order = self._orders[key] = rows
+        return order
+
+    def page(self, department=None, sort_by: Optional[str] = None, descending: bool = False,
+             page: int = 1, page_size: int = 50) -> Tuple[pd.DataFrame, int]:
+        """
+        One page of students and the number of students matching the filter.
+        `sort_by=None` keeps the order in which students were added.
+        """
+        order = self._order(department, sort_by, descending)
+        start = (page - 1) * page_size
+        return self.frame().iloc[order[start:start + page_size]], len(order)
@@ -1,8 +1,9 @@
 # 03_Library_Management_System.py
 import streamlit as st
-import sqlite3
 import pandas as pd
-from typing import List, Tuple
+from typing import List, Optional, Tuple
+
+from library_repository import LibraryRepository
 
 # ----------------------------
 #  CONFIG / DARK THEME CSS
@@ -51,81 +52,46 @@ st.markdown(
 # ----------------------------
 DB_PATH = "library.db"
 
-def get_connection():
-    return sqlite3.connect(DB_PATH)
-
-def init_db():
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS books (
-            book_id TEXT PRIMARY KEY,
-            title TEXT NOT NULL,
-            author TEXT NOT NULL,
-            quantity INTEGER NOT NULL
-        )
-    """)
-    conn.commit()
-    conn.close()
+@st.cache_resource
+def get_repository() -> LibraryRepository:
+    # one repository (and connection pool) shared by every session in this process
+    return LibraryRepository(DB_PATH)
 
 def add_book_db(book_id: str, title: str, author: str, quantity: int) -> bool:
     try:
-        conn = get_connection()
-        cur = conn.cursor()
-        cur.execute(
-            "INSERT INTO books (book_id, title, author, quantity) VALUES (?, ?, ?, ?)",
-            (book_id, title, author, quantity)
-        )
-        conn.commit()
-        conn.close()
-        return True
-    except sqlite3.IntegrityError:
-        # primary key exists
-        return False
+        return get_repository().add_book(book_id, title, author, quantity)
     except Exception:
         return False
 
 def get_books_db() -> List[Tuple]:
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute("SELECT book_id, title, author, quantity FROM books ORDER BY title")
-    rows = cur.fetchall()
-    conn.close()
-    return rows
-
-def search_book_db(keyword: str) -> List[Tuple]:
-    conn = get_connection()
-    cur = conn.cursor()
-    q = f"%{keyword}%"
-    cur.execute("""
-        SELECT book_id, title, author, quantity FROM books
-        WHERE book_id LIKE ? OR title LIKE ? OR author LIKE ?
-        ORDER BY title
-    """, (q, q, q))
-    rows = cur.fetchall()
-    conn.close()
-    return rows
+    return get_repository().get_books()
+
+def get_books_page_db(page_size: int, after: Optional[Tuple[str, str]] = None) -> List[Tuple]:
+    return get_repository().get_books_page(page_size, after)
+
+def count_books_db() -> int:
+    return get_repository().count_books()
+
+def search_book_db(keyword: str, limit: Optional[int] = None, offset: int = 0) -> List[Tuple]:
+    return get_repository().search_books(keyword, limit, offset)
 
 def update_book_db(book_id: str, title: str, author: str, quantity: int) -> None:
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute("""
-        UPDATE books
-        SET title = ?, author = ?, quantity = ?
-        WHERE book_id = ?
-    """, (title, author, quantity, book_id))
-    conn.commit()
-    conn.close()
+    get_repository().update_book(book_id, title, author, quantity)
 
 def delete_book_db(book_id: str) -> None:
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute("DELETE FROM books WHERE book_id = ?", (book_id,))
-    conn.commit()
-    conn.close()
+    get_repository().delete_book(book_id)
+
+def get_book_db(book_id: str) -> Optional[Tuple]:
+    return get_repository().get_book(book_id)
+
+def borrow_book_db(book_id: str, member_id: str) -> bool:
+    return get_repository().borrow(book_id, member_id)
+
+def return_book_db(book_id: str, member_id: str) -> bool:
+    return get_repository().return_(book_id, member_id)
 
-# initialize DB
-init_db()
+def restock_book_db(book_id: str, copies: int = 1) -> bool:
+    return get_repository().restock(book_id, copies)
 
 # ----------------------------
 #  SIDEBAR: Developer + Navigation
@@ -142,6 +108,11 @@ st.sidebar.markdown(
 )
 
 st.sidebar.markdown("---")
+stats = get_repository().cache.stats()
+st.sidebar.caption(
+    f"⚡ Query cache: {stats['hits']:,} hits / {stats['misses']:,} misses · "
+    f"{stats['entries']:,} entries · {stats['bytes'] / 1024:,.0f} KB"
+)
 st.sidebar.markdown("## 📌 Navigation")
 
 menu = st.sidebar.radio(
@@ -204,31 +175,69 @@ if menu == "➕ Add Book":
 # ----------------------------
 elif menu == "📊 View Books (Table)":
     st.header("📖 All Books (Table View)")
-    books = get_books_db()
+    total = count_books_db()
 
-    if not books:
+    if not total:
         st.info("No books found in the library.")
     else:
+        page_size = st.selectbox("Books per page", [25, 50, 100, 250], index=1)
+        if st.session_state.get("books_page_size") != page_size:
+            st.session_state.books_page_size = page_size
+            # keyset cursor (title, book_id) where each visited page starts
+            st.session_state.books_cursors = [None]
+        cursors = st.session_state.books_cursors
+
+        # fetch one extra row to know whether a next page exists
+        books = get_books_page_db(page_size + 1, cursors[-1])
+        has_next = len(books) > page_size
+        books = books[:page_size]
+
         df = pd.DataFrame(books, columns=["Book ID", "Title", "Author", "Quantity"])
         # Use container width so it looks good in wide layout
         st.dataframe(df, use_container_width=True)
 
+        first = (len(cursors) - 1) * page_size + 1
+        st.caption(f"Showing {first:,}–{first + len(books) - 1:,} of {total:,} books")
+
+        col1, col2 = st.columns(2)
+        if col1.button("⬅ Previous", disabled=len(cursors) == 1):
+            cursors.pop()
+            st.rerun()
+        if col2.button("Next ➡", disabled=not has_next):
+            last_id, last_title = books[-1][0], books[-1][1]
+            cursors.append((last_title, last_id))
+            st.rerun()
+
 # ----------------------------
 #  MENU: Search Book
 # ----------------------------
 elif menu == "🔍 Search Book":
     st.header("🔍 Search Books")
     keyword = st.text_input("Enter Book ID / Title / Author")
+    col1, col2 = st.columns(2)
+    with col1:
+        page_size = st.selectbox("Results per page", [10, 25, 50, 100], index=1)
+    with col2:
+        page = st.number_input("Page", min_value=1, step=1, value=1)
+
     if st.button("Search"):
         if not keyword:
             st.warning("Please enter a keyword to search.")
         else:
-            results = search_book_db(keyword)
-            if not results:
-                st.info("No matching books.")
-            else:
-                df = pd.DataFrame(results, columns=["Book ID", "Title", "Author", "Quantity"])
-                st.dataframe(df, use_container_width=True)
+            st.session_state.library_search = keyword
+
+    active = st.session_state.get("library_search")
+    if active:
+        # fetch one extra row to know whether a next page exists
+        results = search_book_db(active, limit=page_size + 1, offset=(page - 1) * page_size)
+        has_more = len(results) > page_size
+        results = results[:page_size]
+        if not results:
+            st.info("No matching books.")
+        else:
+            df = pd.DataFrame(results, columns=["Book ID", "Title", "Author", "Quantity"])
+            st.dataframe(df, use_container_width=True)
+            st.caption(f"Page {page}" + (" — more results on the next page" if has_more else ""))
 
 # ----------------------------
 #  MENU: Update Book
@@ -240,18 +249,10 @@ elif menu == "📝 Update Book":
         if not book_id:
             st.error("Please enter a Book ID.")
         else:
-            rows = search_book_db(book_id.strip())
-            if not rows:
+            row = get_book_db(book_id.strip())
+            if row is None:
                 st.error("Book not found.")
             else:
-                # prefer exact id match
-                row = None
-                for r in rows:
-                    if r[0] == book_id.strip():
-                        row = r
-                        break
-                if row is None:
-                    row = rows[0]
                 _, cur_title, cur_author, cur_qty = row
 
                 new_title = st.text_input("Title", value=cur_title)
@@ -268,28 +269,16 @@ elif menu == "📝 Update Book":
 elif menu == "📕 Borrow Book":
     st.header("📕 Borrow Book")
     book_id = st.text_input("Book ID to borrow")
+    member_id = st.text_input("Member ID")
     if st.button("Borrow"):
-        if not book_id:
-            st.error("Please enter a Book ID.")
+        if not (book_id and member_id):
+            st.error("Please enter a Book ID and Member ID.")
+        elif borrow_book_db(book_id.strip(), member_id.strip()):
+            st.success(f"Book '{book_id.strip()}' borrowed by member {member_id.strip()}.")
+        elif get_book_db(book_id.strip()) is None:
+            st.error("Book not found.")
         else:
-            rows = search_book_db(book_id.strip())
-            if not rows:
-                st.error("Book not found.")
-            else:
-                # pick exact id match if exists else first
-                row = None
-                for r in rows:
-                    if r[0] == book_id.strip():
-                        row = r
-                        break
-                if row is None:
-                    row = rows[0]
-                bid, title, author, qty = row
-                if qty > 0:
-                    update_book_db(bid, title, author, qty - 1)
-                    st.success(f"You borrowed '{title}'.")
-                else:
-                    st.warning("No copies available to borrow.")
+            st.warning("No copies available to borrow.")
 
 # ----------------------------
 #  MENU: Return Book
@@ -297,24 +286,23 @@ elif menu == "📕 Borrow Book":
 elif menu == "📘 Return Book":
     st.header("📘 Return Book")
     book_id = st.text_input("Book ID to return")
+    member_id = st.text_input("Member ID")
+    # copies lent out before loans were recorded have no loan to close
+    no_loan = st.checkbox("Borrowed before loans were recorded (restock only)")
     if st.button("Return"):
-        if not book_id:
-            st.error("Please enter a Book ID.")
-        else:
-            rows = search_book_db(book_id.strip())
-            if not rows:
-                st.error("Book not found.")
+        if no_loan:
+            if not book_id:
+                st.error("Please enter a Book ID.")
+            elif restock_book_db(book_id.strip()):
+                st.success(f"Returned '{book_id.strip()}' to stock.")
             else:
-                row = None
-                for r in rows:
-                    if r[0] == book_id.strip():
-                        row = r
-                        break
-                if row is None:
-                    row = rows[0]
-                bid, title, author, qty = row
-                update_book_db(bid, title, author, qty + 1)
-                st.success(f"Returned '{title}' successfully.")
+                st.error("Book not found.")
+        elif not (book_id and member_id):
+            st.error("Please enter a Book ID and Member ID.")
+        elif return_book_db(book_id.strip(), member_id.strip()):
+            st.success(f"Returned '{book_id.strip()}' successfully.")
+        else:
+            st.error("No open loan found for this book and member.")
 
 # ----------------------------
 #  MENU: Delete Book
@@ -326,8 +314,7 @@ elif menu == "🗑 Delete Book":
         if not book_id:
             st.error("Please enter a Book ID.")
         else:
-            rows = search_book_db(book_id.strip())
-            if not rows:
+            if get_book_db(book_id.strip()) is None:
                 st.error("Book not found.")
             else:
                 delete_book_db(book_id.strip())
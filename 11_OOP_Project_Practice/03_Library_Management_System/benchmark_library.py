@@ -0,0 +1,270 @@
+# ================================================
+# File: benchmark_library.py
+# Topic: Performance checks for the Library Management System
+# ================================================
+
+"""
+Small, self-contained benchmarks for `library_repository.py`.
+
+Every benchmark works on a throw-away database in a temporary directory,
+so running this file never touches `library.db`.
+
+Run:
+    python benchmark_library.py
+"""
+
+import csv
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from library_repository import LibraryRepository
+
+
+# ------------------------------------------------
+# Helpers
+# ------------------------------------------------
+
+def make_books(n):
+    return [(f"B{i:07d}", f"Title {i}", f"Author {i % 1000}", 5) for i in range(n)]
+
+
+def seed(db_path, n):
+    repo = LibraryRepository(db_path)
+    with repo.transaction() as conn:
+        conn.executemany(
+            "INSERT INTO books (book_id, title, author, quantity) VALUES (?, ?, ?, ?)",
+            make_books(n)
+        )
+    return repo
+
+
+def run_threads(n_threads, target):
+    threads = [threading.Thread(target=target, args=(t,)) for t in range(n_threads)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - start
+
+
+# ------------------------------------------------
+# 1️⃣ Connection pool vs. connect-per-statement
+# ------------------------------------------------
+
+def legacy_get_book(db_path, book_id):
+    # the original helper style: open, query, close for every call
+    conn = sqlite3.connect(db_path)
+    cur = conn.cursor()
+    cur.execute("SELECT book_id, title, author, quantity FROM books WHERE book_id = ?", (book_id,))
+    row = cur.fetchone()
+    conn.close()
+    return row
+
+
+def bench_pool(n_books=10_000, n_threads=8, reads_per_thread=5_000):
+    print(f"\n--- Point reads: {n_threads} threads x {reads_per_thread} reads ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        repo = seed(db_path, n_books)
+
+        def legacy_reader(t):
+            for i in range(reads_per_thread):
+                legacy_get_book(db_path, f"B{(i * 7 + t) % n_books:07d}")
+
+        def pooled_reader(t):
+            for i in range(reads_per_thread):
+                repo.get_book(f"B{(i * 7 + t) % n_books:07d}")
+
+        total = n_threads * reads_per_thread
+        before = run_threads(n_threads, legacy_reader)
+        after = run_threads(n_threads, pooled_reader)
+        print(f"connect-per-call : {total / before:>12,.0f} ops/sec")
+        print(f"LibraryRepository: {total / after:>12,.0f} ops/sec  ({before / after:.1f}x)")
+        repo.close()
+
+
+# ------------------------------------------------
+# 2️⃣ FTS5 trigram search vs. LIKE scan
+# ------------------------------------------------
+
+def bench_search(n_books=200_000, keywords=("itle 1234", "Author 42", "B00012"), page_size=25):
+    print(f"\n--- Search over {n_books:,} books (first page of {page_size}) ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = seed(os.path.join(tmp, "bench.db"), n_books)
+        if not repo.fts_enabled:
+            print("FTS5 trigram tokenizer not available in this SQLite build; skipping.")
+            repo.close()
+            return
+        for keyword in keywords:
+            start = time.perf_counter()
+            like_rows = repo._search_like(keyword, page_size, 0)
+            like_ms = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            fts_rows = repo._search_fts(keyword, page_size, 0)
+            fts_ms = (time.perf_counter() - start) * 1000
+            print(f"{keyword!r:14} LIKE {like_ms:8.2f} ms ({len(like_rows)} rows)   "
+                  f"FTS5 {fts_ms:8.2f} ms ({len(fts_rows)} rows)")
+        repo.close()
+
+
+# ------------------------------------------------
+# 3️⃣ Concurrent borrow stress test
+# ------------------------------------------------
+
+def bench_borrow(n_books=1_000, copies=5, n_threads=8, borrows_per_thread=2_000):
+    print(f"\n--- Borrow stress: {n_threads} threads x {borrows_per_thread} borrows "
+          f"on {n_books} books x {copies} copies ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = seed(os.path.join(tmp, "bench.db"), n_books)
+        with repo.transaction() as conn:
+            conn.execute("UPDATE books SET quantity = ?", (copies,))
+
+        successes = [0] * n_threads
+
+        def borrower(t):
+            for i in range(borrows_per_thread):
+                if repo.borrow(f"B{(i * 13 + t) % n_books:07d}", f"M{t}"):
+                    successes[t] += 1
+
+        elapsed = run_threads(n_threads, borrower)
+        with repo.pool.connection() as conn:
+            min_qty, total_qty = conn.execute("SELECT MIN(quantity), SUM(quantity) FROM books").fetchone()
+            open_loans = conn.execute("SELECT COUNT(*) FROM loans WHERE returned_at IS NULL").fetchone()[0]
+
+        borrowed = sum(successes)
+        print(f"throughput       : {n_threads * borrows_per_thread / elapsed:,.0f} borrows/sec")
+        print(f"successful       : {borrowed:,} (stock available: {n_books * copies:,})")
+        assert min_qty >= 0, "stock went negative"
+        assert borrowed == open_loans == n_books * copies - total_qty, "ledger and stock disagree"
+        print("check            : no negative stock, loans match stock movement")
+        repo.close()
+
+
+# ------------------------------------------------
+# 4️⃣ Bulk import / export
+# ------------------------------------------------
+
+def bench_bulk(n_books=200_000, legacy_books=2_000, batch_sizes=(1_000, 10_000, 50_000)):
+    print(f"\n--- Bulk import/export of {n_books:,} books ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "catalog.csv")
+        with open(csv_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["Book ID", "Title", "Author", "Quantity"])
+            writer.writerows(make_books(n_books))
+
+        # one connection + one commit per book, like the original add_book_db
+        legacy_db = os.path.join(tmp, "legacy.db")
+        LibraryRepository(legacy_db).close()
+        start = time.perf_counter()
+        for book in make_books(legacy_books):
+            conn = sqlite3.connect(legacy_db)
+            conn.execute("INSERT INTO books (book_id, title, author, quantity) VALUES (?, ?, ?, ?)", book)
+            conn.commit()
+            conn.close()
+        print(f"add_book per row       : {legacy_books / (time.perf_counter() - start):>12,.0f} rows/sec")
+
+        for batch_size in batch_sizes:
+            db_path = os.path.join(tmp, f"bulk_{batch_size}.db")
+            repo = LibraryRepository(db_path)
+            try:
+                result = repo.import_books(csv_path, batch_size=batch_size)
+            finally:
+                repo.close()
+            print(f"import batch={batch_size:<7,}  : {result.rows_per_sec:>12,.0f} rows/sec "
+                  f"({result.rows:,} rows)")
+
+        repo = LibraryRepository(db_path)
+        try:
+            result = repo.export_books(os.path.join(tmp, "export.jsonl"))
+        finally:
+            repo.close()
+        print(f"export (jsonl)         : {result.rows_per_sec:>12,.0f} rows/sec ({result.rows:,} rows)")
+
+
+# ------------------------------------------------
+# 5️⃣ Keyset pagination vs. fetchall
+# ------------------------------------------------
+
+def bench_pagination(n_books=200_000, page_size=50):
+    print(f"\n--- View Books over {n_books:,} books, page size {page_size} ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = seed(os.path.join(tmp, "bench.db"), n_books)
+
+        start = time.perf_counter()
+        repo.get_books()
+        print(f"get_books (fetchall)   : {(time.perf_counter() - start) * 1000:9.2f} ms")
+
+        # jump to a page deep in the catalog, then time the next page
+        with repo.pool.connection() as conn:
+            deep = conn.execute(
+                "SELECT title, book_id FROM books ORDER BY title, book_id LIMIT 1 OFFSET ?",
+                (n_books - page_size,)
+            ).fetchone()
+
+        start = time.perf_counter()
+        with repo.pool.connection() as conn:
+            conn.execute(
+                "SELECT book_id, title, author, quantity FROM books "
+                "ORDER BY title, book_id LIMIT ? OFFSET ?", (page_size, n_books - page_size)
+            ).fetchall()
+        print(f"last page via OFFSET   : {(time.perf_counter() - start) * 1000:9.2f} ms")
+
+        start = time.perf_counter()
+        repo.get_books_page(page_size, deep)
+        print(f"last page via keyset   : {(time.perf_counter() - start) * 1000:9.2f} ms")
+
+        repo.count_books()
+        start = time.perf_counter()
+        repo.count_books()
+        print(f"count_books (cached)   : {(time.perf_counter() - start) * 1000:9.4f} ms")
+        repo.close()
+
+
+# ------------------------------------------------
+# 6️⃣ Read-through query cache
+# ------------------------------------------------
+
+def bench_cache(n_books=200_000, reruns=200, page_size=50):
+    print(f"\n--- {reruns} reruns of View Books + Search over {n_books:,} books ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = seed(os.path.join(tmp, "bench.db"), n_books)
+
+        def rerun():
+            repo.count_books()
+            repo.get_books_page(page_size + 1, None)
+            repo.search_books("Author 42", page_size + 1, 0)
+
+        start = time.perf_counter()
+        for _ in range(reruns):
+            repo.cache.invalidate()
+            rerun()
+        uncached = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(reruns):
+            rerun()
+        cached = time.perf_counter() - start
+
+        print(f"without cache          : {uncached / reruns * 1000:9.3f} ms/rerun")
+        print(f"with cache             : {cached / reruns * 1000:9.3f} ms/rerun  ({uncached / cached:.0f}x)")
+        print(f"cache stats            : {repo.cache.stats()}")
+
+        repo.add_book("NEW", "Author 42 biography", "Someone", 1)
+        assert any(row[0] == "NEW" for row in repo.search_books("Author 42")), "stale search result"
+        print("check                  : writes invalidate cached results")
+        repo.close()
+
+
+if __name__ == "__main__":
+    bench_pool()
+    bench_search()
+    bench_borrow()
+    bench_bulk()
+    bench_pagination()
+    bench_cache()
@@ -0,0 +1,648 @@
+# ================================================
+# File: library_repository.py
+# Topic: Data-access layer for the Library Management System
+# ================================================
+
+"""
+All SQL for the Library Management System lives in this module so the
+Streamlit app only works with plain Python values.
+
+Instead of opening and closing a new SQLite connection for every statement,
+the `LibraryRepository` borrows connections from a small bounded
+`ConnectionPool`:
+
+- Each thread keeps the same connection for as long as it is using it.
+- Connections run in WAL journal mode, so readers do not block the writer.
+- SQLite's prepared-statement cache (`cached_statements`) is sized so the
+  handful of queries used by the app are parsed only once per connection.
+
+Catalogs can be bulk-loaded from / dumped to CSV or JSONL files from the
+command line:
+
+    python library_repository.py import catalog.csv --batch-size 10000
+    python library_repository.py export catalog.jsonl
+
+Listings, pages, counts and searches are served from an in-process `QueryCache`
+(LRU, capped in bytes). Every write committed through the repository bumps the
+cache generation, which invalidates all cached results at once. (Writes made by
+another process, e.g. the import CLI, show up after the app is restarted.)
+
+Searching uses an FTS5 index with the trigram tokenizer when the SQLite build
+supports it, and falls back to the original `LIKE '%keyword%'` scan otherwise.
+"""
+
+import argparse
+import csv
+import json
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Iterator, List, NamedTuple, Optional, Tuple
+
+DB_PATH = "library.db"
+
+BOOK_COLUMNS = "book_id, title, author, quantity"
+
+# trigram tokens are 3 characters, shorter keywords cannot use the index
+MIN_FTS_KEYWORD = 3
+
+# bm25 column weights for (book_id, title, author)
+FTS_WEIGHTS = (10.0, 5.0, 1.0)
+
+# accepted spellings of each column in import files
+FIELD_ALIASES = {
+    "book_id": "book_id", "book id": "book_id", "id": "book_id",
+    "title": "title",
+    "author": "author",
+    "quantity": "quantity", "qty": "quantity",
+}
+
+FTS_SCHEMA = [
+    # external-content table: the index stores tokens only, rows stay in `books`
+    """
+    CREATE VIRTUAL TABLE books_fts USING fts5(
+        book_id, title, author,
+        content='books', content_rowid='rowid', tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS books_fts_insert AFTER INSERT ON books BEGIN
+        INSERT INTO books_fts(rowid, book_id, title, author)
+        VALUES (new.rowid, new.book_id, new.title, new.author);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS books_fts_delete AFTER DELETE ON books BEGIN
+        INSERT INTO books_fts(books_fts, rowid, book_id, title, author)
+        VALUES ('delete', old.rowid, old.book_id, old.title, old.author);
+    END
+    """,
+    # quantity-only updates (borrow/return) do not touch the index
+    """
+    CREATE TRIGGER IF NOT EXISTS books_fts_update
+    AFTER UPDATE OF book_id, title, author ON books BEGIN
+        INSERT INTO books_fts(books_fts, rowid, book_id, title, author)
+        VALUES ('delete', old.rowid, old.book_id, old.title, old.author);
+        INSERT INTO books_fts(rowid, book_id, title, author)
+        VALUES (new.rowid, new.book_id, new.title, new.author);
+    END
+    """,
+]
+
+
+class BulkResult(NamedTuple):
+    rows: int
+    rejected: int
+    seconds: float
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+# ------------------------------------------------
+# 1️⃣ Connection Pool
+# ------------------------------------------------
+
+class ConnectionPool:
+    def __init__(self, db_path: str = DB_PATH, max_size: int = 8,
+                 timeout: float = 30.0, cached_statements: int = 256):
+        self.db_path = db_path
+        self.max_size = max_size
+        self.timeout = timeout
+        self.cached_statements = cached_statements
+
+        self._idle = queue.LifoQueue()
+        self._connections = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        # isolation_level=None -> autocommit; transactions are opened explicitly
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.timeout,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=self.cached_statements,
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    def _acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if len(self._connections) < self.max_size:
+                conn = self._connect()
+                self._connections.append(conn)
+                return conn
+
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise sqlite3.OperationalError(
+                f"connection pool exhausted ({self.max_size} connections in use)"
+            ) from None
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection; nested calls in the same thread reuse it."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            yield conn
+            return
+
+        conn = self._acquire()
+        self._local.conn = conn
+        try:
+            yield conn
+        finally:
+            self._local.conn = None
+            if conn.in_transaction:
+                conn.rollback()
+            self._idle.put(conn)
+
+    def close(self) -> None:
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+            self._idle = queue.LifoQueue()
+
+
+# ------------------------------------------------
+# 2️⃣ Query Result Cache
+# ------------------------------------------------
+
+def _estimate_size(value: Any) -> int:
+    """Rough memory footprint of a query result (list of row tuples or a scalar)."""
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(_estimate_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class QueryCache:
+    """
+    Thread-safe LRU cache for query results, shared by every session in the process.
+
+    Entries remember the generation they were loaded in. `invalidate()` bumps the
+    generation, so a result that was loading while a write committed is dropped
+    instead of being cached stale.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.size_bytes = 0
+        self._entries: "OrderedDict[Hashable, Tuple[int, int, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == self.generation:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+            generation = self.generation
+
+        # run the query outside the lock so sessions do not wait on each other
+        value = loader()
+        size = _estimate_size(value)
+        if size > self.max_bytes:
+            return value
+
+        with self._lock:
+            if generation != self.generation:
+                # a write committed while loading; the result may already be stale
+                return value
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size_bytes -= old[1]
+            self._entries[key] = (generation, size, value)
+            self.size_bytes += size
+            while self.size_bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self.size_bytes -= evicted_size
+        return value
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self.size_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "bytes": self.size_bytes,
+                "generation": self.generation,
+            }
+
+
+# ------------------------------------------------
+# 3️⃣ Library Repository
+# ------------------------------------------------
+
+class LibraryRepository:
+    def __init__(self, db_path: str = DB_PATH, pool_size: int = 8,
+                 cache_bytes: int = 32 * 1024 * 1024):
+        self.db_path = db_path
+        self.pool = ConnectionPool(db_path, max_size=pool_size)
+        self.cache = QueryCache(cache_bytes)
+        self.fts_enabled = False
+        self.init_db()
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run the enclosed statements in one write transaction."""
+        with self.pool.connection() as conn:
+            if conn.in_transaction:
+                # already inside an outer transaction on this thread
+                yield conn
+                return
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+            self.cache.invalidate()
+
+    def _cached_rows(self, key: Hashable, loader: Callable[[], List[Tuple]]) -> List[Tuple]:
+        # hand out a copy so callers cannot modify the shared cached list
+        return list(self.cache.get_or_load(key, loader))
+
+    def init_db(self) -> None:
+        with self.transaction() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS books (
+                    book_id TEXT PRIMARY KEY,
+                    title TEXT NOT NULL,
+                    author TEXT NOT NULL,
+                    quantity INTEGER NOT NULL
+                )
+            """)
+            # supports keyset pagination in title order
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_books_title ON books (title, book_id)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS loans (
+                    loan_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    book_id TEXT NOT NULL,
+                    member_id TEXT NOT NULL,
+                    borrowed_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                    returned_at TEXT
+                )
+            """)
+            # only open loans are ever looked up, so index just those
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_loans_open
+                ON loans (book_id, member_id) WHERE returned_at IS NULL
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_loans_member
+                ON loans (member_id) WHERE returned_at IS NULL
+            """)
+        self.fts_enabled = self._init_search_index()
+
+    def _init_search_index(self) -> bool:
+        try:
+            with self.transaction() as conn:
+                exists = conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE name = 'books_fts'"
+                ).fetchone()
+                if exists:
+                    return True
+                for statement in FTS_SCHEMA:
+                    conn.execute(statement)
+                conn.execute("INSERT INTO books_fts(books_fts) VALUES ('rebuild')")
+            return True
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5 or without the trigram tokenizer
+            return False
+
+    def rebuild_search_index(self) -> None:
+        """Re-sync the FTS index with `books` (e.g. after a VACUUM renumbers rowids)."""
+        if self.fts_enabled:
+            with self.transaction() as conn:
+                conn.execute("INSERT INTO books_fts(books_fts) VALUES ('rebuild')")
+
+    def add_book(self, book_id: str, title: str, author: str, quantity: int) -> bool:
+        try:
+            with self.transaction() as conn:
+                conn.execute(
+                    f"INSERT INTO books ({BOOK_COLUMNS}) VALUES (?, ?, ?, ?)",
+                    (book_id, title, author, quantity)
+                )
+            return True
+        except sqlite3.IntegrityError:
+            # primary key exists
+            return False
+
+    def get_book(self, book_id: str) -> Optional[Tuple]:
+        with self.pool.connection() as conn:
+            return conn.execute(
+                f"SELECT {BOOK_COLUMNS} FROM books WHERE book_id = ?", (book_id,)
+            ).fetchone()
+
+    def get_books(self) -> List[Tuple]:
+        return self._cached_rows(("books",), self._load_books)
+
+    def _load_books(self) -> List[Tuple]:
+        with self.pool.connection() as conn:
+            return conn.execute(
+                f"SELECT {BOOK_COLUMNS} FROM books ORDER BY title"
+            ).fetchall()
+
+    def get_books_page(self, page_size: int,
+                       after: Optional[Tuple[str, str]] = None) -> List[Tuple]:
+        """
+        Return one page of books in title order.
+
+        `after` is the (title, book_id) of the last row of the previous page.
+        Seeking past it on the (title, book_id) index keeps every page equally
+        cheap, unlike OFFSET which re-reads all earlier rows.
+        """
+        return self._cached_rows(("page", page_size, after),
+                                 lambda: self._load_books_page(page_size, after))
+
+    def _load_books_page(self, page_size: int, after: Optional[Tuple[str, str]]) -> List[Tuple]:
+        with self.pool.connection() as conn:
+            if after is None:
+                return conn.execute(f"""
+                    SELECT {BOOK_COLUMNS} FROM books
+                    ORDER BY title, book_id LIMIT ?
+                """, (page_size,)).fetchall()
+            return conn.execute(f"""
+                SELECT {BOOK_COLUMNS} FROM books
+                WHERE (title, book_id) > (?, ?)
+                ORDER BY title, book_id LIMIT ?
+            """, (*after, page_size)).fetchall()
+
+    def count_books(self) -> int:
+        """Number of books, cached until the next write."""
+        return self.cache.get_or_load(("count",), self._load_count)
+
+    def _load_count(self) -> int:
+        with self.pool.connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM books").fetchone()[0]
+
+    def search_books(self, keyword: str, limit: Optional[int] = None,
+                     offset: int = 0) -> List[Tuple]:
+        """Return matching books, best match first, `limit` rows from `offset`."""
+        if self.fts_enabled and len(keyword) >= MIN_FTS_KEYWORD:
+            loader = lambda: self._search_fts(keyword, limit, offset)
+        else:
+            loader = lambda: self._search_like(keyword, limit, offset)
+        return self._cached_rows(("search", keyword, limit, offset), loader)
+
+    def _search_fts(self, keyword: str, limit: Optional[int], offset: int) -> List[Tuple]:
+        # quote the keyword as one phrase so FTS syntax characters are literal
+        phrase = '"' + keyword.replace('"', '""') + '"'
+        with self.pool.connection() as conn:
+            return conn.execute(f"""
+                SELECT b.book_id, b.title, b.author, b.quantity
+                FROM books_fts
+                JOIN books AS b ON b.rowid = books_fts.rowid
+                WHERE books_fts MATCH ?
+                ORDER BY bm25(books_fts, ?, ?, ?), b.title
+                LIMIT ? OFFSET ?
+            """, (phrase, *FTS_WEIGHTS, -1 if limit is None else limit, offset)).fetchall()
+
+    def _search_like(self, keyword: str, limit: Optional[int], offset: int) -> List[Tuple]:
+        q = f"%{keyword}%"
+        with self.pool.connection() as conn:
+            return conn.execute(f"""
+                SELECT {BOOK_COLUMNS} FROM books
+                WHERE book_id LIKE ? OR title LIKE ? OR author LIKE ?
+                ORDER BY title
+                LIMIT ? OFFSET ?
+            """, (q, q, q, -1 if limit is None else limit, offset)).fetchall()
+
+    def update_book(self, book_id: str, title: str, author: str, quantity: int) -> bool:
+        with self.transaction() as conn:
+            cur = conn.execute("""
+                UPDATE books
+                SET title = ?, author = ?, quantity = ?
+                WHERE book_id = ?
+            """, (title, author, quantity, book_id))
+            return cur.rowcount > 0
+
+    def delete_book(self, book_id: str) -> bool:
+        with self.transaction() as conn:
+            cur = conn.execute("DELETE FROM books WHERE book_id = ?", (book_id,))
+        return cur.rowcount > 0
+
+    def borrow(self, book_id: str, member_id: str) -> bool:
+        """Take one copy out of stock and record the loan; False if none is left."""
+        with self.transaction() as conn:
+            cur = conn.execute(
+                "UPDATE books SET quantity = quantity - 1 WHERE book_id = ? AND quantity > 0",
+                (book_id,)
+            )
+            if cur.rowcount == 0:
+                return False
+            conn.execute(
+                "INSERT INTO loans (book_id, member_id) VALUES (?, ?)",
+                (book_id, member_id)
+            )
+            return True
+
+    def return_(self, book_id: str, member_id: str) -> bool:
+        """Close the member's oldest open loan and restock; False if there is none."""
+        with self.transaction() as conn:
+            cur = conn.execute("""
+                UPDATE loans SET returned_at = CURRENT_TIMESTAMP
+                WHERE loan_id = (
+                    SELECT loan_id FROM loans
+                    WHERE book_id = ? AND member_id = ? AND returned_at IS NULL
+                    ORDER BY loan_id LIMIT 1
+                )
+            """, (book_id, member_id))
+            if cur.rowcount == 0:
+                return False
+            conn.execute(
+                "UPDATE books SET quantity = quantity + 1 WHERE book_id = ?", (book_id,)
+            )
+            return True
+
+    def restock(self, book_id: str, copies: int = 1) -> bool:
+        """
+        Put copies back without closing a loan: for copies checked out before
+        loans were recorded, which `return_` cannot match. False if no such book.
+        """
+        if copies < 1:
+            raise ValueError("copies must be at least 1")
+        with self.transaction() as conn:
+            cur = conn.execute(
+                "UPDATE books SET quantity = quantity + ? WHERE book_id = ?", (copies, book_id)
+            )
+            return cur.rowcount > 0
+
+    def get_open_loans(self, member_id: str) -> List[Tuple]:
+        with self.pool.connection() as conn:
+            return conn.execute("""
+                SELECT l.book_id, b.title, l.borrowed_at
+                FROM loans AS l
+                LEFT JOIN books AS b ON b.book_id = l.book_id
+                WHERE l.member_id = ? AND l.returned_at IS NULL
+                ORDER BY l.loan_id
+            """, (member_id,)).fetchall()
+
+    def import_books(self, path: str, fmt: Optional[str] = None,
+                     batch_size: int = 10_000, on_conflict: str = "skip") -> BulkResult:
+        """
+        Stream books from a CSV/JSONL file into the database.
+
+        Rows are read lazily and written `batch_size` at a time, one transaction
+        per batch. `on_conflict` is "skip" (keep existing book) or "update".
+        """
+        if on_conflict == "skip":
+            sql = f"INSERT OR IGNORE INTO books ({BOOK_COLUMNS}) VALUES (?, ?, ?, ?)"
+        elif on_conflict == "update":
+            sql = f"""
+                INSERT INTO books ({BOOK_COLUMNS}) VALUES (?, ?, ?, ?)
+                ON CONFLICT(book_id) DO UPDATE SET
+                    title = excluded.title, author = excluded.author, quantity = excluded.quantity
+            """
+        else:
+            raise ValueError("on_conflict must be 'skip' or 'update'")
+
+        written = rejected = 0
+        batch = []
+        start = time.perf_counter()
+        for record in _read_records(path, fmt):
+            row = _parse_book_record(record)
+            if row is None:
+                rejected += 1
+                continue
+            batch.append(row)
+            if len(batch) >= batch_size:
+                written += self._write_batch(sql, batch)
+                batch = []
+        if batch:
+            written += self._write_batch(sql, batch)
+        return BulkResult(written, rejected, time.perf_counter() - start)
+
+    def _write_batch(self, sql: str, batch: List[Tuple]) -> int:
+        with self.transaction() as conn:
+            return conn.executemany(sql, batch).rowcount
+
+    def export_books(self, path: str, fmt: Optional[str] = None) -> BulkResult:
+        """Stream every book to a CSV/JSONL file without loading the table into memory."""
+        fmt = _detect_format(path, fmt)
+        written = 0
+        start = time.perf_counter()
+        with self.pool.connection() as conn, open(path, "w", newline="", encoding="utf-8") as f:
+            cursor = conn.execute(f"SELECT {BOOK_COLUMNS} FROM books ORDER BY book_id")
+            if fmt == "csv":
+                writer = csv.writer(f)
+                writer.writerow(["book_id", "title", "author", "quantity"])
+                for row in cursor:
+                    writer.writerow(row)
+                    written += 1
+            else:
+                for book_id, title, author, quantity in cursor:
+                    f.write(json.dumps({"book_id": book_id, "title": title,
+                                        "author": author, "quantity": quantity}))
+                    f.write("\n")
+                    written += 1
+        return BulkResult(written, 0, time.perf_counter() - start)
+
+    def close(self) -> None:
+        self.pool.close()
+
+
+# ------------------------------------------------
+# 4️⃣ Import File Helpers
+# ------------------------------------------------
+
+def _detect_format(path: str, fmt: Optional[str]) -> str:
+    fmt = (fmt or os.path.splitext(path)[1].lstrip(".")).lower()
+    if fmt == "csv":
+        return "csv"
+    if fmt in ("jsonl", "ndjson", "json"):
+        return "jsonl"
+    raise ValueError(f"unsupported file format: {fmt!r} (use csv or jsonl)")
+
+
+def _read_records(path: str, fmt: Optional[str]) -> Iterator[Any]:
+    """Raw records; a JSONL line that is not valid JSON comes out as None."""
+    if _detect_format(path, fmt) == "csv":
+        with open(path, newline="", encoding="utf-8") as f:
+            yield from csv.DictReader(f)
+    else:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        yield None
+
+
+def _parse_book_record(record: Any) -> Optional[Tuple]:
+    """Normalise one record to an insert tuple, or None if it is malformed."""
+    if not isinstance(record, dict):
+        return None
+    row = {FIELD_ALIASES.get(str(k).strip().lower()): v for k, v in record.items()}
+    try:
+        book_id = str(row["book_id"]).strip()
+        title = str(row["title"]).strip()
+        author = str(row["author"]).strip()
+        quantity = int(row["quantity"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    if not (book_id and title and author) or quantity < 0:
+        return None
+    return (book_id, title, author, quantity)
+
+
+# ------------------------------------------------
+# 5️⃣ Command Line Import / Export
+# ------------------------------------------------
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bulk import/export the library catalog.")
+    parser.add_argument("action", choices=["import", "export"])
+    parser.add_argument("path", help="CSV or JSONL file")
+    parser.add_argument("--db", default=DB_PATH, help="SQLite database file")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="override file extension")
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--on-conflict", choices=["skip", "update"], default="skip")
+    args = parser.parse_args()
+
+    repo = LibraryRepository(args.db)
+    try:
+        if args.action == "import":
+            result = repo.import_books(args.path, args.format, args.batch_size, args.on_conflict)
+            print(f"Imported {result.rows:,} books ({result.rejected:,} rejected) "
+                  f"in {result.seconds:.2f}s -> {result.rows_per_sec:,.0f} rows/sec")
+        else:
+            result = repo.export_books(args.path, args.format)
+            print(f"Exported {result.rows:,} books in {result.seconds:.2f}s "
+                  f"-> {result.rows_per_sec:,.0f} rows/sec")
+    finally:
+        repo.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,67 +1,53 @@
 import streamlit as st
-import sqlite3
-
-# ===============================================================
-# DATABASE SETUP
-# ===============================================================
-
-conn = sqlite3.connect("ecommerce.db", check_same_thread=False)
-cursor = conn.cursor()
-
-cursor.execute("""
-    CREATE TABLE IF NOT EXISTS products (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        name TEXT NOT NULL,
-        category TEXT NOT NULL,
-        price REAL NOT NULL,
-        quantity INTEGER NOT NULL
-    )
-""")
-conn.commit()
+import pandas as pd
 
+from product_formatting import format_prices
+from product_repository import Product, ProductRepository
 
 # ===============================================================
-# PRODUCT CLASS (OOP)
+# DATABASE SETUP
 # ===============================================================
 
-class Product:
-    def __init__(self, name, category, price, quantity):
-        self.name = name
-        self.category = category
-        self.price = price
-        self.quantity = quantity
-
-    def save_to_db(self):
-        cursor.execute(
-            "INSERT INTO products(name, category, price, quantity) VALUES (?, ?, ?, ?)",
-            (self.name, self.category, self.price, self.quantity)
-        )
-        conn.commit()
+@st.cache_resource(show_spinner=False)
+def get_repository():
+    # one repository (and its connections) shared by every session in this process
+    return ProductRepository("ecommerce.db")
 
 
 # ===============================================================
 # UTILITY FUNCTIONS
 # ===============================================================
 
-def get_all_products():
-    cursor.execute("SELECT * FROM products")
-    return cursor.fetchall()
-
-def search_product(keyword):
-    cursor.execute("SELECT * FROM products WHERE name LIKE ?", (f"%{keyword}%",))
-    return cursor.fetchall()
-
 def update_product(product_id, name, category, price, quantity):
-    cursor.execute("""
-        UPDATE products 
-        SET name=?, category=?, price=?, quantity=?
-        WHERE id=?
-    """, (name, category, price, quantity, product_id))
-    conn.commit()
+    repo.update_product(product_id, name, category, price, quantity)
 
 def delete_product(product_id):
-    cursor.execute("DELETE FROM products WHERE id=?", (product_id,))
-    conn.commit()
+    repo.delete_product(product_id)
+
+def parse_catalog(catalog):
+    """(products, rejected CSV row numbers) for an uploaded catalog.
+
+    A row needs a name and a category, a price >= 0 and a whole quantity >= 0;
+    anything else (blank, NaN, text) is rejected instead of stopping the import.
+    """
+    names = catalog["name"].astype("string").str.strip()
+    categories = catalog["category"].astype("string").str.strip()
+    prices = pd.to_numeric(catalog["price"], errors="coerce")
+    quantities = pd.to_numeric(catalog["quantity"], errors="coerce")
+    valid = (
+        (names.fillna("") != "") & (categories.fillna("") != "")
+        & (prices >= 0) & (prices < float("inf"))
+        & (quantities >= 0) & (quantities % 1 == 0)
+    )
+    products = [
+        Product(name, category, price, int(quantity))
+        for name, category, price, quantity in zip(
+            names[valid], categories[valid], prices[valid].tolist(), quantities[valid].tolist()
+        )
+    ]
+    # line 1 of the file is the header
+    rejected = [i + 2 for i in range(len(catalog)) if not valid.iloc[i]]
+    return products, rejected
 
 
 # ===============================================================
@@ -75,6 +61,8 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+repo = get_repository()
+
 # Dark theme styling
 st.markdown("""
     <style>
@@ -130,20 +118,71 @@ if menu == "Add Product":
     if st.button("Add Product"):
         if name and category:
             p = Product(name, category, price, quantity)
-            p.save_to_db()
+            p.save_to_db(repo)
             st.success("Product added successfully!")
         else:
             st.error("Please fill all fields.")
 
+    with st.expander("📥 Bulk upload (CSV)"):
+        st.caption("CSV columns: name, category, price, quantity")
+        uploaded = st.file_uploader("Product catalog", type="csv")
+        if uploaded is not None and st.button("Import Products"):
+            catalog = pd.read_csv(uploaded)
+            catalog.columns = [c.strip().lower() for c in catalog.columns]
+            missing = {"name", "category", "price", "quantity"} - set(catalog.columns)
+            if missing:
+                st.error(f"Missing column(s): {', '.join(sorted(missing))}")
+                st.stop()
+            products, rejected = parse_catalog(catalog)
+            result = Product.save_many(products, repo)
+            message = f"Imported {len(result.ids):,}, rejected {len(rejected):,}"
+            if rejected:
+                shown = ", ".join(map(str, rejected[:20])) + (", …" if len(rejected) > 20 else "")
+                st.warning(f"{message} (rows {shown}).")
+            else:
+                st.success(f"{message} ({result.rows_per_sec:,.0f} rows/sec).")
+
 
 # --------------------------- VIEW PRODUCTS ---------------------------
 elif menu == "View Products":
     st.header("📦 All Products")
 
-    products = get_all_products()
+    low, high = repo.price_bounds()
+
+    with st.expander("🔎 Filters", expanded=True):
+        col1, col2, col3 = st.columns([2, 3, 2])
+        with col2:
+            if high > low:
+                min_price, max_price = st.slider(
+                    "Price range", min_value=float(low), max_value=float(high),
+                    value=(float(low), float(high))
+                )
+            else:
+                min_price, max_price = None, None
+        with col3:
+            in_stock = st.checkbox("In stock only")
+            sort_by = st.selectbox("Sort by", ["id", "name", "price", "quantity"])
+            descending = st.checkbox("Descending")
+        with col1:
+            # facet counts respect the price and stock filters
+            facets = dict(repo.category_facets(min_price, max_price, in_stock))
+            category = st.selectbox(
+                "Category", [None] + list(facets),
+                format_func=lambda c: "All" if c is None else f"{c} ({facets[c]:,})"
+            )
+            page_size = st.selectbox("Rows per page", [50, 100, 500, 1000], index=0)
+
+    matching = facets[category] if category else sum(facets.values())
+    pages = max(1, -(-matching // page_size))
+    page = st.number_input(f"Page (of {pages:,})", min_value=1, max_value=pages, step=1, value=1)
+
+    # only the current page is fetched, formatted and rendered
+    products = repo.query_products(category, min_price, max_price, in_stock,
+                                   sort_by, descending, page_size, (page - 1) * page_size)
 
     if products:
-        import pandas as pd
+        first = (page - 1) * page_size + 1
+        st.caption(f"Showing {first:,}–{first + len(products) - 1:,} of {matching:,} matching products")
 
         # convert list of tuples to DataFrame
         df = pd.DataFrame(products, columns=["ID", "Name", "Category", "Price", "Stock"])
@@ -151,19 +190,10 @@ elif menu == "View Products":
         # format price:
         # - if value is an integer-like float -> show as "50,000"
         # - otherwise show with two decimals and commas -> "1,234.56"
-        def format_price(x):
-            try:
-                val = float(x)
-                if val.is_integer():
-                    return f"{int(val):,}"
-                return f"{val:,.2f}"
-            except Exception:
-                return x  # leave as-is if formatting fails
-
-        df["Price"] = df["Price"].apply(format_price)
+        df["Price"] = format_prices(df["Price"])
 
         # display the table
-        st.table(df)
+        st.dataframe(df, use_container_width=True, hide_index=True)
     else:
         st.info("No products available.")
 
@@ -173,20 +203,18 @@ elif menu == "Search Product":
     st.header("🔍 Search Product")
 
     keyword = st.text_input("Enter product name")
+    top_k = st.selectbox("Show top", [10, 20, 50, 100], index=1)
 
     if keyword:
-        results = search_product(keyword)
+        # built once per process, then kept current by every write
+        repo.enable_search_index()
+        results = repo.search_ranked(keyword, top_k)
 
         if results:
             st.subheader("Results:")
-
-            for r in results:
-                st.write(f"**ID:** {r[0]}")
-                st.write(f"**Name:** {r[1]}")
-                st.write(f"**Category:** {r[2]}")
-                st.write(f"**Price:** {r[3]}")
-                st.write(f"**Quantity:** {r[4]}")
-                st.write("---")
+            df = pd.DataFrame(results, columns=["ID", "Name", "Category", "Price", "Quantity"])
+            df["Price"] = format_prices(df["Price"])
+            st.dataframe(df, use_container_width=True, hide_index=True)
         else:
             st.warning("No product found.")
 
@@ -195,14 +223,12 @@ elif menu == "Search Product":
 elif menu == "Update Product":
     st.header("✏️ Update Product")
 
-    products = get_all_products()
+    product_ids = repo.get_product_ids()
 
-    if products:
-        product_ids = [p[0] for p in products]
+    if product_ids:
         selected_id = st.selectbox("Select Product ID", product_ids)
 
-        cursor.execute("SELECT * FROM products WHERE id=?", (selected_id,))
-        product = cursor.fetchone()
+        product = repo.get_product(selected_id)
 
         new_name = st.text_input("Product Name", product[1])
         new_category = st.text_input("Category", product[2])
@@ -220,10 +246,9 @@ elif menu == "Update Product":
 elif menu == "Delete Product":
     st.header("🗑️ Delete Product")
 
-    products = get_all_products()
+    product_ids = repo.get_product_ids()
 
-    if products:
-        product_ids = [p[0] for p in products]
+    if product_ids:
         selected_id = st.selectbox("Select Product ID", product_ids)
 
         if st.button("Delete"):
@@ -0,0 +1,336 @@
+# ================================================
+# File: benchmark_products.py
+# Topic: Performance checks for the Ecommerce Product Management System
+# ================================================
+
+"""
+Small, self-contained benchmarks for `product_repository.py`.
+
+Every benchmark works on a throw-away database in a temporary directory,
+so running this file never touches `ecommerce.db`.
+
+Run:
+    python benchmark_products.py
+"""
+
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+import timeit
+
+from product_repository import Product, ProductRepository
+from product_search import VERIFY_CAP
+
+CATEGORIES = ["Electronics", "Books", "Clothing", "Home", "Toys", "Sports", "Beauty", "Grocery"]
+
+
+# ------------------------------------------------
+# Helpers
+# ------------------------------------------------
+
+def make_products(n, seed=42):
+    rng = random.Random(seed)
+    return [
+        (f"Product {i} {rng.choice(['Pro', 'Mini', 'Max', 'Lite'])}",
+         rng.choice(CATEGORIES),
+         round(rng.uniform(1, 5000), rng.choice([0, 2])),
+         rng.randint(0, 100))
+        for i in range(n)
+    ]
+
+
+def seed(db_path, n):
+    repo = ProductRepository(db_path)
+    with repo.transaction() as conn:
+        conn.executemany(
+            "INSERT INTO products(name, category, price, quantity) VALUES (?, ?, ?, ?)",
+            make_products(n)
+        )
+    return repo
+
+
+def run_threads(n_threads, target):
+    threads = [threading.Thread(target=target, args=(t,)) for t in range(n_threads)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - start
+
+
+def percentiles(samples):
+    cuts = statistics.quantiles(samples, n=100)
+    return cuts[49] * 1000, cuts[98] * 1000
+
+
+# ------------------------------------------------
+# 1️⃣ Concurrent sessions: shared connection vs. ProductRepository
+# ------------------------------------------------
+
+class SharedConnectionStore:
+    """The original design: one connection for every session (plus the lock it needs)."""
+
+    def __init__(self, db_path):
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.cursor = self.conn.cursor()
+        self.lock = threading.Lock()
+
+    def get_product(self, product_id):
+        with self.lock:
+            self.cursor.execute("SELECT * FROM products WHERE id=?", (product_id,))
+            return self.cursor.fetchone()
+
+    def update_quantity(self, product_id, quantity):
+        with self.lock:
+            self.cursor.execute("UPDATE products SET quantity=? WHERE id=?", (quantity, product_id))
+            self.conn.commit()
+
+
+class RepositoryStore:
+    def __init__(self, repo):
+        self.repo = repo
+
+    def get_product(self, product_id):
+        return self.repo.get_product(product_id)
+
+    def update_quantity(self, product_id, quantity):
+        with self.repo.transaction() as conn:
+            conn.execute("UPDATE products SET quantity=? WHERE id=?", (quantity, product_id))
+
+
+def run_sessions(store, n_products, n_sessions, ops_per_session, write_ratio):
+    """ops/sec, (p50, p99) of all operations, and the p99 of reads and of writes."""
+    reads = [[] for _ in range(n_sessions)]
+    writes = [[] for _ in range(n_sessions)]
+
+    def session(t):
+        rng = random.Random(t)
+        for _ in range(ops_per_session):
+            product_id = rng.randint(1, n_products)
+            start = time.perf_counter()
+            if rng.random() < write_ratio:
+                store.update_quantity(product_id, rng.randint(0, 100))
+                writes[t].append(time.perf_counter() - start)
+            else:
+                store.get_product(product_id)
+                reads[t].append(time.perf_counter() - start)
+
+    elapsed = run_threads(n_sessions, session)
+    read_samples = [s for per_session in reads for s in per_session]
+    write_samples = [s for per_session in writes for s in per_session]
+    samples = read_samples + write_samples
+    return (len(samples) / elapsed, percentiles(samples),
+            percentiles(read_samples)[1], percentiles(write_samples)[1])
+
+
+def bench_sessions(n_products=10_000, n_sessions=16, ops_per_session=2_000, write_ratio=0.1):
+    print(f"\n--- {n_sessions} sessions x {ops_per_session} ops "
+          f"({write_ratio:.0%} writes) on {n_products:,} products, {os.cpu_count()} CPU(s) ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        repo = seed(db_path, n_products)
+
+        shared = SharedConnectionStore(db_path)
+        for label, store in [("shared connection", shared), ("ProductRepository", RepositoryStore(repo))]:
+            ops, (p50, p99), read_p99, write_p99 = run_sessions(
+                store, n_products, n_sessions, ops_per_session, write_ratio)
+            print(f"{label:18}: {ops:>9,.0f} ops/sec   p50 {p50:7.3f} ms   p99 {p99:7.3f} ms   "
+                  f"(reads {read_p99:7.3f} ms, writes {write_p99:7.3f} ms)")
+        shared.conn.close()
+        repo.close()
+
+
+# ------------------------------------------------
+# 2️⃣ Price formatting: per-row apply vs. format_prices
+# ------------------------------------------------
+
+def bench_price_format(sizes=(10_000, 100_000, 1_000_000), page_size=100):
+    import numpy as np
+    import pandas as pd
+
+    from product_formatting import format_price, format_prices
+
+    print("\n--- Price column formatting ---")
+    rng = np.random.default_rng(7)
+    for n in sizes:
+        prices = rng.uniform(1, 100_000, n)
+        prices[rng.random(n) < 0.5] //= 1  # half integer-like, half with decimals
+        df = pd.DataFrame({"Price": prices})
+
+        start = time.perf_counter()
+        slow = df["Price"].apply(format_price)
+        apply_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        fast = format_prices(df["Price"])
+        batch_s = time.perf_counter() - start
+        assert slow.equals(fast), "format_prices disagrees with format_price"
+
+        # what the paginated View Products page actually formats per render
+        page = df["Price"].iloc[:page_size]
+        assert page.apply(format_price).equals(format_prices(page))
+        page_apply_s = min(timeit.repeat(lambda: page.apply(format_price), number=200, repeat=3)) / 200
+        page_batch_s = min(timeit.repeat(lambda: format_prices(page), number=200, repeat=3)) / 200
+        print(f"{n:>9,} rows: apply {apply_s * 1000:9.1f} ms   "
+              f"format_prices {batch_s * 1000:8.1f} ms  ({apply_s / batch_s:.1f}x)   "
+              f"{page_size}-row page: apply {page_apply_s * 1e6:6.1f} us, "
+              f"format_prices {page_batch_s * 1e6:6.1f} us  ({page_apply_s / page_batch_s:.1f}x)")
+
+
+# ------------------------------------------------
+# 3️⃣ Batched product ingestion
+# ------------------------------------------------
+
+def bench_save_many(n_products=100_000, per_row_products=2_000, flush_sizes=(1_000, 10_000, 50_000)):
+    print(f"\n--- Catalog sync of {n_products:,} products ---")
+    catalog = [Product(*row) for row in make_products(n_products)]
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = ProductRepository(os.path.join(tmp, "per_row.db"))
+        start = time.perf_counter()
+        for product in catalog[:per_row_products]:
+            product.save_to_db(repo)
+        print(f"save_to_db per row     : {per_row_products / (time.perf_counter() - start):>10,.0f} rows/sec")
+        repo.close()
+
+        for flush_size in flush_sizes:
+            repo = ProductRepository(os.path.join(tmp, f"batch_{flush_size}.db"))
+            result = Product.save_many(catalog, repo, flush_size=flush_size)
+            assert len(result.ids) == n_products == len(set(result.ids))
+            assert repo.get_product(result.ids[-1])[1] == catalog[-1].name
+            print(f"save_many flush={flush_size:<7,}: {result.rows_per_sec:>10,.0f} rows/sec "
+                  f"({result.seconds:.2f}s)")
+            repo.close()
+
+
+# ------------------------------------------------
+# 4️⃣ Concurrent checkout reservations
+# ------------------------------------------------
+
+def bench_reservations(n_products=100, stock=50, n_threads=16, attempts_per_thread=2_000,
+                       commit_ratio=0.7):
+    print(f"\n--- Checkouts: {n_threads} threads x {attempts_per_thread} reservations "
+          f"on {n_products} products x {stock} units ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = ProductRepository(os.path.join(tmp, "bench.db"))
+        Product.save_many((Product(f"Hot item {i}", "Deals", 9.99, stock) for i in range(n_products)), repo)
+
+        reserved = [0] * n_threads
+        committed = [0] * n_threads
+
+        def shopper(t):
+            rng = random.Random(t)
+            for _ in range(attempts_per_thread):
+                reservation = repo.reserve(rng.randint(1, n_products), rng.randint(1, 3))
+                if reservation is None:
+                    continue
+                reserved[t] += 1
+                if rng.random() < commit_ratio:
+                    committed[t] += repo.commit_reservation(reservation)
+                else:
+                    repo.release_reservation(reservation)
+
+        elapsed = run_threads(n_threads, shopper)
+        with repo.connection() as conn:
+            min_qty, total_qty = conn.execute("SELECT MIN(quantity), SUM(quantity) FROM products").fetchone()
+            sold = stock * n_products - total_qty
+            open_holds = conn.execute("SELECT COUNT(*) FROM reservations").fetchone()[0]
+
+        attempts = n_threads * attempts_per_thread
+        print(f"throughput : {attempts / elapsed:,.0f} reservation attempts/sec")
+        print(f"reserved   : {sum(reserved):,}   committed: {sum(committed):,}   units sold: {sold:,}")
+        assert min_qty >= 0, "oversold"
+        assert sold <= stock * n_products and open_holds == 0
+        print("check      : no product went below zero stock, no dangling holds")
+        repo.close()
+
+
+# ------------------------------------------------
+# 5️⃣ Trigram name index vs. LIKE
+# ------------------------------------------------
+
+BRANDS = ["Samsung", "Apple", "Sony", "Nike", "Adidas", "Lenovo", "Dell", "Philips", "Canon",
+          "Puma", "Xiaomi", "Huawei", "Bosch", "Lego", "Casio", "Logitech", "Asus", "Oppo"]
+ADJECTIVES = ["Wireless", "Smart", "Classic", "Ultra", "Portable", "Compact", "Deluxe", "Sport",
+              "Premium", "Eco", "Mini", "Pro", "Digital", "Vintage", "Rugged", "Slim"]
+NOUNS = ["Headphones", "Phone", "Laptop", "Sneakers", "Camera", "Watch", "Blender", "Backpack",
+         "Keyboard", "Mouse", "Speaker", "Jacket", "Monitor", "Kettle", "Drill", "Tablet",
+         "Charger", "Router", "Toaster", "Lamp", "Bottle", "Helmet", "Guitar", "Printer"]
+
+
+def make_catalog_names(n, seed=3):
+    rng = random.Random(seed)
+    return [f"{rng.choice(BRANDS)} {rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} "
+            f"{rng.choice('ABCDEFGHKMXZ')}{rng.randint(10, 99999)}" for _ in range(n)]
+
+
+def rank_by_scan(rows, keyword, k):
+    """The index's ranking, computed over every matching row (the reference)."""
+    keyword = keyword.lower()
+
+    def key(row):
+        name, pos = row[1].lower(), row[1].lower().find(keyword)
+        tier = 0 if name == keyword else 1 if pos == 0 else 2 if not name[pos - 1].isalnum() else 3
+        return tier, pos, len(name), row[0]
+
+    return [row[0] for row in sorted(rows, key=key)[:k]]
+
+
+def bench_name_search(n_products=1_000_000, k=20,
+                      keywords=("X4821", "Casio Vint", "Router", "headph")):
+    print(f"\n--- Name search over {n_products:,} products (top {k}) ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = ProductRepository(os.path.join(tmp, "bench.db"))
+        Product.save_many((Product(name, "Misc", 10, 1) for name in make_catalog_names(n_products)), repo)
+
+        # a writer keeps adding products while the index builds from a snapshot
+        building = threading.Event()
+        written = []
+
+        def writer():
+            while not building.is_set():
+                written.append(repo.add_product(f"Late Router Z{len(written)}", "Misc", 10, 1))
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        start = time.perf_counter()
+        index = repo.enable_search_index()
+        print(f"index build            : {time.perf_counter() - start:8.2f} s "
+              f"({len(written):,} products added meanwhile)")
+        building.set()
+        thread.join()
+        assert all(index.search(f"Late Router Z{i}", 1) for i in range(len(written))), \
+            "writes made during the build are missing from the index"
+
+        for keyword in keywords:
+            start = time.perf_counter()
+            like_rows = repo.search_product(keyword, k)
+            like_ms = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            for _ in range(20):
+                ids = index.search(keyword, k)
+            index_ms = (time.perf_counter() - start) * 1000 / 20
+
+            start = time.perf_counter()
+            rows = repo.search_ranked(keyword, k)
+            ranked_ms = (time.perf_counter() - start) * 1000
+
+            assert len(rows) == len(ids) <= k and (not like_rows) == (not rows)
+            if index.candidate_count(keyword) <= VERIFY_CAP:
+                assert ids == rank_by_scan(repo.search_product(keyword), keyword, k), keyword
+            print(f"{keyword!r:14} LIKE {like_ms:8.2f} ms   index {index_ms:7.3f} ms   "
+                  f"search_ranked {ranked_ms:7.3f} ms ({index.candidate_count(keyword):,} candidates)")
+        repo.close()
+
+
+if __name__ == "__main__":
+    bench_sessions()
+    bench_price_format()
+    bench_save_many()
+    bench_reservations()
+    bench_name_search()
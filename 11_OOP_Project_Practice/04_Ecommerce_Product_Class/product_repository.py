@@ -0,0 +1,518 @@
+# ================================================
+# File: product_repository.py
+# Topic: Product model and data-access layer for the Ecommerce app
+# ================================================
+
+"""
+The `Product` class and all SQL for the Ecommerce Product Management System.
+
+The original app shared ONE module-level connection and ONE cursor between
+every Streamlit session, so concurrent sessions interleaved on the same cursor.
+`ProductRepository` instead gives each thread its own connection:
+
+- A thread opens its connection on first use and keeps it; connections of
+  threads that have finished are closed when the next one is opened.
+- Connections run in WAL journal mode, so readers do not block the writer.
+- Writes run inside explicit `BEGIN IMMEDIATE ... COMMIT` transactions. Writers
+  in this process queue on a lock first, so they wait for each other without
+  falling into SQLite's busy handler, which sleeps in steps of up to 100 ms.
+
+Stock changes go through `adjust_stock` and the reservation API
+(`reserve` -> `commit_reservation` / `release_reservation`). Every decrement is
+a conditional `UPDATE ... WHERE quantity >= ?`, so stock can never be oversold;
+reservations that are neither committed nor released expire after their TTL.
+
+Name search can be served from an in-memory trigram index
+(`enable_search_index`), which is loaded once from SQLite and kept current by
+every write made through the repository. Results from the index are always
+ranked, however common the keyword (see `product_search.py`).
+
+Large catalogs are written with `Product.save_many` / `ProductBatch`, which
+streams products into ONE transaction using `executemany` instead of paying a
+commit (and an fsync) per product.
+"""
+
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from product_search import MIN_KEYWORD, ProductSearchIndex
+
+DB_PATH = "ecommerce.db"
+
+# seconds a writer waits for another writer before giving up
+SQLITE_TIMEOUT = 30.0
+
+PRODUCT_COLUMNS = "id, name, category, price, quantity"
+
+# how long a checkout may hold stock before it is returned automatically
+RESERVATION_TTL = 15 * 60
+
+INSERT_PRODUCT = "INSERT INTO products(name, category, price, quantity) VALUES (?, ?, ?, ?)"
+
+# whitelisted sort keys for query_products (never interpolate user input)
+SORT_COLUMNS = {"id": "id", "name": "name", "price": "price", "quantity": "quantity"}
+
+
+# ------------------------------------------------
+# 1️⃣ Product Class (OOP)
+# ------------------------------------------------
+
+class Product:
+    def __init__(self, name, category, price, quantity):
+        self.name = name
+        self.category = category
+        self.price = price
+        self.quantity = quantity
+
+    def save_to_db(self, repository: "ProductRepository") -> int:
+        return repository.add_product(self.name, self.category, self.price, self.quantity)
+
+    def as_row(self) -> Tuple:
+        return (self.name, self.category, self.price, self.quantity)
+
+    @classmethod
+    def save_many(cls, products: Iterable["Product"], repository: "ProductRepository",
+                  flush_size: int = 10_000) -> "SaveResult":
+        """Save many products in a single transaction and return their new ids."""
+        with ProductBatch(repository, flush_size) as batch:
+            for product in products:
+                batch.add(product)
+        return batch.result
+
+
+class SaveResult(NamedTuple):
+    ids: List[int]
+    seconds: float
+
+    @property
+    def rows_per_sec(self) -> float:
+        return len(self.ids) / self.seconds if self.seconds else 0.0
+
+
+class ProductBatch:
+    """
+    Buffer products and write them with `executemany`, all in one transaction.
+
+        with ProductBatch(repo, flush_size=5_000) as batch:
+            for product in catalog:
+                batch.add(product)
+        print(batch.result.rows_per_sec)
+
+    Nothing is committed unless the whole block succeeds.
+    """
+
+    def __init__(self, repository: "ProductRepository", flush_size: int = 10_000):
+        self.repository = repository
+        self.flush_size = flush_size
+        self.ids: List[int] = []
+        self.result: Optional[SaveResult] = None
+        self._pending: List[Tuple] = []
+        self._transaction = None
+        self._conn = None
+        self._start = 0.0
+
+    def __enter__(self) -> "ProductBatch":
+        self._start = time.perf_counter()
+        self._transaction = self.repository.transaction()
+        self._conn = self._transaction.__enter__()
+        return self
+
+    def add(self, product: "Product") -> None:
+        self._pending.append(product.as_row())
+        if len(self._pending) >= self.flush_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        self._conn.executemany(INSERT_PRODUCT, self._pending)
+        # the write lock is held, so the AUTOINCREMENT ids of this batch are consecutive
+        last_id = self._conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+        new_ids = range(last_id - len(self._pending) + 1, last_id + 1)
+        self.ids.extend(new_ids)
+        self._pending = []
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        try:
+            if exc_type is None:
+                self.flush()
+        except BaseException as error:
+            self._transaction.__exit__(type(error), error, error.__traceback__)
+            raise
+        suppress = self._transaction.__exit__(exc_type, exc, tb)
+        if exc_type is None:
+            # checked after the commit: an index built from now on already sees these rows
+            if self.ids and self.repository._indexing():
+                self.repository._index_range(self.ids[0], self.ids[-1])
+            self.result = SaveResult(self.ids, time.perf_counter() - self._start)
+        return bool(suppress)
+
+
+# ------------------------------------------------
+# 2️⃣ Product Repository
+# ------------------------------------------------
+
+class ProductRepository:
+    def __init__(self, db_path: str = DB_PATH):
+        self.db_path = db_path
+        self.search_index: Optional[ProductSearchIndex] = None
+        # name changes committed while the search index is being built
+        self._index_backlog: Optional[List[Tuple[int, Optional[str]]]] = None
+        self._index_lock = threading.Lock()
+        self._index_build_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        # (owning thread, connection) for every open connection, so close() finds them
+        self._opened: List[Tuple[threading.Thread, sqlite3.Connection]] = []
+        self._opened_lock = threading.Lock()
+        self._local = threading.local()
+        self.init_db()
+
+    # ---------------- connections ----------------
+
+    def _connect(self) -> sqlite3.Connection:
+        # isolation_level=None -> autocommit; transactions are opened explicitly
+        conn = sqlite3.connect(self.db_path, timeout=SQLITE_TIMEOUT,
+                               isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """This thread's connection, opened on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+            with self._opened_lock:
+                opened = []
+                for thread, other in self._opened:
+                    if thread.is_alive():
+                        opened.append((thread, other))
+                    else:
+                        other.close()
+                opened.append((threading.current_thread(), conn))
+                self._opened = opened
+        yield conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run the enclosed statements in one write transaction."""
+        with self.connection() as conn:
+            if conn.in_transaction:
+                # already inside an outer transaction on this thread
+                yield conn
+                return
+            if not self._write_lock.acquire(timeout=SQLITE_TIMEOUT):
+                raise sqlite3.OperationalError("database is locked")
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    yield conn
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+                conn.execute("COMMIT")
+            finally:
+                self._write_lock.release()
+
+    def init_db(self) -> None:
+        with self.transaction() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS products (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT NOT NULL,
+                    category TEXT NOT NULL,
+                    price REAL NOT NULL,
+                    quantity INTEGER NOT NULL
+                )
+            """)
+            # category + price-range filters and price ordering
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_products_category_price ON products (category, price)"
+            )
+            # in-stock filter
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_products_quantity ON products (quantity)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS reservations (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    product_id INTEGER NOT NULL,
+                    quantity INTEGER NOT NULL CHECK (quantity > 0),
+                    expires_at REAL NOT NULL
+                )
+            """)
+            # expiry sweeps, globally and per product
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_reservations_expiry ON reservations (expires_at)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_reservations_product "
+                "ON reservations (product_id, expires_at)"
+            )
+
+    def add_product(self, name: str, category: str, price: float, quantity: int) -> int:
+        """Insert a product and return its new id."""
+        with self.transaction() as conn:
+            product_id = conn.execute(INSERT_PRODUCT, (name, category, price, quantity)).lastrowid
+        self._index_changes([(product_id, name)])
+        return product_id
+
+    def get_product(self, product_id: int) -> Optional[Tuple]:
+        with self.connection() as conn:
+            return conn.execute(
+                f"SELECT {PRODUCT_COLUMNS} FROM products WHERE id=?", (product_id,)
+            ).fetchone()
+
+    def get_all_products(self) -> List[Tuple]:
+        with self.connection() as conn:
+            return conn.execute(f"SELECT {PRODUCT_COLUMNS} FROM products").fetchall()
+
+    def get_product_ids(self) -> List[int]:
+        with self.connection() as conn:
+            return [row[0] for row in conn.execute("SELECT id FROM products ORDER BY id")]
+
+    def search_product(self, keyword: str, limit: Optional[int] = None) -> List[Tuple]:
+        with self.connection() as conn:
+            return conn.execute(
+                f"SELECT {PRODUCT_COLUMNS} FROM products WHERE name LIKE ? LIMIT ?",
+                (f"%{keyword}%", -1 if limit is None else limit)
+            ).fetchall()
+
+    # ---------------- name search index ----------------
+
+    def _indexing(self) -> bool:
+        """Whether name changes must reach the search index (live or being built)."""
+        return self.search_index is not None or self._index_backlog is not None
+
+    def _index_changes(self, changes: List[Tuple[int, Optional[str]]]) -> None:
+        """Pass committed (id, name) changes to the search index; None = deleted."""
+        with self._index_lock:
+            if self._index_backlog is not None:
+                # the index is being built from an older snapshot, replay later
+                self._index_backlog.extend(changes)
+                return
+            index = self.search_index
+        if index is not None:
+            index.apply(changes)
+
+    def _index_range(self, first_id: int, last_id: int) -> None:
+        with self.connection() as conn:
+            rows = conn.execute(
+                "SELECT id, name FROM products WHERE id BETWEEN ? AND ?", (first_id, last_id)
+            ).fetchall()
+        self._index_changes(rows)
+
+    def enable_search_index(self) -> ProductSearchIndex:
+        """Build the trigram name index from the database (once).
+
+        The names are read from one snapshot (a single SELECT under WAL)
+        without taking the write lock, so writers are not blocked while the
+        index builds. Their changes are queued and replayed onto the new index
+        before it goes live.
+        """
+        with self._index_build_lock:
+            if self.search_index is None:
+                with self._index_lock:
+                    self._index_backlog = []
+                try:
+                    index = ProductSearchIndex()
+                    with self.connection() as conn:
+                        index.add_many(conn.execute("SELECT id, name FROM products"))
+                except BaseException:
+                    with self._index_lock:
+                        self._index_backlog = None
+                    raise
+                with self._index_lock:
+                    # replaying a change the snapshot already has is harmless
+                    index.apply(self._index_backlog)
+                    self.search_index, self._index_backlog = index, None
+        return self.search_index
+
+    def search_ranked(self, keyword: str, k: int = 20) -> List[Tuple]:
+        """Top-`k` products whose name contains `keyword`, best match first.
+
+        Without the search index (or for keywords under `MIN_KEYWORD`
+        characters) this is `search_product`, in id order.
+        """
+        keyword = keyword.strip()
+        index = self.search_index
+        if index is None or len(keyword) < MIN_KEYWORD:
+            return self.search_product(keyword, k)
+        ids = index.search(keyword, k)
+        if not ids:
+            return []
+        with self.connection() as conn:
+            rows = conn.execute(
+                f"SELECT {PRODUCT_COLUMNS} FROM products WHERE id IN ({','.join('?' * len(ids))})",
+                ids
+            ).fetchall()
+        by_id = {row[0]: row for row in rows}
+        return [by_id[i] for i in ids if i in by_id]
+
+    def query_products(self, category: Optional[str] = None,
+                       min_price: Optional[float] = None, max_price: Optional[float] = None,
+                       in_stock: bool = False, order_by: str = "id", descending: bool = False,
+                       limit: int = 50, offset: int = 0) -> List[Tuple]:
+        """Filter, sort and page products entirely inside SQLite."""
+        if order_by not in SORT_COLUMNS:
+            raise ValueError(f"order_by must be one of {sorted(SORT_COLUMNS)}")
+        where, params = _product_filters(category, min_price, max_price, in_stock)
+        direction = "DESC" if descending else "ASC"
+        with self.connection() as conn:
+            return conn.execute(f"""
+                SELECT {PRODUCT_COLUMNS} FROM products
+                {where}
+                ORDER BY {SORT_COLUMNS[order_by]} {direction}, id {direction}
+                LIMIT ? OFFSET ?
+            """, (*params, limit, offset)).fetchall()
+
+    def category_facets(self, min_price: Optional[float] = None,
+                        max_price: Optional[float] = None,
+                        in_stock: bool = False) -> List[Tuple[str, int]]:
+        """(category, product count) for the other active filters, largest first."""
+        where, params = _product_filters(None, min_price, max_price, in_stock)
+        with self.connection() as conn:
+            return conn.execute(f"""
+                SELECT category, COUNT(*) FROM products
+                {where}
+                GROUP BY category
+                ORDER BY COUNT(*) DESC, category
+            """, params).fetchall()
+
+    def price_bounds(self) -> Tuple[float, float]:
+        with self.connection() as conn:
+            low, high = conn.execute("SELECT MIN(price), MAX(price) FROM products").fetchone()
+        return (low or 0.0, high or 0.0)
+
+    def update_product(self, product_id: int, name: str, category: str,
+                       price: float, quantity: int) -> bool:
+        with self.transaction() as conn:
+            cur = conn.execute("""
+                UPDATE products
+                SET name=?, category=?, price=?, quantity=?
+                WHERE id=?
+            """, (name, category, price, quantity, product_id))
+        if cur.rowcount:
+            self._index_changes([(product_id, name)])
+        return cur.rowcount > 0
+
+    # ---------------- stock movements ----------------
+
+    def adjust_stock(self, product_id: int, delta: int) -> bool:
+        """Add (or, with a negative delta, remove) stock; never goes below zero."""
+        with self.transaction() as conn:
+            cur = conn.execute(
+                "UPDATE products SET quantity = quantity + ? WHERE id=? AND quantity + ? >= 0",
+                (delta, product_id, delta)
+            )
+            return cur.rowcount > 0
+
+    def reserve(self, product_id: int, quantity: int = 1,
+                ttl: float = RESERVATION_TTL) -> Optional[int]:
+        """
+        Hold `quantity` units for a checkout and return the reservation id,
+        or None if there is not enough stock.
+        """
+        if quantity <= 0:
+            raise ValueError("quantity must be positive")
+        now = time.time()
+        with self.transaction() as conn:
+            if not self._take_stock(conn, product_id, quantity):
+                # stock may be tied up in abandoned checkouts; return those and retry
+                if not self._expire(conn, now, product_id):
+                    return None
+                if not self._take_stock(conn, product_id, quantity):
+                    return None
+            cur = conn.execute(
+                "INSERT INTO reservations (product_id, quantity, expires_at) VALUES (?, ?, ?)",
+                (product_id, quantity, now + ttl)
+            )
+            return cur.lastrowid
+
+    def commit_reservation(self, reservation_id: int) -> bool:
+        """Turn a live reservation into a sale; False if it expired or is unknown."""
+        with self.transaction() as conn:
+            cur = conn.execute(
+                "DELETE FROM reservations WHERE id=? AND expires_at > ?",
+                (reservation_id, time.time())
+            )
+            return cur.rowcount > 0
+
+    def release_reservation(self, reservation_id: int) -> bool:
+        """Cancel a reservation and put its units back in stock."""
+        with self.transaction() as conn:
+            row = conn.execute(
+                "SELECT product_id, quantity FROM reservations WHERE id=?", (reservation_id,)
+            ).fetchone()
+            if row is None:
+                return False
+            conn.execute("DELETE FROM reservations WHERE id=?", (reservation_id,))
+            conn.execute("UPDATE products SET quantity = quantity + ? WHERE id=?", (row[1], row[0]))
+            return True
+
+    def expire_reservations(self) -> int:
+        """Return the stock of every expired reservation; returns how many expired."""
+        with self.transaction() as conn:
+            return self._expire(conn, time.time())
+
+    def _take_stock(self, conn: sqlite3.Connection, product_id: int, quantity: int) -> bool:
+        cur = conn.execute(
+            "UPDATE products SET quantity = quantity - ? WHERE id=? AND quantity >= ?",
+            (quantity, product_id, quantity)
+        )
+        return cur.rowcount > 0
+
+    def _expire(self, conn: sqlite3.Connection, now: float,
+                product_id: Optional[int] = None) -> int:
+        where = "expires_at <= ?"
+        params: list = [now]
+        if product_id is not None:
+            where = "product_id = ? AND " + where
+            params.insert(0, product_id)
+        expired = conn.execute(f"""
+            SELECT product_id, SUM(quantity), COUNT(*) FROM reservations
+            WHERE {where} GROUP BY product_id
+        """, params).fetchall()
+        if not expired:
+            return 0
+        conn.executemany(
+            "UPDATE products SET quantity = quantity + ? WHERE id=?",
+            [(units, pid) for pid, units, _ in expired]
+        )
+        conn.execute(f"DELETE FROM reservations WHERE {where}", params)
+        return sum(count for _, _, count in expired)
+
+    def delete_product(self, product_id: int) -> bool:
+        with self.transaction() as conn:
+            cur = conn.execute("DELETE FROM products WHERE id=?", (product_id,))
+        if cur.rowcount:
+            self._index_changes([(product_id, None)])
+        return cur.rowcount > 0
+
+    def close(self) -> None:
+        with self._opened_lock:
+            for _, conn in self._opened:
+                conn.close()
+            self._opened.clear()
+            self._local = threading.local()
+
+
+def _product_filters(category: Optional[str], min_price: Optional[float],
+                     max_price: Optional[float], in_stock: bool) -> Tuple[str, list]:
+    """Build the WHERE clause (and its parameters) shared by queries and facets."""
+    clauses, params = [], []
+    if category is not None:
+        clauses.append("category = ?")
+        params.append(category)
+    if min_price is not None:
+        clauses.append("price >= ?")
+        params.append(min_price)
+    if max_price is not None:
+        clauses.append("price <= ?")
+        params.append(max_price)
+    if in_stock:
+        clauses.append("quantity > 0")
+    where = "WHERE " + " AND ".join(clauses) if clauses else ""
+    return where, params
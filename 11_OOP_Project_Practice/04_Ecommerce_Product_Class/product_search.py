@@ -0,0 +1,208 @@
+# ================================================
+# File: product_search.py
+# Topic: In-memory trigram index for product-name search
+# ================================================
+
+"""
+`name LIKE '%keyword%'` has to read every product name on every keystroke.
+
+`ProductSearchIndex` keeps, for every 3-character sequence (trigram), the ids
+of the products whose name contains it. A keyword can only appear in a name
+that contains all of its trigrams, so a search only checks the ids listed
+under every one of them: the postings are intersected (with NumPy) from the
+shortest up, until few candidates are left. Common keywords stay ranked:
+at most `VERIFY_CAP` candidates are checked, through a bounded
+`heapq.nsmallest`, so the cost per keystroke is capped as well.
+
+Ranking (best first):
+    exact name  >  name starts with keyword  >  a word starts with keyword
+    >  keyword appears anywhere; ties go to the earlier match, then the shorter name.
+
+Renaming or deleting a product takes its id out of the postings of the
+trigrams it no longer has, so postings never hold stale ids.
+"""
+
+import heapq
+import threading
+from array import array
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+MIN_KEYWORD = 3
+
+# names indexed per NumPy pass when bulk loading
+_BULK_CHUNK = 50_000
+
+# stop intersecting postings once this few candidates are left
+INTERSECT_STOP = 1_000
+# most candidates one search checks; past this only the oldest products are ranked
+VERIFY_CAP = 200_000
+
+
+def trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class ProductSearchIndex:
+    def __init__(self):
+        self._names: Dict[int, str] = {}
+        self._postings: Dict[str, array] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def add(self, product_id: int, name: str) -> None:
+        """Index a new product, or re-index one whose name changed."""
+        with self._lock:
+            self._add_locked(product_id, name.lower())
+
+    def _add_locked(self, product_id: int, name: str) -> None:
+        old = self._names.get(product_id)
+        self._names[product_id] = name
+        old_grams = trigrams(old) if old is not None else set()
+        new_grams = trigrams(name)
+        self._unlist(product_id, old_grams - new_grams)
+        for gram in new_grams - old_grams:
+            posting = self._postings.get(gram)
+            if posting is None:
+                posting = self._postings[gram] = array("q")
+            posting.append(product_id)
+
+    def _unlist(self, product_id: int, grams: Iterable[str]) -> None:
+        """Take `product_id` out of the postings of `grams`."""
+        for gram in grams:
+            posting = self._postings.get(gram)
+            if posting is None:
+                continue
+            # NumPy finds the id in a long posting far faster than array.index()
+            found = np.flatnonzero(np.frombuffer(posting, dtype=np.int64) == product_id)
+            if len(found):
+                del posting[int(found[0])]
+            if not posting:
+                del self._postings[gram]
+
+    def add_many(self, products: Iterable[Tuple[int, str]]) -> None:
+        """Index many products at once (the path used when loading from SQLite)."""
+        ids: List[int] = []
+        names: List[str] = []
+        with self._lock:
+            for product_id, name in products:
+                name = name.lower()
+                if product_id in self._names:
+                    # renamed product; its old postings may still be in this chunk
+                    if ids:
+                        self._index_chunk(ids, names)
+                        ids, names = [], []
+                    self._add_locked(product_id, name)
+                    continue
+                self._names[product_id] = name
+                ids.append(product_id)
+                names.append(name)
+                if len(ids) >= _BULK_CHUNK:
+                    self._index_chunk(ids, names)
+                    ids, names = [], []
+            if ids:
+                self._index_chunk(ids, names)
+
+    def _index_chunk(self, ids: List[int], names: List[str]) -> None:
+        """
+        Build postings for many new names with NumPy instead of slicing strings.
+
+        Each trigram is packed into one int64 (three 21-bit code points); sorting
+        the (trigram, id) pairs then yields every posting as one contiguous run.
+        """
+        text = np.array(names)
+        width = text.dtype.itemsize // 4
+        if width < 3:
+            return
+        chars = text.view(np.uint32).reshape(len(names), width).astype(np.int64)
+        codes = (chars[:, :-2] << 42) | (chars[:, 1:-1] << 21) | chars[:, 2:]
+        # shorter names are padded with NUL, so trigrams ending in NUL are padding
+        inside = chars[:, 2:] != 0
+        rows = np.broadcast_to(np.asarray(ids, dtype=np.int64)[:, None], codes.shape)[inside]
+        codes = codes[inside]
+
+        order = np.lexsort((rows, codes))
+        codes, rows = codes[order], rows[order]
+        # a trigram repeated inside one name is listed once
+        keep = np.ones(len(codes), dtype=bool)
+        keep[1:] = (codes[1:] != codes[:-1]) | (rows[1:] != rows[:-1])
+        codes, rows = codes[keep], rows[keep]
+
+        uniques, starts = np.unique(codes, return_index=True)
+        ends = np.append(starts[1:], len(codes))
+        for code, start, end in zip(uniques.tolist(), starts.tolist(), ends.tolist()):
+            gram = chr(code >> 42) + chr((code >> 21) & 0x1FFFFF) + chr(code & 0x1FFFFF)
+            posting = self._postings.get(gram)
+            if posting is None:
+                posting = self._postings[gram] = array("q")
+            posting.frombytes(rows[start:end].tobytes())
+
+    def remove(self, product_id: int) -> None:
+        with self._lock:
+            name = self._names.pop(product_id, None)
+            if name is not None:
+                self._unlist(product_id, trigrams(name))
+
+    def apply(self, changes: Iterable[Tuple[int, Optional[str]]]) -> None:
+        """Replay (id, name) changes in order; a name of None means the product was deleted."""
+        added: List[Tuple[int, str]] = []
+        for product_id, name in changes:
+            if name is not None:
+                added.append((product_id, name))
+                continue
+            self.add_many(added)
+            added = []
+            self.remove(product_id)
+        self.add_many(added)
+
+    def _candidates(self, keyword: str) -> np.ndarray:
+        """Ids listed under every trigram of `keyword` (call with the lock held)."""
+        postings = [self._postings.get(gram) for gram in trigrams(keyword)]
+        if not postings or not all(postings):
+            return np.empty(0, dtype=np.int64)
+        postings.sort(key=len)
+        ids = np.frombuffer(postings[0], dtype=np.int64)
+        for posting in postings[1:]:
+            if len(ids) <= INTERSECT_STOP:
+                break
+            ids = ids[np.isin(ids, np.frombuffer(posting, dtype=np.int64), assume_unique=True)]
+        return ids
+
+    def candidate_count(self, keyword: str) -> int:
+        """How many names `search` has to check (before `VERIFY_CAP`)."""
+        with self._lock:
+            return len(self._candidates(keyword.strip().lower()))
+
+    def search(self, keyword: str, k: int = 20) -> List[int]:
+        """Ids of the `k` best-matching products for a keyword of 3+ characters."""
+        keyword = keyword.strip().lower()
+        if len(keyword) < MIN_KEYWORD:
+            raise ValueError(f"keyword must have at least {MIN_KEYWORD} characters")
+
+        with self._lock:
+            candidates = self._candidates(keyword)
+            if len(candidates) > VERIFY_CAP:
+                # the lowest ids, i.e. the oldest products
+                candidates = np.sort(candidates)[:VERIFY_CAP]
+            names = self._names
+
+            def ranked():
+                for product_id in candidates.tolist():
+                    name = names[product_id]
+                    pos = name.find(keyword)
+                    if pos < 0:
+                        continue
+                    if name == keyword:
+                        tier = 0
+                    elif pos == 0:
+                        tier = 1
+                    elif not name[pos - 1].isalnum():
+                        tier = 2
+                    else:
+                        tier = 3
+                    yield (tier, pos, len(name), product_id)
+
+            return [hit[3] for hit in heapq.nsmallest(k, ranked())]